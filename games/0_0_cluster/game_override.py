@@ -12,6 +12,8 @@ class GameStateOverride(GameExecutables):
         super().reset_book()
         # Reset parameters relevant to local game only
         self.tumble_win = 0
+        # Grid multipliers left by the previous book's freegame must not apply to this book's basegame
+        self.reset_grid_mults()
 
     def reset_fs_spin(self):
         super().reset_fs_spin()
@@ -13,7 +13,7 @@ PRIZE_WIN_DATA = "prizeWinInfo"
 
 def new_expanding_wild_event(gamestate) -> None:
     """Passed after reveal event"""
-    new_exp_wilds = gamestate.new_exp_wilds
+    new_exp_wilds = deepcopy(gamestate.new_exp_wilds)
     if gamestate.config.include_padding:
         for ew in new_exp_wilds:
             ew["row"] += 1
@@ -38,12 +38,13 @@ def update_expanding_wild_event(gamestate) -> None:
 
 def new_sticky_event(gamestate, new_sticky_syms: list):
     """Pass details on new prize symbols"""
+    new_sticky_syms_cloned = deepcopy(new_sticky_syms)
     if gamestate.config.include_padding:
-        for sym in new_sticky_syms:
+        for sym in new_sticky_syms_cloned:
             sym["row"] += 1
             sym["prize"] = int(sym["prize"] * 100)
 
-    event = {"index": len(gamestate.book.events), "type": NEW_STICKY_SYMS, "newPrizes": new_sticky_syms}
+    event = {"index": len(gamestate.book.events), "type": NEW_STICKY_SYMS, "newPrizes": new_sticky_syms_cloned}
     gamestate.book.add_event(event)
 
 
@@ -94,8 +95,8 @@ def reveal_prize_event(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": "superspin",
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
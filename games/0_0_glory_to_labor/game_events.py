@@ -14,7 +14,7 @@ def marx_trigger(gamestate, positions: list):
     event = {
         "index": len(gamestate.book.events),
         "type": MARX_TRIGGER,
-        "positions": positions
+        "positions": deepcopy(positions)
     }
     gamestate.book.add_event(event)
 
@@ -115,8 +115,8 @@ def reveal_event(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": gamestate.gametype,
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
\ No newline at end of file
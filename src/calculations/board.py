@@ -4,6 +4,7 @@ import random
 from typing import List
 from src.state.state import GeneralGameState
 from src.calculations.statistics import get_random_outcome
+from src.config.reelstrips import get_reelstrip_arrays
 from src.events.events import reveal_event
 
 
@@ -20,6 +21,8 @@ class Board(GeneralGameState):
             self.get_current_distribution_conditions()["reel_weights"][self.gametype]
         )
         self.reelstrip = self.config.reels[self.reelstrip_id]
+        reelstrip_arrays = get_reelstrip_arrays(self.config, self.reelstrip_id)
+        symbol_table = self.symbol_storage.get_id_table(reelstrip_arrays.names)
         anticipation = [0] * self.config.num_reels
         board = [[]] * self.config.num_reels
         for i in range(self.config.num_reels):
@@ -29,18 +32,12 @@ class Board(GeneralGameState):
         first_scatter_reel = -1
         for reel in range(self.config.num_reels):
             reel_pos = reel_positions[reel]
+            window = reelstrip_arrays.get_window(self.reelstrip_id, reel, reel_pos, self.config.num_rows[reel])
             if self.config.include_padding:
-                top_symbols.append(
-                    self.create_symbol(self.reelstrip[reel][(reel_pos - 1) % len(self.reelstrip[reel])])
-                )
-                bottom_symbols.append(
-                    self.create_symbol(
-                        self.reelstrip[reel][(reel_pos + len(board[reel])) % len(self.reelstrip[reel])]
-                    )
-                )
+                top_symbols.append(self.create_symbol_from_id(window[0], symbol_table))
+                bottom_symbols.append(self.create_symbol_from_id(window[-1], symbol_table))
             for row in range(self.config.num_rows[reel]):
-                sym_id = self.reelstrip[reel][(reel_pos + row) % len(self.reelstrip[reel])]
-                sym = self.create_symbol(sym_id)
+                sym = self.create_symbol_from_id(window[row + 1], symbol_table)
                 board[reel][row] = sym
                 if sym.special:
                     for special_symbol in self.special_syms_on_board:
@@ -97,20 +94,16 @@ class Board(GeneralGameState):
 
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
+        reelstrip_arrays = get_reelstrip_arrays(self.config, self.reelstrip_id)
+        symbol_table = self.symbol_storage.get_id_table(reelstrip_arrays.names)
         for reel in range(self.config.num_reels):
             reel_pos = reel_positions[reel]
+            window = reelstrip_arrays.get_window(self.reelstrip_id, reel, reel_pos, self.config.num_rows[reel])
             if self.config.include_padding:
-                top_symbols.append(
-                    self.create_symbol(self.reelstrip[reel][(reel_pos - 1) % len(self.reelstrip[reel])])
-                )
-                bottom_symbols.append(
-                    self.create_symbol(
-                        self.reelstrip[reel][(reel_pos + len(board[reel])) % len(self.reelstrip[reel])]
-                    )
-                )
+                top_symbols.append(self.create_symbol_from_id(window[0], symbol_table))
+                bottom_symbols.append(self.create_symbol_from_id(window[-1], symbol_table))
             for row in range(self.config.num_rows[reel]):
-                sym_id = self.reelstrip[reel][(reel_pos + row) % len(self.reelstrip[reel])]
-                sym = self.create_symbol(sym_id)
+                sym = self.create_symbol_from_id(window[row + 1], symbol_table)
                 board[reel][row] = sym
 
                 if sym.special:
@@ -152,6 +145,21 @@ class Board(GeneralGameState):
 
         return symObject
 
+    def create_symbol_from_id(self, symbol_id: int, symbol_table: list) -> object:
+        """
+        Create a new symbol from its id in the compiled reelstrips, using the state classes of
+        SymbolStorage.get_id_table(). Gives the same symbol as create_symbol(name).
+        """
+        state_class = symbol_table[symbol_id]
+        if state_class is None:
+            return self.create_symbol(get_reelstrip_arrays(self.config).names[symbol_id])
+        symObject = state_class()
+        if symObject.name in self.special_symbol_functions:
+            for func in self.special_symbol_functions[symObject.name]:
+                func(symObject)
+
+        return symObject
+
     def refresh_special_syms(self) -> None:
         """Reset recorded speical symbols on board."""
         self.special_syms_on_board = {}
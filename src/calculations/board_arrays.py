@@ -0,0 +1,53 @@
+"""Integer-array representations of boards for batch (vectorised) win evaluation."""
+
+import numpy as np
+
+from src.calculations.symbol import Symbol
+
+EMPTY_SYMBOL_ID = -1
+
+
+def get_id_dtype(symbol_ids: dict) -> type:
+    """Smallest signed integer type holding all symbol ids and EMPTY_SYMBOL_ID."""
+    return np.int8 if len(symbol_ids) <= np.iinfo(np.int8).max else np.int16
+
+
+def encode_boards(
+    boards: list[list[list[Symbol]]], symbol_ids: dict, multiplier_key: str = "multiplier"
+) -> tuple[np.ndarray, np.ndarray]:
+    """Symbol-id and multiplier arrays of shape (num_boards, num_reels, max_rows).
+
+    Reels shorter than max_rows are padded with EMPTY_SYMBOL_ID. Multiplier values are only stored when
+    greater than 1, matching apply_added_symbol_mult().
+    """
+    num_reels = len(boards[0])
+    max_rows = max(len(reel) for board in boards for reel in board)
+    ids = np.full((len(boards), num_reels, max_rows), EMPTY_SYMBOL_ID, dtype=get_id_dtype(symbol_ids))
+    mults = np.zeros((len(boards), num_reels, max_rows), dtype=np.int64)
+    for board_idx, board in enumerate(boards):
+        for reel, symbols in enumerate(board):
+            for row, sym in enumerate(symbols):
+                ids[board_idx, reel, row] = symbol_ids[sym.name]
+                if sym.check_attribute(multiplier_key) and sym.get_attribute(multiplier_key) > 1:
+                    mults[board_idx, reel, row] = sym.get_attribute(multiplier_key)
+    return ids, mults
+
+
+def get_id_lookup(symbol_ids: dict, names: list) -> np.ndarray:
+    """Boolean lookup indexed by symbol id, True for the given names.
+
+    The array has one extra (False) entry so that EMPTY_SYMBOL_ID padding can be indexed directly.
+    """
+    lookup = np.zeros(len(symbol_ids) + 1, dtype=bool)
+    lookup[[symbol_ids[name] for name in names if name in symbol_ids]] = True
+    return lookup
+
+
+def leading_run_length(mask: np.ndarray) -> np.ndarray:
+    """Number of leading True values along the first (reel) axis."""
+    run = mask[0].copy()
+    run_length = run.astype(np.int32)
+    for reel in range(1, len(mask)):
+        run &= mask[reel]
+        run_length += run
+    return run_length
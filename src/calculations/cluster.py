@@ -1,9 +1,11 @@
 from collections import defaultdict
+from functools import lru_cache
 from abc import ABC
 from typing import List, Dict
 from src.calculations.board import Board
 from src.calculations.symbol import Symbol
 from src.config.config import Config
+from src.config.paytable import get_paytable_arrays
 from src.wins.multiplier_strategy import apply_mult
 
 
@@ -80,29 +82,84 @@ class Cluster:
                     wild_key,
                 )
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_board_graph(reel_lengths: tuple) -> tuple:
+        """Flat (reel, row) positions, neighbour indices and neighbour bitmasks for a board shape.
+
+        Positions are indexed reel by reel, so that iterating the flat index matches iterating the board.
+        Neighbours are listed in the same order as get_neighbours(): reel - 1, reel + 1, row - 1, row + 1.
+        """
+        offsets, positions = [], []
+        for reel, num_rows in enumerate(reel_lengths):
+            offsets.append(len(positions))
+            positions += [(reel, row) for row in range(num_rows)]
+
+        neighbours = []
+        for reel, row in positions:
+            adjacent = []
+            if reel > 0 and row < reel_lengths[reel - 1]:
+                adjacent.append(offsets[reel - 1] + row)
+            if reel < len(reel_lengths) - 1 and row < reel_lengths[reel + 1]:
+                adjacent.append(offsets[reel + 1] + row)
+            if row > 0:
+                adjacent.append(offsets[reel] + row - 1)
+            if row < reel_lengths[reel] - 1:
+                adjacent.append(offsets[reel] + row + 1)
+            neighbours.append(tuple(adjacent))
+
+        neighbour_masks = tuple(sum(1 << adjacent for adjacent in adjacent_idx) for adjacent_idx in neighbours)
+
+        return tuple(positions), tuple(neighbours), neighbour_masks
+
     @staticmethod
     def get_clusters(board: list[list[Symbol]], wild_key: str = "wild") -> dict:
-        """Return all symbol clusters of size >= 1."""
-        already_checked = []
+        """Return all symbol clusters of size >= 1.
+
+        Iterative flood-fill over the flattened board using integer bitsets for visited positions.
+        Clusters and their positions are returned in the same order as the recursive check_all_neighbours() search,
+        wilds are checked per-cluster so they can be shared between clusters of different symbols.
+        """
+        positions, neighbours, neighbour_masks = Cluster.get_board_graph(tuple(len(reel) for reel in board))
+        names = []
+        symbol_masks = defaultdict(int)
+        wild_mask = 0
+        for idx, sym in enumerate(sym for reel in board for sym in reel):
+            names.append(sym.name)
+            if sym.check_attribute(wild_key):
+                wild_mask |= 1 << idx
+            else:
+                symbol_masks[sym.name] |= 1 << idx
+
+        already_checked = wild_mask
         clusters = defaultdict(list)
-        for reel, _ in enumerate(board):
-            for row, _ in enumerate(board[reel]):
-                if (reel, row) not in already_checked and not (board[reel][row].check_attribute(wild_key)):
-                    potential_cluster = [(reel, row)]
-                    already_checked += [(reel, row)]
-                    local_checked = [(reel, row)]
-                    symbol = board[reel][row].name
-                    Cluster.check_all_neighbours(
-                        board,
-                        already_checked,
-                        local_checked,
-                        potential_cluster,
-                        reel,
-                        row,
-                        symbol,
-                        wild_key,
-                    )
-                    clusters[symbol].append(potential_cluster)
+        for start, symbol in enumerate(names):
+            if already_checked >> start & 1:
+                continue
+            match_mask = symbol_masks[symbol] | wild_mask
+            if not neighbour_masks[start] & match_mask:
+                clusters[symbol].append([positions[start]])
+                continue
+            local_checked = 1 << start
+            potential_cluster = []
+            # All unchecked neighbours are marked together, then matching ones are expanded depth-first
+            # (last entry is next), reproducing the position order of check_all_neighbours().
+            stack = [[start]]
+            while stack:
+                pending = stack[-1]
+                idx = pending.pop()
+                if not pending:
+                    stack.pop()
+                potential_cluster.append(positions[idx])
+                unchecked = neighbour_masks[idx] & ~local_checked
+                local_checked |= unchecked
+                unchecked &= match_mask
+                if unchecked:
+                    matches = [adjacent for adjacent in neighbours[idx] if unchecked >> adjacent & 1]
+                    matches.reverse()
+                    stack.append(matches)
+            already_checked |= local_checked & symbol_masks[symbol]
+            clusters[symbol].append(potential_cluster)
 
         return clusters
 
@@ -118,17 +175,20 @@ class Cluster:
         """Determine payout amount from cluster, including symbol multiplier and global multiplier value."""
         exploding_symbols = []
         total_win = 0
+        paytable = get_paytable_arrays(config)
         for sym in clusters:
+            if paytable.max_paying_kinds.get(sym, 0) == 0:
+                continue
             for cluster in clusters[sym]:
                 syms_in_cluster = len(cluster)
-                if (syms_in_cluster, sym) in config.paytable:
+                if paytable.get_pay(syms_in_cluster, sym) is not None:
                     cluster_mult = 0
                     for positions in cluster:
                         if board[positions[0]][positions[1]].check_attribute(multiplier_key):
                             if int(board[positions[0]][positions[1]].get_attribute(multiplier_key)) > 0:
                                 cluster_mult += board[positions[0]][positions[1]].get_attribute(multiplier_key)
                     cluster_mult = max(cluster_mult, 1)
-                    sym_win = config.paytable[(syms_in_cluster, sym)]
+                    sym_win = paytable.get_pay(syms_in_cluster, sym)
                     symwin_mult = sym_win * cluster_mult * global_multiplier
                     total_win += symwin_mult
                     json_positions = [{"reel": p[0], "row": p[1]} for p in cluster]
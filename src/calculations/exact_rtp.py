@@ -0,0 +1,198 @@
+"""Exact base-game win distribution of lines and ways reelstrips by enumerating reel stops."""
+
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+
+from src.config.paytable import refresh_paytable_arrays
+from src.config.reelstrips import get_reelstrip_arrays, refresh_reelstrip_arrays
+
+# Wins are summed in a different order to the simulation, so payouts are rounded to merge floating point noise
+WIN_DECIMALS = 10
+
+
+def get_reel_windows(config: object, reelstrip_id: str, reel: int) -> np.ndarray:
+    """Symbol ids of the board window for every stop position, shape (len(reel), num_rows)."""
+    arrays = get_reelstrip_arrays(config)
+    num_rows, length = config.num_rows[reel], arrays.lengths[reelstrip_id][reel]
+    padded = arrays.strips[reelstrip_id][reel]
+    return np.lib.stride_tricks.sliding_window_view(padded[1 : length + num_rows], num_rows)
+
+
+def count_unique(rows: np.ndarray) -> list[tuple[tuple, int]]:
+    """Distinct rows of a 2D array with the number of times each occurs."""
+    unique, counts = np.unique(rows, axis=0, return_counts=True)
+    return list(zip(map(tuple, unique.tolist()), counts.tolist()))
+
+
+def summarise_distribution(reelstrip_id: str, distribution: dict) -> dict:
+    """RTP, hit rate and the ordered {win: number of stop combinations} distribution."""
+    combinations = sum(distribution.values())
+    distribution = dict(sorted(distribution.items()))
+    return {
+        "reelstrip_id": reelstrip_id,
+        "combinations": combinations,
+        "rtp": sum(win * count for win, count in distribution.items()) / combinations,
+        "hit_rate": sum(count for win, count in distribution.items() if win > 0) / combinations,
+        "win_distribution": distribution,
+    }
+
+
+def get_ways_distribution(config: object, reelstrip_id: str, wild_key: str = "wild") -> dict:
+    """Exact ways-win distribution over all reel stops, following Ways.get_ways_data().
+
+    Each reel is reduced to the distinct (paying symbol counts, wild count) windows using prefix sums over the
+    reelstrip. Reels are then combined one at a time, tracking the ways of every symbol still in a win
+    and the payout of symbols whose win has ended, so identical partial boards are only evaluated once.
+    Symbol multipliers, scatter pays and features are not included.
+    """
+    arrays = refresh_reelstrip_arrays(config)
+    paytable = refresh_paytable_arrays(config)
+    names = arrays.names
+    paying_ids = [idx for idx, name in enumerate(names) if paytable.max_paying_kinds.get(name, 0) > 0]
+    wild_ids = [arrays.symbol_ids[name] for name in config.special_symbols[wild_key] if name in arrays.symbol_ids]
+    num_reels = len(config.reels[reelstrip_id])
+
+    reel_windows = []
+    for reel in range(num_reels):
+        num_rows, length = config.num_rows[reel], arrays.lengths[reelstrip_id][reel]
+        one_hot = arrays.strips[reelstrip_id][reel][1 : length + num_rows, None] == np.arange(len(names))
+        prefix = np.vstack([np.zeros((1, len(names)), dtype=np.int64), np.cumsum(one_hot, axis=0)])
+        counts = prefix[num_rows : num_rows + length] - prefix[:length]
+        reel_windows.append(
+            count_unique(np.column_stack([counts[:, paying_ids], counts[:, wild_ids].sum(axis=1)]))
+        )
+
+    # state: ((symbol index, ways), ...) for symbols still in a win -> {payout of ended wins: stop combinations}
+    states = defaultdict(lambda: defaultdict(int))
+    for window, count in reel_windows[0]:
+        alive = tuple((sym, n + window[-1]) for sym, n in enumerate(window[:-1]) if n > 0)
+        states[alive][0.0] += count
+
+    for reel in range(1, num_reels):
+        next_states = defaultdict(lambda: defaultdict(int))
+        for alive, ended_wins in states.items():
+            for window, count in reel_windows[reel]:
+                next_alive, added_win = [], 0.0
+                for sym, ways in alive:
+                    matches = window[sym] + window[-1]
+                    if matches > 0:
+                        next_alive.append((sym, ways * matches))
+                    else:
+                        payout = paytable.get_pay(reel, names[paying_ids[sym]])
+                        if payout is not None:
+                            added_win += payout * ways
+                next_wins = next_states[tuple(next_alive)]
+                for ended_win, state_count in ended_wins.items():
+                    next_wins[ended_win + added_win] += state_count * count
+        states = next_states
+
+    distribution = defaultdict(int)
+    for alive, ended_wins in states.items():
+        final_win = 0.0
+        for sym, ways in alive:
+            payout = paytable.get_pay(num_reels, names[paying_ids[sym]])
+            if payout is not None:
+                final_win += payout * ways
+        for ended_win, count in ended_wins.items():
+            distribution[round(ended_win + final_win, WIN_DECIMALS)] += count
+
+    return summarise_distribution(reelstrip_id, distribution)
+
+
+def get_lines_distribution(
+    config: object, reelstrip_id: str, wild_key: str = "wild", wild_sym: str = "W"
+) -> dict:
+    """Exact line-win distribution over all reel stops, following Lines.get_lines().
+
+    Partial boards are grouped by (line index, wild matches, first non-wild symbol, matches) of the lines which can
+    still extend, tracking the distribution of payouts from lines which have ended. For each group, the next reel
+    is projected onto the rows and symbols which can extend those lines, so windows differing elsewhere are combined.
+    Symbol multipliers, scatter pays and features are not included.
+    """
+    arrays = refresh_reelstrip_arrays(config)
+    paytable = refresh_paytable_arrays(config)
+    names = arrays.names
+    wild_ids = frozenset(
+        arrays.symbol_ids[name] for name in config.special_symbols[wild_key] if name in arrays.symbol_ids
+    )
+    max_paying_kind = [paytable.max_paying_kinds.get(name, 0) for name in names]
+    lines = list(config.paylines.values())
+    num_reels = len(config.reels[reelstrip_id])
+    reel_windows = [get_reel_windows(config, reelstrip_id, reel) for reel in range(num_reels)]
+
+    projections = {}
+
+    def get_projection(reel: int, rows: tuple, symbols: frozenset) -> list:
+        """Distinct windows on the given rows, with symbols outside of symbols (if not None) replaced by -1."""
+        if (reel, rows, symbols) not in projections:
+            window = reel_windows[reel][:, list(rows)]
+            if symbols is not None:
+                window = np.where(np.isin(window, list(symbols)), window, -1)
+            projections[(reel, rows, symbols)] = count_unique(window)
+        return projections[(reel, rows, symbols)]
+
+    @lru_cache(maxsize=None)
+    def get_line_win(wild_matches: int, first_non_wild: int, matches: int) -> float:
+        wild_win = paytable.get_pay(wild_matches, wild_sym) or 0
+        base_win = 0
+        if first_non_wild is not None:
+            base_win = paytable.get_pay(wild_matches + matches, names[first_non_wild]) or 0
+        return wild_win if wild_win > base_win else base_win
+
+    # state: (line index, wild matches, first non-wild symbol, matches) for extending lines
+    #   -> {payout of ended lines: stop combinations}
+    states = defaultdict(lambda: defaultdict(int))
+    for window, count in count_unique(reel_windows[0]):
+        alive = []
+        for line_index, line in enumerate(lines):
+            sym = window[line[0]]
+            if sym in wild_ids:
+                alive.append((line_index, 1, None, 0))
+            elif max_paying_kind[sym] > 0:
+                alive.append((line_index, 0, sym, 1))
+        states[tuple(alive)][0.0] += count
+
+    for reel in range(1, num_reels):
+        next_states = defaultdict(lambda: defaultdict(int))
+        for alive, ended_wins in states.items():
+            rows = tuple(sorted({lines[line_index][reel] for line_index, _, _, _ in alive}))
+            row_index = {row: idx for idx, row in enumerate(rows)}
+            # Lines with a first non-wild symbol only distinguish that symbol, wilds and anything else
+            symbols = frozenset(first_non_wild for _, _, first_non_wild, _ in alive)
+            symbols = None if None in symbols else symbols | wild_ids
+            for window, count in get_projection(reel, rows, symbols):
+                next_alive, added_win = [], 0.0
+                for line_index, wild_matches, first_non_wild, matches in alive:
+                    sym = window[row_index[lines[line_index][reel]]]
+                    if first_non_wild is None:
+                        if sym in wild_ids:
+                            next_alive.append((line_index, wild_matches + 1, None, 0))
+                        else:
+                            next_alive.append((line_index, wild_matches, sym, 1))
+                    elif sym == first_non_wild or sym in wild_ids:
+                        next_alive.append((line_index, wild_matches, first_non_wild, matches + 1))
+                    else:
+                        added_win += get_line_win(wild_matches, first_non_wild, matches)
+                next_wins = next_states[tuple(next_alive)]
+                for ended_win, state_count in ended_wins.items():
+                    next_wins[ended_win + added_win] += state_count * count
+        states = next_states
+
+    distribution = defaultdict(int)
+    for alive, ended_wins in states.items():
+        final_win = sum(get_line_win(*line_state[1:]) for line_state in alive)
+        for ended_win, count in ended_wins.items():
+            distribution[round(ended_win + final_win, WIN_DECIMALS)] += count
+
+    return summarise_distribution(reelstrip_id, distribution)
+
+
+def get_exact_rtp(config: object, win_type: str, reelstrip_ids: list = None, **kwargs) -> dict:
+    """Exact RTP, hit rate and win distribution for each reelstrip id (all of config.reels by default)."""
+    evaluators = {"lines": get_lines_distribution, "ways": get_ways_distribution}
+    if win_type not in evaluators:
+        raise ValueError(f"Exact RTP is only available for {list(evaluators)} games, not '{win_type}'.")
+    reelstrip_ids = list(config.reels) if reelstrip_ids is None else reelstrip_ids
+    return {reelstrip_id: evaluators[win_type](config, reelstrip_id, **kwargs) for reelstrip_id in reelstrip_ids}
@@ -1,8 +1,12 @@
 """Evaluates and records winds for lines games."""
 
+import numpy as np
+
 from src.calculations.symbol import Symbol
+from src.calculations.board_arrays import get_id_dtype, get_id_lookup, leading_run_length
 from src.config.config import Config
-from src.wins.multiplier_strategy import apply_mult
+from src.config.paytable import get_paytable_arrays
+from src.wins.multiplier_strategy import apply_mult, apply_mult_value, check_batch_strategy
 from src.events.events import (
     win_info_event,
     set_win_event,
@@ -38,11 +42,15 @@ class Lines:
             "totalWin": 0,
             "wins": [],
         }
+        paytable = get_paytable_arrays(config)
 
         for line_index in config.paylines.keys():
             line = config.paylines[line_index]
             first_sym = board[0][line[0]]
             finished_wild_win = False if first_sym.check_attribute(wild_key) else True
+            if finished_wild_win and paytable.max_paying_kinds.get(first_sym.name, 0) == 0:
+                # Lines starting with a non-wild, non-paying symbol cannot win
+                continue
             first_non_wild = first_sym if finished_wild_win else None
             potential_line = [first_sym]
 
@@ -68,11 +76,13 @@ class Lines:
                         break
                 potential_line.append(sym)
 
-            if (wild_matches, wild_sym) in config.paytable:
-                wild_win = config.paytable[(wild_matches, wild_sym)]
+            wild_pay = paytable.get_pay(wild_matches, wild_sym)
+            if wild_pay is not None:
+                wild_win = wild_pay
             if first_non_wild is not None:
-                if (wild_matches + matches, first_non_wild.name) in config.paytable:
-                    base_win = config.paytable[(wild_matches + matches, first_non_wild.name)]
+                base_pay = paytable.get_pay(wild_matches + matches, first_non_wild.name)
+                if base_pay is not None:
+                    base_win = base_pay
 
             if base_win > 0 or wild_win > 0:
                 if wild_win > base_win:
@@ -117,6 +127,110 @@ class Lines:
 
         return return_data
 
+    @staticmethod
+    def evaluate_lines_batch(
+        board_ids: np.ndarray,
+        config: Config,
+        symbol_ids: dict,
+        board_mults: np.ndarray = None,
+        wild_key: str = "wild",
+        wild_sym: str = "W",
+    ) -> dict:
+        """Vectorised line detection for encoded boards of shape (num_boards, num_reels, num_rows).
+
+        Returns arrays of shape (num_boards, num_paylines), in config.paylines order:
+        kind, symbol (id of the reported symbol), wild (True if the wild-only prefix pays more),
+        win (paytable amount before multipliers, 0 if the line does not pay) and symbol_mult.
+        """
+        lines = np.array(list(config.paylines.values()), dtype=np.intp)
+        num_reels = lines.shape[1]
+        # Gathered arrays are (num_reels, num_paylines, num_boards), so that each reel is a contiguous slice
+        board_ids = np.ascontiguousarray(np.moveaxis(board_ids, 0, -1), dtype=get_id_dtype(symbol_ids))
+        board_wilds = get_id_lookup(symbol_ids, config.special_symbols[wild_key])[board_ids]
+        line_syms = np.stack([board_ids[reel, lines[:, reel]] for reel in range(num_reels)])
+        is_wild = np.stack([board_wilds[reel, lines[:, reel]] for reel in range(num_reels)])
+
+        wild_matches = leading_run_length(is_wild)
+        has_non_wild = wild_matches < num_reels
+        first_non_wild = line_syms[-1]
+        for reel in range(num_reels - 2, -1, -1):
+            first_non_wild = np.where(is_wild[reel], first_non_wild, line_syms[reel])
+        kinds = leading_run_length(is_wild | (line_syms == first_non_wild))
+
+        pay_array = get_paytable_arrays(config, symbol_ids).get_pay_array(num_reels).ravel()
+        base_win = np.where(has_non_wild, pay_array[first_non_wild.astype(np.int32) * (num_reels + 1) + kinds], 0.0)
+        if wild_sym in symbol_ids:
+            wild_win = pay_array[symbol_ids[wild_sym] * (num_reels + 1) + wild_matches]
+        else:
+            wild_win = np.zeros(wild_matches.shape)
+
+        use_wild = wild_win > base_win
+        win_kind = np.where(use_wild, wild_matches, kinds)
+        if board_mults is None:
+            symbol_mult = np.zeros(win_kind.shape, dtype=np.int64)
+        else:
+            board_mults = np.moveaxis(board_mults, 0, -1)
+            symbol_mult = np.zeros(win_kind.shape, dtype=board_mults.dtype)
+            for reel in range(num_reels):
+                symbol_mult += np.where(win_kind > reel, board_mults[reel, lines[:, reel]], 0)
+
+        return {
+            "kind": win_kind.T,
+            "symbol": np.where(use_wild, line_syms[0], first_non_wild).T,
+            "wild": use_wild.T,
+            "win": np.where(use_wild, wild_win, base_win).T,
+            "symbol_mult": symbol_mult.T,
+        }
+
+    @staticmethod
+    def get_lines_batch(
+        board_ids: np.ndarray,
+        config: Config,
+        symbol_ids: dict,
+        board_mults: np.ndarray = None,
+        wild_key: str = "wild",
+        wild_sym: str = "W",
+        multiplier_method: str = "symbol",
+        global_multiplier: int = 1,
+    ) -> list[dict]:
+        """Batch equivalent of get_lines(), returning one return_data dict per encoded board.
+        Only the built-in multiplier strategies are supported, as symbol multipliers are summed per line.
+        """
+        check_batch_strategy(multiplier_method)
+        line_keys = list(config.paylines.keys())
+        symbol_names = {idx: name for name, idx in symbol_ids.items()}
+        paytable = get_paytable_arrays(config, symbol_ids)
+        batch = Lines.evaluate_lines_batch(board_ids, config, symbol_ids, board_mults, wild_key, wild_sym)
+
+        all_return_data = [{"totalWin": 0, "wins": []} for _ in range(len(board_ids))]
+        for board_idx, line_idx in zip(*np.nonzero(batch["win"] > 0)):
+            kind = int(batch["kind"][board_idx, line_idx])
+            symbol = symbol_names[int(batch["symbol"][board_idx, line_idx])]
+            line = config.paylines[line_keys[line_idx]]
+            # Payouts are re-read from the paytable rows so that wins keep their original (int/float) type
+            base_win = paytable.get_pay(kind, wild_sym if batch["wild"][board_idx, line_idx] else symbol)
+            # As in get_lines(), global_multiplier is only reported in the meta-data
+            line_win, applied_mult = apply_mult_value(
+                multiplier_method, base_win, symbol_multiplier=int(batch["symbol_mult"][board_idx, line_idx])
+            )
+            win_dict = Lines.line_win_info(
+                symbol,
+                kind,
+                line_win,
+                [{"reel": idx, "row": line[idx]} for idx in range(0, kind)],
+                {
+                    "lineIndex": line_keys[line_idx],
+                    "multiplier": applied_mult,
+                    "winWithoutMult": base_win,
+                    "globalMult": int(global_multiplier),
+                    "lineMultiplier": int(applied_mult / global_multiplier),
+                },
+            )
+            all_return_data[board_idx]["totalWin"] += line_win
+            all_return_data[board_idx]["wins"].append(win_dict)
+
+        return all_return_data
+
     @staticmethod
     def emit_linewin_events(gamestate) -> None:
         """Transmit win events asociated with lines wins."""
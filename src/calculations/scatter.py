@@ -4,6 +4,7 @@ from typing import List, Dict
 from collections import defaultdict
 from src.calculations.symbol import Symbol
 from src.config.config import Config
+from src.config.paytable import get_paytable_arrays
 
 
 class Scatter:
@@ -48,6 +49,7 @@ class Scatter:
         symbols_on_board = defaultdict(list)
         wild_positions = []
         total_win = 0.0
+        paytable = get_paytable_arrays(config)
         for reel_idx, reel in enumerate(board):
             for row_idx, symbol in enumerate(reel):
                 if symbol.name not in config.special_symbols[wild_key]:
@@ -60,7 +62,8 @@ class Scatter:
             if len(wild_positions) > 0:
                 symbols_on_board[sym].extend(wild_positions)
             win_size = len(symbols_on_board[sym])
-            if (win_size, sym) in config.paytable:
+            payout = paytable.get_pay(win_size, sym)
+            if payout is not None:
                 symbol_mult = 0
                 for p in symbols_on_board[sym]:
                     if board[p["reel"]][p["row"]].check_attribute(multiplier_key):
@@ -75,12 +78,12 @@ class Scatter:
                 rows_for_overlay.append(overlay_position[1])
                 symbol_win_data = {
                     "symbol": sym,
-                    "win": config.paytable[(win_size, sym)] * global_multiplier * symbol_mult,
+                    "win": payout * global_multiplier * symbol_mult,
                     "positions": symbols_on_board[sym],
                     "meta": {
                         "globalMult": global_multiplier,
                         "clusterMult": symbol_mult,
-                        "winWithoutMult": config.paytable[(win_size, sym)],
+                        "winWithoutMult": payout,
                         "overlay": {
                             "reel": overlay_position[0],
                             "row": overlay_position[1],
@@ -1,10 +1,96 @@
 import random
+from bisect import bisect_left
 from typing import Union
 
 
+class CumulativeSampler:
+    """Cumulative weights of a {value: weight} distribution, sampled with a binary search.
+
+    Each draw consumes a single random.uniform(0, total_weight) call and returns the same value as the linear scan
+    in get_random_outcome(), so seeded simulations are reproducible whichever path is used.
+    """
+
+    def __init__(self, distribution: dict):
+        self.values = list(distribution.keys())
+        self.cumulative = []
+        cumulative = 0.0
+        for weight in distribution.values():
+            cumulative += weight
+            self.cumulative.append(cumulative)
+        self.total_weight = sum(distribution.values())
+
+    def sample(self, totalWeight: float = None) -> Union[float, int]:
+        """Draw a value, optionally rolling over a total weight other than the sum of the distribution."""
+        roll = random.uniform(0, self.total_weight if totalWeight is None else totalWeight)
+        idx = bisect_left(self.cumulative, roll)
+        if idx < len(self.values):
+            return self.values[idx]
+
+        return Exception("error drawing item from distribution")
+
+
+class WeightedDistribution(dict):
+    """{value: weight} dictionary caching its CumulativeSampler, which is discarded whenever the dictionary changes."""
+
+    def get_sampler(self) -> CumulativeSampler:
+        """Cached sampler, rebuilt after any change to the distribution."""
+        sampler = self.__dict__.get("_sampler")
+        if sampler is None:
+            sampler = self._sampler = CumulativeSampler(self)
+        return sampler
+
+    def _invalidate(self) -> None:
+        self.__dict__.pop("_sampler", None)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidate()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._invalidate()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self._invalidate()
+        return result
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._invalidate()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._invalidate()
+        return result
+
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self._invalidate()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._invalidate()
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
 def get_random_outcome(distribution: dict, totalWeight: float = None) -> Union[float, int]:
-    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}"""
+    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}
+
+    WeightedDistribution inputs (as set up by Distribution for its conditions) reuse a cached sampler.
+    """
     assert isinstance(distribution, dict), "distribution must be of type: dict "
+    if isinstance(distribution, WeightedDistribution):
+        return distribution.get_sampler().sample(totalWeight)
+
     if totalWeight is None:
         totalWeight = sum(distribution.values())
     roll = random.uniform(0, totalWeight)
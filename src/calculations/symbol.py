@@ -1,29 +1,123 @@
 """Handle symbol classes and initial generation."""
 
+from copy import deepcopy
 from typing import Dict
 
+# Attributes commonly assigned to symbols on the board, stored in fixed SymbolState slots and tracked in its flags
+BOARD_ATTRIBUTES = ("multiplier", "prize", "explode")
+# SymbolState.flags holds one bit per special property below ORDER_SHIFT, EXTRA_FLAG once the `extra` dictionary
+# exists, and above ORDER_SHIFT the order of first assignments as codes of ORDER_BITS: the BOARD_ATTRIBUTES index + 1,
+# or EXTRA_CODE for the next key of SymbolState.extra
+ORDER_SHIFT = 32
+PROPERTY_MASK = (1 << ORDER_SHIFT) - 1
+EXTRA_FLAG = 1 << (ORDER_SHIFT - 1)
+ORDER_BITS = 3
+ORDER_MASK = (1 << ORDER_BITS) - 1
+EXTRA_CODE = len(BOARD_ATTRIBUTES) + 1
 
 class SymbolStorage:
-    """Initial symbol generation from configuration file."""
+    """
+    Initial symbol generation from configuration file.
+    Each symbol name is built once as a prototype. Board symbols are light-weight SymbolState instances which share the
+    prototype attributes and only store values assigned to that particular board position.
+    """
 
     def __init__(self, config: object, all_symbols: list):
         self.config = config
         self.symbols: Dict[str, Symbol] = {}
+        self.symbol_states: Dict[str, type] = {}
+        self.property_bits = get_property_bits(config)
+        self.id_table, self.id_table_names = None, None
         for symbol in all_symbols:
-            self.symbols[symbol] = Symbol(self.config, symbol)
+            self.add_symbol(symbol)
+
+    def add_symbol(self, name: str) -> None:
+        """Build symbol prototype and the board-state class sharing its attributes."""
+        self.symbols[name] = Symbol(self.config, name)
+        self.symbol_states[name] = make_symbol_state_class(self.symbols[name], self.property_bits)
+
+    def __getstate__(self) -> dict:
+        # State classes are created at run-time and can't be looked up by pickle, they are rebuilt from the prototypes
+        state = dict(vars(self))
+        state["symbol_states"] = None
+        state["id_table"], state["id_table_names"] = None, None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        vars(self).update(state)
+        self.symbol_states = {
+            name: make_symbol_state_class(prototype, self.property_bits) for name, prototype in self.symbols.items()
+        }
+
+    def get_id_table(self, names: list) -> list:
+        """
+        State classes indexed by symbol id, given the symbol names in id order (ReelstripArrays.names).
+        Names without a symbol are None. The table is rebuilt if a different list of names is passed.
+        """
+        if self.id_table_names is not names:
+            self.id_table = [self.symbol_states.get(name) for name in names]
+            self.id_table_names = names
+        return self.id_table
 
     def create_symbol_state(self, symbol_name: str) -> object:
         """Create new symbol class instance."""
-        return Symbol(self.config, symbol_name)
+        if symbol_name not in self.symbol_states:
+            self.add_symbol(symbol_name)
+        return self.symbol_states[symbol_name]()
 
     def get_symbol(self, name: str) -> object:
         """Retrieve symbol class from name."""
         if name not in self.symbols:
-            self.symbols[name] = Symbol(self.config, name)
+            self.add_symbol(name)
         return self.symbols[name]
 
 
-class Symbol:
+class BaseSymbol:
+    """Methods shared by symbol prototypes (Symbol) and board symbols (SymbolState)."""
+
+    __slots__ = ()
+
+    def register_special_function(self, special_function: callable) -> None:
+        """Assign special symbol function."""
+        # New list, the existing one may be shared with the symbol prototype
+        self.special_functions = self.special_functions + [special_function]
+
+    def apply_special_function(self) -> callable:
+        """Apply registered symbol function."""
+        for fun in self.special_functions:
+            fun(self)
+
+    def get_attributes(self) -> dict:
+        """All symbol attributes, in the order they were assigned."""
+        return vars(self)
+
+    def is_special(self) -> bool:
+        """Boolean if symbol has any special properties."""
+        return self.special
+
+    def check_attribute(self, *args) -> bool:
+        """Check if an attribute exists in a given list."""
+        for arg in args:
+            if hasattr(self, arg) and (not (isinstance(getattr(self, arg), bool)) or getattr(self, arg) is True):
+                return True
+        return False
+
+    def get_attribute(self, attribute) -> type:
+        """Return existing attribute value."""
+        return getattr(self, attribute)
+
+    def assign_attribute(self, attribute_dict: dict) -> None:
+        """Assign attribute value to symbol."""
+        for prop, value in attribute_dict.items():
+            setattr(self, prop, value)
+
+    def __eq__(self, name: str) -> bool:
+        if self.name == name:
+            return True
+        return False
+
+
+class Symbol(BaseSymbol):
     """Create symbol from name (string) and assign relevant attributes and special functions."""
 
     def __init__(self, config: object, name: str) -> None:
@@ -41,15 +135,6 @@ class Symbol:
 
         self.assign_paying_bool(config)
 
-    def register_special_function(self, special_function: callable) -> None:
-        """Assign special symbol function."""
-        self.special_functions.append(special_function)
-
-    def apply_special_function(self) -> callable:
-        """Apply registered symbol function."""
-        for fun in self.special_functions:
-            fun(self)
-
     def assign_paying_bool(self, config) -> None:
         """Extract paytable from a given symbol."""
         paying_symbols = set()
@@ -66,27 +151,157 @@ class Symbol:
             self.is_paying = True
             self.paytable = pay_value
 
-    def is_special(self) -> bool:
-        """Boolean if symbol has any special properties."""
-        return self.special
+
+class SymbolState(BaseSymbol):
+    """
+    Symbol on a board position, without an instance __dict__. Prototype values are stored on the class, except for
+    special properties and BOARD_ATTRIBUTES, which are read from prototype_attributes until assigned. These are
+    tracked in the `flags` bitmask, so check_attribute() is a single bit test for them.
+    Values assigned to this position are written to the BOARD_ATTRIBUTES slots, or to the `extra` dictionary
+    (created on first use) for any other attribute. `flags` also keeps the order of first assignments for
+    get_attributes(), so a new board symbol only sets a single slot.
+    """
+
+    __slots__ = ("flags", "extra") + BOARD_ATTRIBUTES
+    prototype_attributes: dict = {}
+    prototype_flags: int = 0
+    property_bits: Dict[str, int] = {}
+
+    def __init__(self) -> None:
+        """Attributes are inherited from the symbol prototype."""
+        set_flags(self, self.prototype_flags)
+
+    def __setattr__(self, attribute: str, value) -> None:
+        flags = self.flags
+        if attribute in BOARD_ATTRIBUTES:
+            if not self.is_assigned(attribute):
+                flags = push_order(flags, BOARD_ATTRIBUTES.index(attribute) + 1)
+            object.__setattr__(self, attribute, value)
+        elif attribute in self.prototype_attributes and attribute not in self.property_bits:
+            raise AttributeError(f"'{attribute}' is shared by all '{self.name}' symbols, create a new symbol instead")
+        else:
+            if not flags & EXTRA_FLAG:
+                object.__setattr__(self, "extra", {})
+                flags |= EXTRA_FLAG
+            if attribute not in self.extra:
+                flags = push_order(flags, EXTRA_CODE)
+            self.extra[attribute] = value
+        bit = self.property_bits.get(attribute)
+        if bit is not None:
+            if value is True or value.__class__ is not bool:
+                flags |= bit
+            else:
+                flags &= ~bit
+        set_flags(self, flags)
+
+    def __getattr__(self, attribute: str):
+        # Only called for attributes not found on the class or in a set slot
+        if self.flags & EXTRA_FLAG and attribute in self.extra:
+            return self.extra[attribute]
+        try:
+            return self.prototype_attributes[attribute]
+        except KeyError:
+            raise AttributeError(attribute) from None
+
+    def is_assigned(self, attribute: str) -> bool:
+        """Check if a BOARD_ATTRIBUTES slot has been assigned on this symbol."""
+        try:
+            object.__getattribute__(self, attribute)
+        except AttributeError:
+            return False
+        return True
+
+    def get_assigned(self) -> list:
+        """(attribute, value) pairs assigned to this symbol, in order of first assignment."""
+        codes, order = [], self.flags >> ORDER_SHIFT
+        while order:
+            codes.append(order & ORDER_MASK)
+            order >>= ORDER_BITS
+        extra_keys = iter(self.extra if self.flags & EXTRA_FLAG else ())
+        assigned = []
+        for code in reversed(codes):
+            attribute = next(extra_keys) if code == EXTRA_CODE else BOARD_ATTRIBUTES[code - 1]
+            assigned.append((attribute, getattr(self, attribute)))
+        return assigned
 
     def check_attribute(self, *args) -> bool:
         """Check if an attribute exists in a given list."""
+        flags = self.flags
+        property_bits = self.property_bits
         for arg in args:
-            if hasattr(self, arg) and (not (isinstance(getattr(self, arg), bool)) or getattr(self, arg) is True):
+            if arg in property_bits:
+                if flags & property_bits[arg]:
+                    return True
+            elif BaseSymbol.check_attribute(self, arg):
                 return True
         return False
 
-    def get_attribute(self, attribute) -> type:
-        """Return existing attribute value."""
-        return getattr(self, attribute)
+    def get_attributes(self) -> dict:
+        """Prototype attributes updated with any values assigned to this symbol."""
+        if self.flags <= PROPERTY_MASK:
+            return self.prototype_attributes
+        return {**self.prototype_attributes, **dict(self.get_assigned())}
 
-    def assign_attribute(self, attribute_dict: dict) -> None:
-        """Assign attribute value to symbol."""
-        for prop, value in attribute_dict.items():
-            setattr(self, prop, value)
+    def __copy__(self) -> "SymbolState":
+        symbol = type(self)()
+        for attribute, value in self.get_assigned():
+            setattr(symbol, attribute, value)
+        return symbol
 
-    def __eq__(self, name: str) -> bool:
-        if self.name == name:
-            return True
-        return False
+    def __deepcopy__(self, memo: dict) -> "SymbolState":
+        symbol = type(self)()
+        memo[id(self)] = symbol
+        for attribute, value in self.get_assigned():
+            setattr(symbol, attribute, deepcopy(value, memo))
+        return symbol
+
+    def __reduce__(self):
+        # State classes are created at run-time, pickle as a regular symbol with all attributes
+        return (restore_symbol, (self.get_attributes(),))
+
+
+set_flags = SymbolState.flags.__set__
+
+
+def push_order(flags: int, code: int) -> int:
+    """Append an assignment code to the order kept in SymbolState flags."""
+    return (flags >> ORDER_SHIFT << ORDER_BITS | code) << ORDER_SHIFT | flags & PROPERTY_MASK
+
+
+def get_property_bits(config: object) -> Dict[str, int]:
+    """Bit assigned to each special property in the config, and to attributes commonly assigned on the board."""
+    properties = [prop for prop in config.special_symbols.keys() if isinstance(prop, str)]
+    properties += [attribute for attribute in BOARD_ATTRIBUTES if attribute not in properties]
+    assert len(properties) < ORDER_SHIFT - 1, f"at most {ORDER_SHIFT - 2} special properties are supported"
+    return {prop: 1 << idx for idx, prop in enumerate(properties)}
+
+
+def make_symbol_state_class(prototype: Symbol, property_bits: Dict[str, int]) -> type:
+    """
+    Create a SymbolState subclass holding the precomputed attributes of a symbol prototype.
+    Property values are left off the class, so values assigned to a board symbol are not hidden by them.
+    """
+    attributes = dict(vars(prototype))
+    prototype_flags = 0
+    for prop, bit in property_bits.items():
+        if prop in attributes and (attributes[prop] is True or attributes[prop].__class__ is not bool):
+            prototype_flags |= bit
+    return type(
+        f"SymbolState_{prototype.name}",
+        (SymbolState,),
+        {
+            **{key: value for key, value in attributes.items() if key not in property_bits},
+            "__slots__": (),
+            "prototype_attributes": attributes,
+            "prototype_flags": prototype_flags,
+            "property_bits": property_bits,
+            "__module__": __name__,
+        },
+    )
+
+
+def restore_symbol(attributes: dict) -> Symbol:
+    """Rebuild a symbol from its attributes."""
+    symbol = Symbol.__new__(Symbol)
+    vars(symbol).update(attributes)
+    return symbol
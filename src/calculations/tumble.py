@@ -1,6 +1,7 @@
 from copy import copy
 from src.events.events import set_win_event, set_total_event
 from src.calculations.board import Board
+from src.config.reelstrips import get_reelstrip_arrays
 
 
 class Tumble(Board):
@@ -11,6 +12,8 @@ class Tumble(Board):
         self.board_before_tumble = copy(self.board)
         static_board = copy(self.board)
         self.new_symbols_from_tumble = [[] for _ in range(len(static_board))]
+        reelstrip_arrays = get_reelstrip_arrays(self.config, self.reelstrip_id)
+        symbol_table = self.symbol_storage.get_id_table(reelstrip_arrays.names)
 
         for reel, _ in enumerate(static_board):
             exploding_symbols = 0
@@ -24,8 +27,8 @@ class Tumble(Board):
                 if i == 0 and self.config.include_padding:
                     insert_sym = self.top_symbols[reel]
                 else:
-                    nme = self.reelstrip[reel][(reel_pos) % len(self.reelstrip[reel])]
-                    insert_sym = self.create_symbol(nme)
+                    symbol_id = reelstrip_arrays.get_symbol_id(self.reelstrip_id, reel, reel_pos)
+                    insert_sym = self.create_symbol_from_id(symbol_id, symbol_table)
                     self.new_symbols_from_tumble[reel].insert(0, insert_sym)
                 copy_reel.insert(0, insert_sym)
 
@@ -38,11 +41,9 @@ class Tumble(Board):
             static_board[reel] = copy_reel
 
             if self.config.include_padding and exploding_symbols > 0:
-                padding_name = str(
-                    self.reelstrip[reel][(self.reel_positions[reel] - 1) % len(self.reelstrip[reel])]
-                )
-                self.top_symbols[reel] = self.create_symbol(padding_name)
-                self.new_symbols_from_tumble[reel].insert(0, self.create_symbol(padding_name))
+                padding_id = reelstrip_arrays.get_symbol_id(self.reelstrip_id, reel, self.reel_positions[reel] - 1)
+                self.top_symbols[reel] = self.create_symbol_from_id(padding_id, symbol_table)
+                self.new_symbols_from_tumble[reel].insert(0, self.create_symbol_from_id(padding_id, symbol_table))
 
         self.board = static_board
         self.get_special_symbols_on_board()
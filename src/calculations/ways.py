@@ -1,9 +1,12 @@
 """Ways wins executables/calculations."""
 
-from collections import defaultdict
+import numpy as np
+
 from src.calculations.symbol import Symbol
+from src.calculations.board_arrays import EMPTY_SYMBOL_ID, get_id_lookup, leading_run_length
 from src.config.config import Config
-from src.wins.multiplier_strategy import apply_mult
+from src.config.paytable import get_paytable_arrays
+from src.wins.multiplier_strategy import apply_mult_value
 from src.events.events import (
     win_info_event,
     set_win_event,
@@ -14,82 +17,180 @@ from src.events.events import (
 class Ways:
     """Collection of Ways-wins functions"""
 
+    @staticmethod
+    def get_ways_positions(board_names: list[list[str]], symbol: str, kind: int, wild_names: list) -> list[dict]:
+        """Winning positions for the first kind reels: like-symbols followed by wilds on each reel."""
+        positions = []
+        for reel in range(kind):
+            positions += [{"reel": reel, "row": row} for row, name in enumerate(board_names[reel]) if name == symbol]
+            positions += [
+                {"reel": reel, "row": row} for row, name in enumerate(board_names[reel]) if name in wild_names
+            ]
+        return positions
+
+    @staticmethod
+    def ways_win_info(payout: float, symbol: str, kind: int, ways: int, symbol_mult: int, positions: list) -> tuple:
+        """Construct ways-win event key, returning the win amount before global multiplier and the win dict."""
+        win = payout * ways
+        win_amt, multiplier = apply_mult_value("global", win)
+        return win, {
+            "symbol": symbol,
+            "kind": kind,
+            "win": win_amt,
+            "positions": positions,
+            "meta": {
+                "ways": ways,
+                "globalMult": multiplier,
+                "winWithoutMult": win,
+                "symbolMult": symbol_mult,
+            },
+        }
+
     @staticmethod
     def get_ways_data(
         config: Config, board: list[list[Symbol]], wild_key: str = "wild", multiplier_key="multiplier"
     ):
-        """Ways calculation with possibility for global multiplier application."""
+        """Ways calculation with possibility for global multiplier application.
+
+        The board is reduced to per-reel symbol counts and multiplier sums for each symbol appearing on the
+        first reel, along with per-reel wild counts and multipliers. Ways are the running product over reels of
+        (symbol count + wild count + multipliers), positions are only built for winning symbols.
+        """
         return_data = {
             "totalWin": 0,
             "wins": [],
         }
-        potential_wins = defaultdict()
-        wilds = [[] for _ in range(len(board))]
-        for reel, _ in enumerate(board):
-            for row, _ in enumerate(board[reel]):
-                sym = board[reel][row]
-                if reel == 0 and sym.name not in potential_wins:
-                    potential_wins[sym.name] = [[] for _ in range(len(board))]
-                    potential_wins[sym.name][0] = [{"reel": reel, "row": row}]
-                elif sym.name in potential_wins:
-                    potential_wins[sym.name][reel].append({"reel": reel, "row": row})
-
-                if sym.name in config.special_symbols[wild_key]:
-                    wilds[reel].append({"reel": reel, "row": row})
-
-        for symbol in potential_wins:
+        num_reels = len(board)
+        wild_names = config.special_symbols[wild_key]
+        paytable = get_paytable_arrays(config)
+        counts, mult_sums = {}, {}
+        wild_counts, wild_mults = [0] * num_reels, [0] * num_reels
+        board_names = None
+        for reel, symbols in enumerate(board):
+            for sym in symbols:
+                name = sym.name
+                # Only symbols on the first reel which appear in the paytable can win
+                if reel == 0 and name not in counts and paytable.max_paying_kinds.get(name, 0) > 0:
+                    counts[name], mult_sums[name] = [0] * num_reels, [0] * num_reels
+                is_wild = name in wild_names
+                if not (is_wild or name in counts):
+                    continue
+                mult = 0
+                if sym.check_attribute(multiplier_key) and sym.get_attribute(multiplier_key) > 1:
+                    mult = sym.get_attribute(multiplier_key)
+                if name in counts:
+                    counts[name][reel] += 1
+                    mult_sums[name][reel] += mult
+                if is_wild:
+                    wild_counts[reel] += 1
+                    wild_mults[reel] += mult
+
+        for symbol, symbol_counts in counts.items():
             kind, ways, cumulative_sym_mult = 0, 1, 0
-            for reel, _ in enumerate(potential_wins[symbol]):
-                if len(potential_wins[symbol][reel]) > 0 or len(wilds[reel]) > 0:
-                    kind += 1
-                    mult_enhance = 0
-                    # Note that here multipliers on subsequent reels multiplier (not add, like in lines games)
-                    for s in potential_wins[symbol][reel]:
-                        if (
-                            board[s["reel"]][s["row"]].check_attribute(multiplier_key)
-                            and board[s["reel"]][s["row"]].get_attribute(multiplier_key) > 1
-                        ):
-                            mult_enhance += board[s["reel"]][s["row"]].get_attribute(multiplier_key)
-                    for s in wilds[reel]:
-                        if (
-                            board[s["reel"]][s["row"]].check_attribute(multiplier_key)
-                            and board[s["reel"]][s["row"]].get_attribute(multiplier_key) > 1
-                        ):
-                            mult_enhance += board[s["reel"]][s["row"]].get_attribute(multiplier_key)
-
-                    ways *= len(potential_wins[symbol][reel]) + len(wilds[reel]) + mult_enhance
-                    cumulative_sym_mult += mult_enhance
-                else:
+            for reel in range(num_reels):
+                if symbol_counts[reel] == 0 and wild_counts[reel] == 0:
                     break
+                kind += 1
+                # Note that here multipliers on subsequent reels multiplier (not add, like in lines games)
+                mult_enhance = mult_sums[symbol][reel] + wild_mults[reel]
+                ways *= symbol_counts[reel] + wild_counts[reel] + mult_enhance
+                cumulative_sym_mult += mult_enhance
 
-            if (kind, symbol) in config.paytable:
-                positions = []
-                for reel in range(kind):
-                    for pos in potential_wins[symbol][reel]:
-                        positions += [pos]
-                    for pos in wilds[reel]:
-                        positions += [pos]
-
-                win = config.paytable[kind, symbol] * ways
-                win_amt, multiplier = apply_mult(board=board, strategy="global", win_amount=win)
-                return_data["wins"] += [
-                    {
-                        "symbol": symbol,
-                        "kind": kind,
-                        "win": win_amt,
-                        "positions": positions,
-                        "meta": {
-                            "ways": ways,
-                            "globalMult": multiplier,
-                            "winWithoutMult": win,
-                            "symbolMult": cumulative_sym_mult,
-                        },
-                    }
-                ]
+            payout = paytable.get_pay(kind, symbol)
+            if payout is not None:
+                if board_names is None:
+                    board_names = [[sym.name for sym in symbols] for symbols in board]
+                positions = Ways.get_ways_positions(board_names, symbol, kind, wild_names)
+                win, win_dict = Ways.ways_win_info(payout, symbol, kind, ways, cumulative_sym_mult, positions)
+                return_data["wins"] += [win_dict]
                 return_data["totalWin"] += win
 
         return return_data
 
+    @staticmethod
+    def evaluate_ways_batch(
+        board_ids: np.ndarray,
+        config: Config,
+        symbol_ids: dict,
+        board_mults: np.ndarray = None,
+        wild_key: str = "wild",
+    ) -> dict:
+        """Vectorised ways calculation for encoded boards of shape (num_boards, num_reels, num_rows).
+
+        Each board is reduced to a (num_reels, num_symbols) count matrix and multiplier sums, plus per-reel wild
+        counts and multipliers. Ways are the running product over reels within the winning kind.
+        Returns arrays of shape (num_boards, num_symbols) indexed by symbol id: kind, ways, symbol_mult and pays
+        (True if the symbol is on the first reel and (kind, symbol) is in the paytable).
+        """
+        num_boards, num_reels = board_ids.shape[:2]
+        # Count matrix bins are offset by one so that EMPTY_SYMBOL_ID padding lands in a discarded first bin.
+        # Matrices are (num_reels, num_boards, num_symbols), so that each reel is a contiguous slice.
+        num_bins = len(symbol_ids) + 1
+        bins = (np.arange(num_boards * num_reels).reshape(num_boards, num_reels, 1) * num_bins + board_ids + 1).ravel()
+        matrix_shape = (num_boards, num_reels, num_bins)
+        counts = np.bincount(bins, minlength=np.prod(matrix_shape)).reshape(matrix_shape)[..., 1:]
+        counts = np.ascontiguousarray(np.moveaxis(counts, 1, 0))
+        if board_mults is None:
+            mult_sums = np.zeros(counts.shape, dtype=np.int64)
+        else:
+            mult_sums = np.bincount(bins, weights=board_mults.ravel(), minlength=np.prod(matrix_shape))
+            mult_sums = mult_sums.reshape(matrix_shape)[..., 1:]
+            mult_sums = np.ascontiguousarray(np.moveaxis(mult_sums, 1, 0), dtype=np.int64)
+        is_wild = get_id_lookup(symbol_ids, config.special_symbols[wild_key])[:-1]
+        wild_counts = counts[..., is_wild].sum(axis=-1, keepdims=True)
+        mult_enhance = mult_sums + mult_sums[..., is_wild].sum(axis=-1, keepdims=True)
+
+        kinds = leading_run_length((counts > 0) | (wild_counts > 0))
+        ways = np.ones(kinds.shape, dtype=np.int64)
+        symbol_mult = np.zeros(kinds.shape, dtype=np.int64)
+        for reel in range(num_reels):
+            in_win = kinds > reel
+            ways *= np.where(in_win, counts[reel] + wild_counts[reel] + mult_enhance[reel], 1)
+            symbol_mult += np.where(in_win, mult_enhance[reel], 0)
+        pay_mask = get_paytable_arrays(config, symbol_ids).get_pay_mask(num_reels)
+        pays = pay_mask[np.arange(len(symbol_ids)), kinds] & (counts[0] > 0)
+
+        return {"kind": kinds, "ways": ways, "symbol_mult": symbol_mult, "pays": pays}
+
+    @staticmethod
+    def get_ways_data_batch(
+        board_ids: np.ndarray,
+        config: Config,
+        symbol_ids: dict,
+        board_mults: np.ndarray = None,
+        wild_key: str = "wild",
+    ) -> list[dict]:
+        """Batch equivalent of get_ways_data(), returning one return_data dict per encoded board."""
+        symbol_names = {idx: name for name, idx in symbol_ids.items()}
+        wild_names = config.special_symbols[wild_key]
+        paytable = get_paytable_arrays(config, symbol_ids)
+        batch = Ways.evaluate_ways_batch(board_ids, config, symbol_ids, board_mults, wild_key)
+
+        all_return_data = []
+        for board_idx in range(len(board_ids)):
+            return_data = {"totalWin": 0, "wins": []}
+            if batch["pays"][board_idx].any():
+                board_names = [[symbol_names.get(idx) for idx in reel.tolist()] for reel in board_ids[board_idx]]
+                # Wins are ordered by first appearance on the first reel, as in get_ways_data()
+                for sym_id in dict.fromkeys(board_ids[board_idx, 0].tolist()):
+                    if sym_id == EMPTY_SYMBOL_ID or not batch["pays"][board_idx, sym_id]:
+                        continue
+                    symbol, kind = symbol_names[sym_id], int(batch["kind"][board_idx, sym_id])
+                    positions = Ways.get_ways_positions(board_names, symbol, kind, wild_names)
+                    win, win_dict = Ways.ways_win_info(
+                        paytable.get_pay(kind, symbol),
+                        symbol,
+                        kind,
+                        int(batch["ways"][board_idx, sym_id]),
+                        int(batch["symbol_mult"][board_idx, sym_id]),
+                        positions,
+                    )
+                    return_data["wins"] += [win_dict]
+                    return_data["totalWin"] += win
+            all_return_data.append(return_data)
+
+        return all_return_data
+
     @staticmethod
     def emit_wayswin_events(gamestate) -> None:
         """Transmit win events asociated with ways wins."""
@@ -18,6 +18,17 @@ class Config:
         self.provider_number = 1
         self.game_name = "sample_lines"
         self.output_regular_json = True  # if True, outputs .json if compression = False. If False, outputs .jsonl
+        # zstd settings for compressed books. threads=-1 uses all cores, window_log=None uses the level default.
+        # Windows above 2**27 (window_log > 27) need a decompressor with a raised max_window_size to read the books.
+        self.compression_level = 3
+        self.compression_threads = 0
+        self.compression_window_log = None
+        self.compression_long_distance = False
+        # Optionally train a zstd dictionary on a sample of books per mode. Books are then compressed as one frame each,
+        # so a single book can be decompressed on its own. The dictionary is written next to the publish files.
+        self.compression_dictionary = False
+        self.dictionary_size = 2**17
+        self.dictionary_samples = 1000
         if self.game_id != "0_0_sample":
             self.construct_paths()
 
@@ -29,6 +40,8 @@ class Config:
         self.reels = 5
         self.row = 3
         self.paytable = {}  # Symbol information assumes ('kind','name) format
+        self.paytable_arrays = None  # compiled from self.paytable by get_paytable_arrays() when the gamestate is created
+        self.reelstrip_arrays = None  # compiled from self.reels by get_reelstrip_arrays() when the gamestate is created
         self.special_symbols = {None: []}
         self.special_sybol_names = set()
         self.paying_symbol_names = set()
@@ -49,6 +62,18 @@ class Config:
         self.padding_reels = {}  # symbol configuration displayed before the board reveal
 
         self.write_event_list = True
+        # Warn when a criteria averages more than this many attempts (rejected + accepted spins) per simulation
+        self.retry_budget = None
+        # Evaluate repeated attempts without building events, only replaying the accepted attempt from the same
+        # random state. Requires each attempt to depend only on the random state when reset_book() is called.
+        self.dry_prescreen = False
+        # Debug check that book events are not modified after being added (events are stored without copying)
+        self.check_event_aliasing = False
+        # Encode finished books as CompactBook objects (typed events, symbol id boards), converted to JSON when written
+        self.compact_books = False
+        # Build library/forces/force_index_<mode>.bin after each mode, used for force-key and payout queries.
+        # ForceTool builds a missing index when first queried, so this is only needed to have it ready with the books.
+        self.write_force_index = False
 
         self.bet_modes = []
         self.opt_params = {None: None}
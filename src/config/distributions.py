@@ -3,6 +3,8 @@
 from typing import Union
 import json
 
+from src.calculations.statistics import WeightedDistribution
+
 
 class Distribution:
     """Setup simulation conditions."""
@@ -38,8 +40,23 @@ class Distribution:
             if rk not in condition_keys:
                 conditions[rk] = self._default_distribution_conditions[rk]
 
+        for key, value in conditions.items():
+            conditions[key] = self.get_weighted_distributions(value)
         self._conditions = conditions
 
+    @staticmethod
+    def get_weighted_distributions(condition):
+        """Replace {value: weight} dictionaries (including those nested by gametype) with WeightedDistribution."""
+        if not isinstance(condition, dict) or len(condition) == 0 or isinstance(condition, WeightedDistribution):
+            return condition
+        if all(isinstance(value, dict) for value in condition.values()):
+            for key, value in condition.items():
+                condition[key] = Distribution.get_weighted_distributions(value)
+            return condition
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in condition.values()):
+            return WeightedDistribution(condition)
+        return condition
+
     def get_criteria(self):
         """Return distribution criteria value."""
         return self._criteria
@@ -142,7 +142,7 @@ class OutputFiles:
 
     def get_temp_force_name(self, betmode: str, thread_index: int, repeat_count: int):
         """Naming convention for temp force files."""
-        return os.path.join(self.temp_path, f"force_{betmode}_{thread_index}_{repeat_count}.json")
+        return os.path.join(self.temp_path, f"force_{betmode}_{thread_index}_{repeat_count}.bin")
 
     def get_final_book_name(self, betmode: str, compress: bool):
         """Returns final simulation books output name."""
@@ -156,6 +156,10 @@ class OutputFiles:
             raise RuntimeError("Logic error in name generation.")
         return os.path.join(self.compressed_path if compress else self.book_path, filename)
 
+    def get_book_dictionary_name(self, betmode: str):
+        """zstd dictionary used to compress books, written with the publish files."""
+        return os.path.join(self.publish_path, f"books_{betmode}.dict")
+
     def get_final_lookup_name(self, betmode: str):
         """Final csv lookup table name."""
         return os.path.join(self.lookup_path, f"lookUpTable_{betmode}.csv")
@@ -0,0 +1,106 @@
+"""Compile the (kind, symbol) keyed paytable into lookups indexed by symbol and kind."""
+
+import numpy as np
+
+
+def get_symbol_ids(config: object, extra_names: list = ()) -> dict:
+    """Map every symbol name known to the config (paytable, special symbols, reelstrips) to an integer id."""
+    names = set(extra_names)
+    names.update(sym for _, sym in config.paytable)
+    for special_names in config.special_symbols.values():
+        names.update(special_names)
+    for reelstrip in getattr(config, "reels", {}).values():
+        for reel in reelstrip:
+            names.update(reel)
+    names.discard(None)
+    return {name: idx for idx, name in enumerate(sorted(names))}
+
+
+class PaytableArrays:
+    """
+    Dense paytable lookups, the original config.paytable dict is left unchanged.
+
+    pay_array[symbol_id, kind] holds the payout (0 where not in the paytable), pay_mask marks existing entries and
+    max_paying_kind[symbol_id] is the largest paying kind (0 for non-paying symbols).
+    pay_rows and max_paying_kinds hold the same information by symbol name, keeping the original payout values
+    (None where not in the paytable) for evaluators working on Symbol objects.
+    """
+
+    def __init__(self, paytable: dict, symbol_ids: dict):
+        # Copy of the compiled entries, compared with config.paytable to detect later edits, and the source dictionary
+        self.paytable = dict(paytable)
+        self.source = paytable
+        self.symbol_ids = symbol_ids
+        self.max_kind = max((kind for kind, _ in paytable), default=0)
+
+        self.pay_array = np.zeros((len(symbol_ids), self.max_kind + 1), dtype=np.float64)
+        self.pay_mask = np.zeros((len(symbol_ids), self.max_kind + 1), dtype=bool)
+        self.max_paying_kind = np.zeros(len(symbol_ids), dtype=np.int32)
+        pay_rows = {}
+        for (kind, sym), payout in paytable.items():
+            pay_rows.setdefault(sym, [None] * (self.max_kind + 1))[kind] = payout
+            if sym in symbol_ids:
+                self.pay_array[symbol_ids[sym], kind] = payout
+                self.pay_mask[symbol_ids[sym], kind] = True
+                self.max_paying_kind[symbol_ids[sym]] = max(self.max_paying_kind[symbol_ids[sym]], kind)
+
+        self.pay_rows = {sym: tuple(row) for sym, row in pay_rows.items()}
+        self.max_paying_kinds = {
+            sym: max(kind for kind, payout in enumerate(row) if payout is not None) for sym, row in pay_rows.items()
+        }
+
+    def is_current(self, paytable: dict) -> bool:
+        """Check the arrays were compiled from a paytable with the same entries and payouts."""
+        return paytable == self.paytable
+
+    def get_pay(self, kind: int, symbol: str):
+        """Payout for (kind, symbol), or None if the combination is not in the paytable."""
+        row = self.pay_rows.get(symbol)
+        if row is None or kind >= len(row):
+            return None
+        return row[kind]
+
+    def get_pay_array(self, max_kind: int) -> np.ndarray:
+        """pay_array with exactly max_kind + 1 kind columns."""
+        return self.resize_kinds(self.pay_array, max_kind)
+
+    def get_pay_mask(self, max_kind: int) -> np.ndarray:
+        """pay_mask with exactly max_kind + 1 kind columns."""
+        return self.resize_kinds(self.pay_mask, max_kind)
+
+    @staticmethod
+    def resize_kinds(array: np.ndarray, max_kind: int) -> np.ndarray:
+        """Truncate or zero-pad the kind axis."""
+        if array.shape[1] > max_kind:
+            return array[:, : max_kind + 1]
+        return np.pad(array, ((0, 0), (0, max_kind + 1 - array.shape[1])))
+
+
+def get_paytable_arrays(config: object, symbol_ids: dict = None) -> PaytableArrays:
+    """
+    Compiled paytable stored on config.paytable_arrays, used by the win evaluators.
+    Arrays are compiled if missing, if config.paytable has been replaced or if different symbol ids are requested.
+    Configs not inheriting from Config (such as test configurations) are compiled on first use.
+    The paytable entries are not compared here, see refresh_paytable_arrays().
+    """
+    arrays = getattr(config, "paytable_arrays", None)
+    if (
+        arrays is None
+        or arrays.source is not config.paytable
+        or (symbol_ids is not None and symbol_ids is not arrays.symbol_ids and symbol_ids != arrays.symbol_ids)
+    ):
+        arrays = PaytableArrays(config.paytable, symbol_ids if symbol_ids is not None else get_symbol_ids(config))
+        config.paytable_arrays = arrays
+    return arrays
+
+
+def refresh_paytable_arrays(config: object) -> PaytableArrays:
+    """
+    Compiled paytable, recompiled if config.paytable has changed in any way since compiling (including in-place
+    edits). Called once before each set of evaluations rather than on every win evaluation.
+    """
+    arrays = get_paytable_arrays(config)
+    if not arrays.is_current(config.paytable):
+        arrays = PaytableArrays(config.paytable, get_symbol_ids(config))
+        config.paytable_arrays = arrays
+    return arrays
@@ -0,0 +1,84 @@
+"""Compile reelstrips into integer symbol-id arrays which can be sliced without modulo arithmetic."""
+
+from copy import deepcopy
+import numpy as np
+
+from src.config.paytable import get_symbol_ids
+
+
+class ReelstripArrays:
+    """
+    Integer-encoded copy of config.reels, the original lists of symbol names are left unchanged.
+
+    Each reel is wrapped with one symbol before the strip and max_rows + 1 symbols after it. For a stop position
+    0 <= p < len(reel), padded[p : p + num_rows + 2] holds the (top) padding symbol, the num_rows board symbols
+    and the (bottom) padding symbol, so a full reel window is a single slice.
+    The padded reels are kept as NumPy arrays (strips) for vectorized calculations and as lists of ids (windows) for
+    board draws, where slicing a list is cheaper than slicing and converting an array.
+    """
+
+    def __init__(self, reels: dict, symbol_ids: dict, max_rows: int):
+        # Copy of the compiled reels, compared with config.reels to detect any later edits, and the source dictionary
+        self.reels = deepcopy(reels)
+        self.source = reels
+        self.symbol_ids = symbol_ids
+        self.names = sorted(symbol_ids, key=symbol_ids.get)
+        self.max_rows = max_rows
+        self.strips, self.windows, self.lengths = {}, {}, {}
+        for reelstrip_id, reelstrip in reels.items():
+            self.strips[reelstrip_id], self.windows[reelstrip_id], self.lengths[reelstrip_id] = [], [], []
+            for reel in reelstrip:
+                reel_ids = np.array([symbol_ids[sym] for sym in reel], dtype=np.int16)
+                padded = reel_ids[np.arange(-1, len(reel) + max_rows + 1) % len(reel)]
+                self.strips[reelstrip_id].append(padded)
+                self.windows[reelstrip_id].append(padded.tolist())
+                self.lengths[reelstrip_id].append(len(reel))
+
+    def is_current(self, reels: dict) -> bool:
+        """Check the arrays were compiled from reels with the same symbols."""
+        return reels == self.reels
+
+    def get_window(self, reelstrip_id: str, reel: int, position: int, num_rows: int) -> list[int]:
+        """Symbol ids from position - 1 to position + num_rows (inclusive), wrapping around the reel."""
+        if num_rows > self.max_rows:
+            raise ValueError(f"Window of {num_rows} rows exceeds compiled padding of {self.max_rows} rows.")
+        start = position % self.lengths[reelstrip_id][reel]
+        return self.windows[reelstrip_id][reel][start : start + num_rows + 2]
+
+    def get_symbol_id(self, reelstrip_id: str, reel: int, position: int) -> int:
+        """Symbol id at a (wrapped) position on the reel."""
+        return self.windows[reelstrip_id][reel][position % self.lengths[reelstrip_id][reel] + 1]
+
+    def get_names(self, symbol_ids: list) -> list[str]:
+        """Symbol names of a list of ids."""
+        return [self.names[idx] for idx in symbol_ids]
+
+
+def get_reelstrip_arrays(config: object, reelstrip_id: str = None) -> ReelstripArrays:
+    """
+    Compiled reelstrips stored on config.reelstrip_arrays, used for every board draw.
+    Arrays are compiled if missing, if config.reels has been replaced or if reelstrip_id has not been compiled. The
+    reelstrip contents are not compared here, see refresh_reelstrip_arrays().
+    """
+    arrays = getattr(config, "reelstrip_arrays", None)
+    if (
+        arrays is None
+        or arrays.source is not config.reels
+        or (reelstrip_id is not None and reelstrip_id not in arrays.lengths)
+    ):
+        arrays = ReelstripArrays(config.reels, get_symbol_ids(config), max(config.num_rows))
+        config.reelstrip_arrays = arrays
+    return arrays
+
+
+def refresh_reelstrip_arrays(config: object) -> ReelstripArrays:
+    """
+    Compiled reelstrips, recompiled if config.reels has changed in any way since compiling (including in-place edits).
+    Called once before each set of draws, such as when the gamestate is created and at the start of every batch of
+    simulations, rather than on every draw.
+    """
+    arrays = get_reelstrip_arrays(config)
+    if not arrays.is_current(config.reels):
+        arrays = ReelstripArrays(config.reels, get_symbol_ids(config), max(config.num_rows))
+        config.reelstrip_arrays = arrays
+    return arrays
@@ -1,20 +1,34 @@
 """Defines reusable events"""
 
 from copy import deepcopy
+from functools import wraps
 from src.events.event_constants import EventConstants
 
 
+def skip_in_dry_run(event_function):
+    """Event functions without side effects on the gamestate are not built while gamestate.dry_run is set."""
+
+    @wraps(event_function)
+    def wrapper(gamestate, *args, **kwargs):
+        if getattr(gamestate, "dry_run", False):
+            return None
+        return event_function(gamestate, *args, **kwargs)
+
+    return wrapper
+
+
 def json_ready_sym(symbol: object, special_attributes: list = None):
     """Converts a symbol to dictionary/JSON format."""
     assert special_attributes is not None
     print_sym = {"name": symbol.name}
-    attrs = vars(symbol)
+    attrs = symbol.get_attributes()
     for key, val in attrs.items():
-        if key in special_attributes and symbol.get_attribute(key) != False:
+        if key in special_attributes and val != False:
             print_sym[key] = val
     return print_sym
 
 
+@skip_in_dry_run
 def reveal_event(gamestate):
     """Display the initial board drawn from reelstrips."""
     board_client = []
@@ -35,13 +49,14 @@ def reveal_event(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": gamestate.gametype,
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def fs_trigger_event(
     gamestate,
     include_padding_index=True,
@@ -52,11 +67,8 @@ def fs_trigger_event(
     assert basegame_trigger != freegame_trigger, "must set either basegame_trigger or freeSpinTrigger to = True"
     event = {}
     scatter_positions = []
-    for reel, _ in enumerate(gamestate.special_syms_on_board["scatter"]):
-        scatter_positions.append(gamestate.special_syms_on_board["scatter"][reel])
-    if include_padding_index:
-        for pos in scatter_positions:
-            pos["row"] += 1
+    for pos in gamestate.special_syms_on_board["scatter"]:
+        scatter_positions.append({**pos, "row": pos["row"] + 1} if include_padding_index else dict(pos))
 
     if basegame_trigger:
         event = {
@@ -78,6 +90,7 @@ def fs_trigger_event(
     gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def set_win_event(gamestate, winlevel_key: str = "standard"):
     """Used for updating cumulative win ticker (for a single outcome)."""
     if not gamestate.wincap_triggered:
@@ -95,6 +108,7 @@ def set_win_event(gamestate, winlevel_key: str = "standard"):
         gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def set_total_event(gamestate):
     """Updates win amount for a betting round (including cumulative wins across multiple freespin wins)."""
     event = {
@@ -110,6 +124,7 @@ def set_total_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def set_tumble_event(gamestate):
     """Update banner indicating wins from successive tumbles."""
     event = {
@@ -120,6 +135,7 @@ def set_tumble_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def wincap_event(gamestate):
     """Emit to indicate end of spin actions."""
     event = {
@@ -135,45 +151,48 @@ def wincap_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def win_info_event(gamestate, include_padding_index=True):
     """
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
     """
-    win_data_copy = {}
-    win_data_copy["wins"] = deepcopy(gamestate.win_data["wins"])
-    for idx, w in enumerate(win_data_copy["wins"]):
+    wins = []
+    for w in gamestate.win_data["wins"]:
+        # Fresh copies of each win, leaving gamestate.win_data unchanged
+        win = dict(w)
         if include_padding_index:
             new_positions = []
             for p in w["positions"]:
                 new_positions.append({"reel": p["reel"], "row": p["row"] + 1})
         else:
-            new_positions = w["positions"]
-
-        win_data_copy["wins"][idx]["win"] = int(
-            round(min(win_data_copy["wins"][idx]["win"], gamestate.config.wincap) * 100, 0)
-        )
-        win_data_copy["wins"][idx]["positions"] = new_positions
-        if "meta" in win_data_copy["wins"][idx]:
-            win_data_copy["wins"][idx]["meta"]["winWithoutMult"] = int(
+            new_positions = [dict(p) for p in w["positions"]]
+
+        win["win"] = int(round(min(w["win"], gamestate.config.wincap) * 100, 0))
+        win["positions"] = new_positions
+        if "meta" in w:
+            win["meta"] = deepcopy(w["meta"])
+            win["meta"]["winWithoutMult"] = int(
                 int(
                     min(
-                        win_data_copy["wins"][idx]["meta"]["winWithoutMult"] * 100,
+                        w["meta"]["winWithoutMult"] * 100,
                         gamestate.config.wincap * 100,
                     ),
                 )
             )
-            if "overlay" in win_data_copy["wins"][idx]["meta"] and include_padding_index:
-                win_data_copy["wins"][idx]["meta"]["overlay"]["row"] += 1
+            if "overlay" in win["meta"] and include_padding_index:
+                win["meta"]["overlay"]["row"] += 1
+        wins.append(win)
 
     event = {
         "index": len(gamestate.book.events),
         "type": EventConstants.WIN_DATA.value,
         "totalWin": int(round(min(gamestate.win_data["totalWin"], gamestate.config.wincap) * 100, 0)),
-        "wins": win_data_copy["wins"],
+        "wins": wins,
     }
     gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def update_tumble_win_event(gamestate):
     """Update a banner to record successive tumble wins."""
     event = {
@@ -184,6 +203,7 @@ def update_tumble_win_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def update_freespin_event(gamestate):
     """Update the current spin number and total freegame"""
     event = {
@@ -195,6 +215,7 @@ def update_freespin_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def freespin_end_event(gamestate, winlevel_key="endFeature"):
     """End of feature trigger."""
     event = {
@@ -206,6 +227,7 @@ def freespin_end_event(gamestate, winlevel_key="endFeature"):
     gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def final_win_event(gamestate):
     """Assigns final payout multiplier for a simulation."""
     event = {
@@ -216,6 +238,7 @@ def final_win_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def update_global_mult_event(gamestate):
     """Increment global multiplier value."""
     event = {
@@ -227,6 +250,7 @@ def update_global_mult_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def tumble_board_event(gamestate):
     """States the symbol positions removed from a board during tumble, and which new symbols should take their place."""
     special_attributes = list(gamestate.config.special_symbols.keys())
@@ -255,6 +279,7 @@ def tumble_board_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_dry_run
 def enter_bonus_event(gamestate) -> None:
     "Indicate feature game entry explicitly."
     event = {
@@ -6,9 +6,15 @@ from copy import deepcopy
 class Book:
     "Stores simulation information."
 
-    def __init__(self, book_id: int, criteria: str):
-        "Initialize simulation book"
+    def __init__(self, book_id: int, criteria: str, record_events: bool = True, check_aliasing: bool = False):
+        """
+        Initialize simulation book, events are discarded if record_events is False (dry evaluation).
+        If check_aliasing is True, a copy of each event is kept to detect events modified after being added.
+        """
         self.id = book_id
+        self.record_events = record_events
+        self.check_aliasing = check_aliasing
+        self.event_snapshots = []
         self.payout_multiplier = 0.0
         self.events = []
         self.criteria = criteria
@@ -16,16 +22,35 @@ class Book:
         self.freegame_wins = 0.0
 
     def add_event(self, event: dict):
-        "Append event to book."
-        self.events.append(deepcopy(event))
+        """
+        Append event to book. The event is stored without copying, so the book owns it from this point:
+        event functions must build new structures rather than referencing (or later modifying) gamestate data.
+        """
+        if self.record_events:
+            self.events.append(event)
+            if self.check_aliasing:
+                self.event_snapshots.append(deepcopy(event))
 
     def append_book_items(self, event_id: int, appended_info: dict):
         "Modify an existing book event at position 'event_id'"
         for k, v in appended_info.items():
             self.events[event_id][k] = v
+        if self.check_aliasing:
+            self.event_snapshots[event_id] = deepcopy(self.events[event_id])
+
+    def verify_events(self) -> None:
+        "Raise an error if any event has changed since it was added (requires check_aliasing)."
+        for idx, (event, snapshot) in enumerate(zip(self.events, self.event_snapshots)):
+            if event != snapshot:
+                raise RuntimeError(
+                    f"Book {self.id}: event {idx} ('{snapshot.get('type')}') was modified after being added. "
+                    "The event shares data with the gamestate, build a copy in the event function."
+                )
 
     def to_json(self):
         "Return JSON-ready object."
+        if self.check_aliasing:
+            self.verify_events()
         json_book = {
             "id": self.id,
             "payoutMultiplier": int(round(self.payout_multiplier * 100, 0)),
@@ -0,0 +1,155 @@
+"""Compact in-memory storage of finished books, turned back into the JSON book format only when written."""
+
+from array import array
+
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+class Record(tuple):
+    """Values of a dictionary, the first item is the (shared) tuple of its keys."""
+
+    __slots__ = ()
+
+
+class EventRecord(tuple):
+    """Values of a book event except its type, the first item is the (shared) (type, keys) schema of the event."""
+
+    __slots__ = ()
+
+
+class IdArray(array):
+    """List of dictionaries stored as ids of the encoder's interned dictionaries."""
+
+    __slots__ = ()
+
+
+class IdGrid(array):
+    """
+    List of lists of dictionaries (a board) in one array of interned ids.
+    Laid out as [number of reels, length of each reel..., ids of reel 0..., ids of reel 1..., ...].
+    """
+
+    __slots__ = ()
+
+
+def make_id_array(cls: type, values: list) -> array:
+    """Array of non-negative integers using 2 bytes per item where possible."""
+    return cls("H" if max(values, default=0) <= 0xFFFF else "I", values)
+
+
+def is_scalar_dict(item: object) -> bool:
+    """Check if an item is a dictionary holding only scalar values."""
+    return isinstance(item, dict) and all(isinstance(v, SCALAR_TYPES) for v in item.values())
+
+
+class BookEncoder:
+    """
+    Converts books into nested tuples and integer arrays, and back.
+
+    Dictionaries holding only scalar values (board symbols, symbol positions, ...) are interned once, so lists of them
+    are stored as arrays of ids, and a board as a single IdGrid costing 2 bytes per symbol.
+    Book events are stored by type (EventConstants value): an EventRecord holds the values of an event next to an
+    interned (type, keys) schema, so the type name and key layout are stored once per kind of event.
+    Other dictionaries become a Record sharing the interned tuple of their keys, and lists become tuples.
+    Key order, value types and list nesting are kept, so the materialised book serialises to identical JSON.
+    """
+
+    def __init__(self):
+        self.key_tuples = {}
+        self.event_schemas = {}
+        self.dict_ids = {}
+        self.dict_items = []
+
+    def intern_dict(self, item: dict) -> int:
+        """
+        Id of a scalar-valued dictionary. Keys include the value types so True, 1 and 1.0 are not merged,
+        and floats are compared by repr so 0.0 and -0.0 are kept apart.
+        """
+        key = tuple((k, type(v), repr(v) if type(v) is float else v) for k, v in item.items())
+        if key not in self.dict_ids:
+            self.dict_ids[key] = len(self.dict_items)
+            self.dict_items.append(tuple(item.items()))
+        return self.dict_ids[key]
+
+    def encode_event(self, event: dict) -> object:
+        """Compact copy of a book event, typed events share a (type, keys) schema."""
+        event_type = event.get("type")
+        if not isinstance(event_type, str):
+            return self.encode(event)
+        schema = (event_type, tuple(event))
+        schema = self.event_schemas.setdefault(schema, schema)
+        return EventRecord((schema, *(self.encode(v) for k, v in event.items() if k != "type")))
+
+    def encode(self, value: object) -> object:
+        """Compact copy of a JSON-ready value."""
+        if isinstance(value, dict):
+            keys = tuple(value)
+            keys = self.key_tuples.setdefault(keys, keys)
+            return Record((keys, *(self.encode(v) for v in value.values())))
+        if isinstance(value, (list, tuple)):
+            if value and all(is_scalar_dict(item) for item in value):
+                return make_id_array(IdArray, [self.intern_dict(item) for item in value])
+            if value and all(
+                isinstance(reel, (list, tuple)) and all(is_scalar_dict(item) for item in reel) for reel in value
+            ):
+                ids = [len(value)] + [len(reel) for reel in value]
+                ids += [self.intern_dict(item) for reel in value for item in reel]
+                return make_id_array(IdGrid, ids)
+            return tuple(self.encode(item) for item in value)
+        return value
+
+    def decode(self, value: object) -> object:
+        """JSON-ready value of an encoded value, with new lists and dictionaries."""
+        if isinstance(value, EventRecord):
+            (event_type, keys), values = value[0], iter(value[1:])
+            return {key: event_type if key == "type" else self.decode(next(values)) for key in keys}
+        if isinstance(value, Record):
+            return {key: self.decode(v) for key, v in zip(value[0], value[1:])}
+        if isinstance(value, IdArray):
+            return [dict(self.dict_items[idx]) for idx in value]
+        if isinstance(value, IdGrid):
+            grid, start = [], value[0] + 1
+            for length in value[1:start]:
+                grid.append([dict(self.dict_items[idx]) for idx in value[start : start + length]])
+                start += length
+            return grid
+        if isinstance(value, tuple):
+            return [self.decode(item) for item in value]
+        return value
+
+    def encode_book(self, book: object) -> "CompactBook":
+        """Compact copy of a finished Book."""
+        return CompactBook(book, self)
+
+
+class CompactBook:
+    """Finished book with events held by a BookEncoder, to_json() returns the same object as Book.to_json()."""
+
+    __slots__ = ("id", "payout_multiplier", "criteria", "basegame_wins", "freegame_wins", "events", "encoder")
+
+    def __init__(self, book: object, encoder: BookEncoder):
+        if book.check_aliasing:
+            book.verify_events()
+        self.id = book.id
+        self.payout_multiplier = book.payout_multiplier
+        self.criteria = book.criteria
+        self.basegame_wins = book.basegame_wins
+        self.freegame_wins = book.freegame_wins
+        self.events = tuple(encoder.encode_event(event) for event in book.events)
+        self.encoder = encoder
+
+    def to_json(self) -> dict:
+        "Return JSON-ready object."
+        return {
+            "id": self.id,
+            "payoutMultiplier": int(round(self.payout_multiplier * 100, 0)),
+            "events": [self.encoder.decode(event) for event in self.events],
+            "criteria": self.criteria,
+            "baseGameWins": self.basegame_wins,
+            "freeGameWins": self.freegame_wins,
+        }
+
+
+def get_book_json(book: object) -> dict:
+    """JSON-ready book from either a stored book dictionary or a CompactBook."""
+    return book.to_json() if isinstance(book, CompactBook) else book
@@ -0,0 +1,111 @@
+"""Book ids recorded against each force description, stored as sorted integer arrays."""
+
+from array import array
+from bisect import bisect_left
+import json
+
+import numpy as np
+
+# array typecode and matching numpy type of the book id arrays (4 bytes per id)
+BOOK_ID_TYPECODE = "I"
+BOOK_ID_DTYPE = np.uintc
+# Byte order of book ids in temporary force files
+FORCE_FILE_DTYPE = np.dtype("<u4")
+# Number of temporary force files whose ids are joined per description before being added to the merged records
+FORCE_MERGE_BATCH = 256
+
+
+class ForceRecords:
+    """
+    Maps each description (a sorted tuple of (key, value) pairs) to the sorted array of book ids it was recorded in.
+    Books are imprinted in simulation order, so a new id is normally appended or matches the last id (already
+    recorded), making each addition O(1). Ids arriving out of order are inserted with a binary search.
+    """
+
+    def __init__(self):
+        self.book_ids = {}
+
+    def __contains__(self, description: tuple) -> bool:
+        return description in self.book_ids
+
+    def __len__(self) -> int:
+        return len(self.book_ids)
+
+    def add(self, description: tuple, book_id: int) -> None:
+        """Record a book against a description, a book is only counted once per description."""
+        ids = self.book_ids.get(description)
+        if ids is None:
+            self.book_ids[description] = array(BOOK_ID_TYPECODE, [book_id])
+        elif ids[-1] < book_id:
+            ids.append(book_id)
+        elif ids[-1] != book_id:
+            position = bisect_left(ids, book_id)
+            if ids[position] != book_id:
+                ids.insert(position, book_id)
+
+    def times_triggered(self, description: tuple) -> int:
+        """Number of books a description was recorded in."""
+        return len(self.book_ids[description])
+
+    def to_dict(self) -> dict:
+        """{description: {"timesTriggered": int, "bookIds": list}}, the entries of a force record file."""
+        return {
+            description: {"timesTriggered": len(ids), "bookIds": ids.tolist()}
+            for description, ids in self.book_ids.items()
+        }
+
+
+def write_force_record_file(force_records: ForceRecords, name: str) -> None:
+    """
+    Temporary force file: one JSON line holding the description table and the number of ids of each description,
+    followed by the id arrays of all descriptions (in table order) as little-endian uint32.
+    """
+    header = {
+        "descriptions": [[list(pair) for pair in description] for description in force_records.book_ids],
+        "counts": [len(ids) for ids in force_records.book_ids.values()],
+    }
+    with open(name, "wb") as f:
+        f.write((json.dumps(header) + "\n").encode("UTF-8"))
+        for ids in force_records.book_ids.values():
+            np.frombuffer(ids, dtype=BOOK_ID_DTYPE).astype(FORCE_FILE_DTYPE, copy=False).tofile(f)
+
+
+def read_force_record_file(name: str) -> dict:
+    """{description: sorted book ids} of a temporary force file, read in one pass."""
+    with open(name, "rb") as f:
+        header = json.loads(f.readline())
+        book_ids = np.fromfile(f, dtype=FORCE_FILE_DTYPE)
+    records, offset = {}, 0
+    for description, count in zip(header["descriptions"], header["counts"]):
+        records[tuple(tuple(pair) for pair in description)] = book_ids[offset : offset + count]
+        offset += count
+    return records
+
+
+def merge_sorted_ids(id_arrays: list) -> np.ndarray:
+    """
+    Sorted union of sorted id arrays. Files of consecutive simulations are already in order, so the union is a
+    concatenation checked in linear time, overlapping arrays fall back to a sort.
+    """
+    ids = np.concatenate(id_arrays) if len(id_arrays) > 1 else id_arrays[0]
+    if len(ids) > 1 and not np.all(ids[1:] > ids[:-1]):
+        ids = np.unique(ids)
+    return ids
+
+
+def merge_force_record_files(file_names: list):
+    """
+    Yield (description, sorted book ids) over all temporary force files, with descriptions in order of first appearance.
+    Each file is opened and read once, one at a time, so the number of files is not limited by open file handles.
+    The ids of every FORCE_MERGE_BATCH files are joined per description, keeping the number of arrays held bounded.
+    """
+    merged = {}
+    for batch_start in range(0, len(file_names), FORCE_MERGE_BATCH):
+        batch = {}
+        for name in file_names[batch_start : batch_start + FORCE_MERGE_BATCH]:
+            for description, ids in read_force_record_file(name).items():
+                batch.setdefault(description, []).append(ids)
+        for description, id_arrays in batch.items():
+            merged.setdefault(description, []).append(merge_sorted_ids(id_arrays))
+    for description in list(merged):
+        yield description, merge_sorted_ids(merged.pop(description))
@@ -0,0 +1,101 @@
+"""Per-criteria statistics on repeated simulation attempts (spins rejected by check_repeat)."""
+
+from warnings import warn
+
+# Number of simulations of a criteria a worker runs before comparing its mean attempts with the retry budget
+RETRY_BUDGET_MIN_SIMS = 20
+
+
+class RetryStats:
+    """
+    Attempts and time spent per criteria by a single worker, or merged across workers.
+    An attempt is one reset_book() call, so a simulation accepted on the first draw has 1 attempt.
+    If retry_budget is set, a warning is raised the first time a criteria averages more attempts per simulation.
+    """
+
+    def __init__(self, retry_budget: float = None):
+        self.retry_budget = retry_budget
+        self.criteria = {}
+        self.warned = set()
+
+    def record(self, criteria: str, attempts: int, seconds: float) -> None:
+        """Add one finished simulation."""
+        if criteria not in self.criteria:
+            self.criteria[criteria] = {"sims": 0, "attempts": 0, "max_attempts": 0, "seconds": 0.0}
+        stats = self.criteria[criteria]
+        stats["sims"] += 1
+        stats["attempts"] += attempts
+        stats["max_attempts"] = max(stats["max_attempts"], attempts)
+        stats["seconds"] += seconds
+        if (
+            self.retry_budget is not None
+            and criteria not in self.warned
+            and stats["sims"] >= RETRY_BUDGET_MIN_SIMS
+            and self.over_budget(criteria)
+        ):
+            self.warned.add(criteria)
+            warn(
+                f"Criteria '{criteria}' is averaging {self.mean_attempts(criteria):.1f} attempts per simulation, "
+                f"above the retry budget of {self.retry_budget}. "
+                "Consider biasing its distribution conditions towards accepted outcomes."
+            )
+
+    def mean_attempts(self, criteria: str) -> float:
+        """Expected number of attempts per accepted simulation."""
+        stats = self.criteria[criteria]
+        return stats["attempts"] / stats["sims"]
+
+    def expects_retries(self, criteria: str, min_attempts: float) -> bool:
+        """Check if a criteria has averaged at least min_attempts attempts per simulation so far."""
+        return criteria in self.criteria and self.mean_attempts(criteria) >= min_attempts
+
+    def over_budget(self, criteria: str) -> bool:
+        """Check if a criteria's mean attempts exceed the retry budget."""
+        return self.retry_budget is not None and self.mean_attempts(criteria) > self.retry_budget
+
+    def merge(self, other: "RetryStats") -> None:
+        """Add the statistics of another worker."""
+        for criteria, other_stats in other.criteria.items():
+            if criteria not in self.criteria:
+                self.criteria[criteria] = dict(other_stats)
+                continue
+            stats = self.criteria[criteria]
+            for key in ("sims", "attempts", "seconds"):
+                stats[key] += other_stats[key]
+            stats["max_attempts"] = max(stats["max_attempts"], other_stats["max_attempts"])
+        self.warned |= other.warned
+
+
+def merge_retry_stats(worker_stats: dict, retry_budget: float = None) -> RetryStats:
+    """Combine {worker: [RetryStats, ...]} into totals over all workers."""
+    total = RetryStats(retry_budget)
+    for stats_list in worker_stats.values():
+        for stats in stats_list:
+            total.merge(stats)
+    return total
+
+
+def print_retry_stats(betmode: str, worker_stats: dict, retry_budget: float = None) -> RetryStats:
+    """
+    Print attempts and time per criteria, with the range of time spent on each criteria across workers.
+    Returns the merged statistics.
+    """
+    total = merge_retry_stats(worker_stats, retry_budget)
+    worker_totals = {worker: merge_retry_stats({worker: stats_list}) for worker, stats_list in worker_stats.items()}
+    print(f"\nSimulation attempts for {betmode}:")
+    print(
+        f"{'criteria':>16}{'sims':>10}{'attempts':>12}{'per sim':>10}{'max':>8}{'seconds':>10}{'worker s':>16}"
+    )
+    for criteria, stats in total.criteria.items():
+        worker_seconds = [
+            worker_total.criteria[criteria]["seconds"]
+            for worker_total in worker_totals.values()
+            if criteria in worker_total.criteria
+        ]
+        flag = "  over budget" if total.over_budget(criteria) else ""
+        print(
+            f"{str(criteria):>16}{stats['sims']:>10}{stats['attempts']:>12}{total.mean_attempts(criteria):>10.2f}"
+            f"{stats['max_attempts']:>8}{stats['seconds']:>10.2f}"
+            f"{f'{min(worker_seconds):.2f}-{max(worker_seconds):.2f}':>16}{flag}"
+        )
+    return total
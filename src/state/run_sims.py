@@ -1,13 +1,24 @@
+import os
 import time
 import random
-from multiprocessing import Process, Manager
+import multiprocessing
+from multiprocessing import Queue
 import cProfile
 from warnings import warn
 import shutil
 import asyncio
-from typing import Dict
+import traceback
+from typing import Dict, List, Tuple
 
-from src.write_data.write_data import output_lookup_and_force_files
+from src.state.retry_stats import RetryStats, print_retry_stats
+from src.write_data.write_data import (
+    output_lookup_and_force_files,
+    train_book_dictionary,
+    write_book_dictionary,
+)
+
+# Chunks each thread's share of a batch is split into when no chunk_size is given
+CHUNKS_PER_THREAD = 8
 
 
 def create_books(
@@ -18,8 +29,15 @@ def create_books(
     threads: int,
     compress: bool,
     profiling: bool,
+    chunk_size: int = None,
+    book_merge: str = "concatenate",
 ):
-    """Main run-function for simulating game outcomes and outputting all files."""
+    """
+    Main run-function for simulating game outcomes and outputting all files.
+    chunk_size sets how many simulations are handed to a worker at a time, defaults to a fraction of a thread batch.
+    book_merge selects how compressed temporary books are joined: "concatenate" appends the zstd frames as they are,
+    "recompress" streams them through one multi-threaded compressor for a single-frame output.
+    """
     for key, ns in num_sim_args.items():
         if all([ns > 0, ns > batch_size * batch_size]):
             assert (
@@ -35,29 +53,40 @@ def create_books(
 
     startTime = time.time()
     print("\nCreating books...")
-    for betmode_name in num_sim_args:
-        if num_sim_args[betmode_name] > 0:
-            gamestate.betmode = betmode_name
-            run_multi_process_sims(
-                threads,
-                batch_size,
-                config.game_id,
-                betmode_name,
-                gamestate,
-                num_sims=num_sim_args[betmode_name],
-                compress=compress,
-                write_event_list=config.write_event_list,
-                profiling=profiling,
-            )
-            output_lookup_and_force_files(
-                threads,
-                batch_size,
-                config.game_id,
-                betmode_name,
-                gamestate,
-                num_sims=num_sim_args[betmode_name],
-                compress=compress,
-            )  # , write_event_list=config.write_event_list)
+    pool = None
+    if threads > 1 and not profiling:
+        pool = SimulationPool(gamestate, threads)
+    try:
+        for betmode_name in num_sim_args:
+            if num_sim_args[betmode_name] > 0:
+                gamestate.betmode = betmode_name
+                sim_chunks = run_multi_process_sims(
+                    threads,
+                    batch_size,
+                    config.game_id,
+                    betmode_name,
+                    gamestate,
+                    num_sims=num_sim_args[betmode_name],
+                    compress=compress,
+                    write_event_list=config.write_event_list,
+                    profiling=profiling,
+                    pool=pool,
+                    chunk_size=chunk_size,
+                )
+                output_lookup_and_force_files(
+                    threads,
+                    batch_size,
+                    config.game_id,
+                    betmode_name,
+                    gamestate,
+                    num_sims=num_sim_args[betmode_name],
+                    compress=compress,
+                    sim_chunks=sim_chunks,
+                    book_merge=book_merge,
+                )  # , write_event_list=config.write_event_list)
+    finally:
+        if pool is not None:
+            pool.close()
     shutil.rmtree(gamestate.output_files.temp_path)
     print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
 
@@ -100,11 +129,12 @@ async def profile_and_visualize(
     repeat,
     compress,
     write_event_list,
+    retry_stats=None,
 ):
     """Create flame-graph, automatically opens output on localhost."""
     output_string = f"games/{game_id}/simulationProfile_{betmode}.prof"
     cProfile.runctx(
-        "gamestate.run_sims(all_betmode_configs, betmode, sim_allocation, threads, num_repeats, sims_per_thread, 0, repeat, compress, write_event_list)",
+        "gamestate.run_sims(all_betmode_configs, betmode, sim_allocation, threads, num_repeats, sims_per_thread, 0, repeat, compress, write_event_list, retry_stats=retry_stats)",
         globals(),
         locals(),
         output_string,
@@ -112,6 +142,160 @@ async def profile_and_visualize(
     await asyncio.create_subprocess_exec("snakeviz", output_string)
 
 
+def simulation_worker(gamestate: object, work_queue: Queue, result_queue: Queue, worker_index: int = 0) -> None:
+    """
+    Long-lived worker loop. The gamestate is received once and reused for every work item.
+    Retry statistics are kept per bet mode outside the restored gamestate, so they add up over all chunks of a mode.
+    Each result carries the worker's totals so far.
+    """
+    initial_state = gamestate.snapshot_state()
+    betmode_retry_stats = {}
+    while True:
+        item = work_queue.get()
+        if item is None:
+            break
+        betmode, sim_range, repeat, thread_index, sim_to_criteria, run_args = item
+        betmode_copy_list = []
+        try:
+            # Each work item starts from the same state a freshly spawned process would have had
+            gamestate.restore_state(initial_state)
+            retry_stats = betmode_retry_stats.setdefault(betmode, RetryStats(gamestate.config.retry_budget))
+            gamestate.run_sims(
+                betmode_copy_list,
+                betmode,
+                sim_to_criteria,
+                run_args["threads"],
+                run_args["num_repeats"],
+                sim_range[1] - sim_range[0],
+                thread_index,
+                repeat,
+                run_args["compress"],
+                run_args["write_event_list"],
+                sim_range=sim_range,
+                retry_stats=retry_stats,
+            )
+            result_queue.put((worker_index, betmode_copy_list, retry_stats, None))
+        except Exception:  # pylint: disable=broad-except
+            result_queue.put((worker_index, None, None, traceback.format_exc()))
+
+
+class SimulationPool:
+    """
+    Persistent set of simulation processes fed with (betmode, sim_range, repeat) work items.
+    Processes are started with the default multiprocessing start method unless a context is given, with "spawn"
+    (the default on Windows and macOS) the gamestate is pickled and sent to each worker.
+    """
+
+    def __init__(self, gamestate: object, threads: int, context: multiprocessing.context.BaseContext = None):
+        context = context or multiprocessing.get_context()
+        self.threads = threads
+        self.work_queue = context.Queue()
+        self.result_queue = context.Queue()
+        self.processes = []
+        for worker_index in range(threads):
+            process = context.Process(
+                target=simulation_worker,
+                args=(gamestate, self.work_queue, self.result_queue, worker_index),
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+        print("All", threads, "threads are online.")
+
+    def submit(
+        self,
+        betmode: str,
+        sim_range: Tuple[int, int],
+        repeat: int,
+        thread_index: int,
+        sim_to_criteria: Dict[int, str],
+        run_args: dict,
+    ) -> None:
+        """Queue a range of simulation numbers, only the criteria for those simulations are sent."""
+        range_criteria = {sim: sim_to_criteria[sim] for sim in range(sim_range[0], sim_range[1])}
+        self.work_queue.put((betmode, sim_range, repeat, thread_index, range_criteria, run_args))
+
+    def collect(self, num_items: int) -> Tuple[List[list], Dict[int, list]]:
+        """
+        Wait for a given number of finished work items.
+        Returns the bet-mode copies from each, and the latest retry statistics of each worker by worker index.
+        A worker's statistics cover every chunk of the mode it has run, so a pool runs each bet mode once.
+        """
+        betmode_copies, worker_stats = [], {}
+        for _ in range(num_items):
+            worker_index, betmode_copy_list, retry_stats, error = self.result_queue.get()
+            if error is not None:
+                self.terminate()
+                raise RuntimeError(f"Simulation worker failed:\n{error}")
+            betmode_copies.extend(betmode_copy_list)
+            worker_stats[worker_index] = [retry_stats]
+        return betmode_copies, worker_stats
+
+    def close(self) -> None:
+        """Stop all worker processes."""
+        for _ in self.processes:
+            self.work_queue.put(None)
+        for process in self.processes:
+            process.join()
+        self.processes = []
+
+    def terminate(self) -> None:
+        """Stop all worker processes without waiting for queued work to finish."""
+        for process in self.processes:
+            process.terminate()
+            process.join()
+        self.processes = []
+
+
+def prepare_book_dictionary(
+    gamestate: object, betmode: str, sim_to_criteria: Dict[int, str], num_sims: int, compress: bool
+) -> None:
+    """
+    Train and save a zstd dictionary on the first simulations of a mode if enabled in the config.
+    The gamestate is restored afterwards, so the sampled simulations are reproduced exactly in the main run.
+    """
+    dictionary_name = gamestate.output_files.get_book_dictionary_name(betmode)
+    if os.path.exists(dictionary_name):
+        os.remove(dictionary_name)
+    if not (compress and gamestate.config.compression_dictionary):
+        return
+
+    num_samples = min(gamestate.config.dictionary_samples, num_sims)
+    initial_state = gamestate.snapshot_state()
+    try:
+        sample_books = gamestate.sample_books(betmode, sim_to_criteria, (0, num_samples))
+    finally:
+        gamestate.restore_state(initial_state)
+    dictionary = train_book_dictionary(sample_books, gamestate.config.dictionary_size)
+    if dictionary is not None:
+        write_book_dictionary(dictionary, dictionary_name)
+        print("Trained book dictionary for", betmode, "on", num_samples, "simulations.")
+
+
+def get_sim_chunks(
+    num_sims: int, threads: int, batching_size: int, chunk_size: int = None
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Split simulation numbers into (chunk_index, repeat, start, end) work items, ordered by simulation number.
+    Each batch (repeat) covers threads * sims_per_thread simulations. If chunk_size is not given a batch is cut
+    into CHUNKS_PER_THREAD pieces per thread, so slow criteria are not all left waiting on one process.
+    Every chunk writes 4 temporary files (books, lookup, segmented lookup and force records), by default
+    4 * CHUNKS_PER_THREAD * threads * repeats files per mode, i.e. 64,000 for 1e7 simulations with 10 threads and a
+    batching size of 5000. They are merged one file at a time, so the count is not limited by open file handles.
+    """
+    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+    sims_per_thread = int(num_sims / threads / num_repeats)
+    batch_sims = threads * sims_per_thread
+    if chunk_size is None:
+        chunk_size = max(1, sims_per_thread // CHUNKS_PER_THREAD)
+    sim_chunks = []
+    for repeat in range(num_repeats):
+        batch_start = repeat * batch_sims
+        for chunk_index, start in enumerate(range(batch_start, batch_start + batch_sims, chunk_size)):
+            sim_chunks.append((chunk_index, repeat, start, min(start + chunk_size, batch_start + batch_sims)))
+    return sim_chunks
+
+
 def run_multi_process_sims(
     threads: int,
     batching_size: int,
@@ -122,24 +306,33 @@ def run_multi_process_sims(
     compress: bool = True,
     write_event_list: bool = False,
     profiling: bool = False,
-):
-    """Setup multiprocessing manager for running all game-mode simulations."""
+    pool: SimulationPool = None,
+    chunk_size: int = None,
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Hand out chunks of simulation numbers to a persistent pool of worker processes as they become free.
+    Every chunk starts from the same initial gamestate and each simulation is seeded by its number, so results
+    do not depend on which process ran them. Returns the chunks in simulation order, used to reassemble outputs.
+    Attempts and time per criteria are printed once all chunks have finished, and the totals stored in
+    gamestate.betmode_retry_stats[betmode].
+    """
     print("\nCreating books for", game_id, "in", betmode)
     num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
     sims_per_thread = int(num_sims / threads / num_repeats)
     num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode)
     sim_allocation = assign_sim_criteria(num_sims_criteria, num_sims)
-    for repeat in range(num_repeats):
-        print("Batch", repeat + 1, "of", num_repeats)
-        processes = []
-        manager = Manager()
-        all_betmode_configs = manager.list()
-        if profiling:
+    prepare_book_dictionary(gamestate, betmode, sim_allocation, num_sims, compress)
+    retry_stats = RetryStats(gamestate.config.retry_budget)
+    worker_stats = {0: [retry_stats]}
+    if profiling:
+        sim_chunks = get_sim_chunks(num_sims, threads, batching_size, chunk_size=sims_per_thread)
+        for repeat in range(num_repeats):
+            print("Batch", repeat + 1, "of", num_repeats)
             asyncio.run(
                 profile_and_visualize(
                     game_id=game_id,
                     gamestate=gamestate,
-                    all_betmode_configs=all_betmode_configs,
+                    all_betmode_configs=[],
                     betmode=betmode,
                     sim_allocation=sim_allocation,
                     threads=threads,
@@ -148,44 +341,54 @@ def run_multi_process_sims(
                     repeat=repeat,
                     compress=compress,
                     write_event_list=write_event_list,
+                    retry_stats=retry_stats,
                 )
             )
-        elif threads == 1:
+    elif threads == 1:
+        sim_chunks = get_sim_chunks(num_sims, threads, batching_size, chunk_size=chunk_size)
+        initial_state = gamestate.snapshot_state()
+        for chunk_index, repeat, start, end in sim_chunks:
+            if chunk_index == 0:
+                print("Batch", repeat + 1, "of", num_repeats)
+            gamestate.restore_state(initial_state)
             gamestate.run_sims(
-                all_betmode_configs,
+                [],
                 betmode,
                 sim_allocation,
                 threads,
                 num_repeats,
-                sims_per_thread,
-                0,
+                end - start,
+                chunk_index,
                 repeat,
                 compress,
                 write_event_list,
+                sim_range=(start, end),
+                retry_stats=retry_stats,
             )
-        else:
-            for thread in range(threads):
-                process = Process(
-                    target=gamestate.run_sims,
-                    args=(
-                        all_betmode_configs,
-                        betmode,
-                        sim_allocation,
-                        threads,
-                        num_repeats,
-                        sims_per_thread,
-                        thread,
-                        repeat,
-                        compress,
-                        write_event_list,
-                    ),
-                )
-                print("Started thread", thread)
-                process.start()
-                processes += [process]
-            print("All threads are online.")
-            for process in processes:
-                process.join()
-            print("Finished joining threads.")
-            gamestate.combine(all_betmode_configs, betmode)
-            gamestate.get_betmode(betmode).lock_force_keys()
+        gamestate.restore_state(initial_state)
+    else:
+        sim_chunks = get_sim_chunks(num_sims, threads, batching_size, chunk_size=chunk_size)
+        owns_pool = pool is None
+        if owns_pool:
+            pool = SimulationPool(gamestate, threads)
+        run_args = {
+            "threads": threads,
+            "num_repeats": num_repeats,
+            "compress": compress,
+            "write_event_list": write_event_list,
+        }
+        try:
+            for chunk_index, repeat, start, end in sim_chunks:
+                pool.submit(betmode, (start, end), repeat, chunk_index, sim_allocation, run_args)
+            print("Queued", len(sim_chunks), "chunks in", num_repeats, "batches for", betmode)
+            all_betmode_configs, worker_stats = pool.collect(len(sim_chunks))
+        finally:
+            if owns_pool:
+                pool.close()
+        print("Finished all batches.")
+        gamestate.combine(all_betmode_configs, betmode)
+        gamestate.get_betmode(betmode).lock_force_keys()
+
+    gamestate.betmode_retry_stats[betmode] = print_retry_stats(betmode, worker_stats, gamestate.config.retry_budget)
+
+    return sim_chunks
@@ -1,21 +1,30 @@
-from copy import copy
+from copy import copy, deepcopy
 from abc import ABC, abstractmethod
 from warnings import warn
 import random
+import time
 
 # from src.config.config import BetMode
 from src.wins.win_manager import WinManager
 from src.calculations.symbol import SymbolStorage
 from src.config.output_filenames import OutputFiles
+from src.config.paytable import refresh_paytable_arrays
+from src.config.reelstrips import refresh_reelstrip_arrays
 from src.state.books import Book
+from src.state.compact_books import BookEncoder
+from src.state.force_records import ForceRecords
+from src.state.retry_stats import RetryStats
 from src.write_data.write_data import (
     print_recorded_wins,
-    make_lookup_tables,
-    write_json,
-    make_lookup_pay_split,
-    write_library_events,
+    write_event_config,
+    get_config_compressor,
+    load_book_dictionary,
+    BookWriter,
 )
 
+# A dry evaluation costs around half of an attempt with events, so pre-screening pays off above ~2 attempts
+DRY_PRESCREEN_ATTEMPTS = 2
+
 
 class GeneralGameState(ABC):
     """Master gamestate which other classes inherit from."""
@@ -25,12 +34,22 @@ class GeneralGameState(ABC):
         self.output_files = OutputFiles(self.config)
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
         self.library = {}
-        self.recorded_events = {}
+        self.book_encoder = BookEncoder()
+        self.book_writer = None
+        self.recorded_events = ForceRecords()
         self.special_symbol_functions = {}
         self.temp_wins = []
         self.create_symbol_map()
+        self.refresh_config_arrays()
         self.assign_special_sym_function()
         self.sim = 0
+        self.sim_attempts = 0
+        self.dry_prescreen = False
+        self.dry_run = False
+        self.attempt_rng_state = None
+        self.replay_rng_state = None
+        self.retry_stats = RetryStats(self.config.retry_budget)
+        self.betmode_retry_stats = {}
         self.criteria = ""
         self.book = Book(self.sim, self.criteria)
         self.repeat = True
@@ -61,13 +80,23 @@ class GeneralGameState(ABC):
         warn("No special symbol functions are defined")
 
     def reset_book(self) -> None:
-        """Reset global simulation variables."""
+        """Reset global simulation variables, each call is counted as one attempt at the current simulation."""
+        self.sim_attempts += 1
+        if self.dry_prescreen and self.sim_attempts > DRY_PRESCREEN_ATTEMPTS:
+            self.dry_run = True
+        if self.dry_run:
+            self.attempt_rng_state = random.getstate()
         self.temp_wins = []
         self.board = [[[] for _ in range(self.config.num_rows[x])] for x in range(self.config.num_reels)]
         self.top_symbols = None
         self.bottom_symbols = None
         self.book_id = self.sim + 1
-        self.book = Book(self.book_id, self.criteria)
+        self.book = Book(
+            self.book_id,
+            self.criteria,
+            record_events=not self.dry_run,
+            check_aliasing=self.config.check_event_aliasing,
+        )
         self.win_data = {
             "totalWin": 0,
             "wins": [],
@@ -84,9 +113,27 @@ class GeneralGameState(ABC):
         self.anticipation = [0] * self.config.num_reels
 
     def reset_seed(self, sim: int = 0) -> None:
-        """Reset rng seed to simulation number for reproducibility."""
+        """Reset rng seed to simulation number for reproducibility, or to the accepted attempt when replaying."""
         random.seed(sim + 1)
         self.sim = sim
+        if self.replay_rng_state is not None:
+            random.setstate(self.replay_rng_state)
+            self.replay_rng_state = None
+
+    def snapshot_state(self) -> dict:
+        """Copy all gamestate attributes, shared config and symbol objects are referenced rather than copied."""
+        memo = {id(self): self}
+        for shared in (self.config, self.output_files, self.symbol_storage):
+            memo[id(shared)] = shared
+        return deepcopy(dict(vars(self)), memo)
+
+    def restore_state(self, snapshot: dict) -> None:
+        """Return gamestate to a previously saved snapshot, discarding attributes set since."""
+        memo = {id(self): self}
+        for shared in (self.config, self.output_files, self.symbol_storage):
+            memo[id(shared)] = shared
+        vars(self).clear()
+        vars(self).update(deepcopy(snapshot, memo))
 
     def reset_fs_spin(self) -> None:
         """Use if using repeat during freespin games."""
@@ -154,23 +201,28 @@ class GeneralGameState(ABC):
                     self.get_betmode(betmode_name).add_force_key(key)  # type:ignore
 
     def imprint_wins(self) -> None:
-        """Record all events to library if criteria conditions are satisfied."""
+        """Record all events to library if criteria conditions are satisfied.
+        Within run_sims the book is streamed straight to the output files instead of being kept in the library.
+        If config.compact_books is set books are encoded as a CompactBook, which the BookWriter converts to JSON.
+        Nothing is recorded for a dry evaluation, the accepted attempt is replayed by run_simulation()."""
+        if self.dry_run:
+            return
         for temp_win_index in range(int(len(self.temp_wins) / 2)):
             description = tuple(sorted(self.temp_wins[2 * temp_win_index].items()))
             book_id = self.temp_wins[2 * temp_win_index + 1]
-            if description in self.recorded_events and (
-                book_id not in self.recorded_events[description]["bookIds"]
-            ):
-                self.recorded_events[description]["timesTriggered"] += 1
-                self.recorded_events[description]["bookIds"] += [book_id]
-            else:
+            if description not in self.recorded_events:
                 self.check_force_keys(description)
-                self.recorded_events[description] = {
-                    "timesTriggered": 1,
-                    "bookIds": [book_id],
-                }
+            # A description recorded twice within one book is only counted once
+            self.recorded_events.add(description, book_id)
         self.temp_wins = []
-        self.library[self.sim + 1] = copy(self.book.to_json())
+        if self.config.compact_books:
+            book = self.book_encoder.encode_book(self.book)
+        else:
+            book = self.book.to_json()
+        if self.book_writer is not None:
+            self.book_writer.write_book(book)
+        else:
+            self.library[self.sim + 1] = book if self.config.compact_books else copy(book)
         self.win_manager.update_end_round_wins()
 
     def update_final_win(self) -> None:
@@ -217,6 +269,48 @@ class GeneralGameState(ABC):
         """run_freespin trigger function should be defined in gamestate."""
         print("gamestate requires def run_freespin(), currently passing when calling runFreeSpin")
 
+    def run_simulation(self, sim) -> None:
+        """
+        Run a single simulation number for the current criteria.
+        With config.dry_prescreen, attempts are evaluated with self.dry_run set (no events are built) from the start
+        if the criteria has averaged DRY_PRESCREEN_ATTEMPTS or more attempts, otherwise once this many attempts
+        have been rejected. An accepted dry attempt is replayed from the same random state by reset_seed(),
+        producing the same outcome with its events.
+        """
+        self.dry_prescreen = self.config.dry_prescreen
+        self.dry_run = self.dry_prescreen and self.retry_stats.expects_retries(self.criteria, DRY_PRESCREEN_ATTEMPTS)
+        try:
+            self.run_spin(sim)
+        finally:
+            accepted_dry, self.dry_run, self.dry_prescreen = self.dry_run, False, False
+        if accepted_dry:
+            attempts = self.sim_attempts
+            self.replay_rng_state = self.attempt_rng_state
+            self.run_spin(sim)
+            self.sim_attempts = attempts
+
+    def refresh_config_arrays(self) -> None:
+        """
+        Recompile config.paytable_arrays and config.reelstrip_arrays if config.paytable or config.reels was edited
+        since compiling. Board draws and win evaluations use the compiled arrays without comparing them to the config,
+        so this is called once per batch.
+        """
+        refresh_paytable_arrays(self.config)
+        refresh_reelstrip_arrays(self.config)
+
+    def sample_books(self, betmode, sim_to_criteria, sim_range) -> list:
+        """Run a range of simulations without writing any output files and return the finished books."""
+        self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
+        self.library = {}
+        self.recorded_events = ForceRecords()
+        self.betmode = betmode
+        self.num_sims = sim_range[1] - sim_range[0]
+        self.refresh_config_arrays()
+        for sim in range(sim_range[0], sim_range[1]):
+            self.criteria = sim_to_criteria[sim]
+            self.run_simulation(sim)
+        return list(self.library.values())
+
     def run_sims(
         self,
         betmode_copy_list,
@@ -229,17 +323,53 @@ class GeneralGameState(ABC):
         repeat_count,
         compress=True,
         write_event_list=True,
+        sim_range=None,
+        retry_stats=None,
     ) -> None:
-        """Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished."""
+        """Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished.
+        The same gamestate may be reused by a persistent worker, so per-batch results are cleared before running.
+        Books, lookup and pay-split rows are streamed to the temporary files as each simulation is accepted.
+        Attempts and time per criteria are collected in self.retry_stats. Pass the same retry_stats to every chunk a
+        worker runs, so the dry pre-screen and the retry budget warning use the totals over all of its chunks."""
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
+        self.library = {}
+        self.recorded_events = ForceRecords()
+        self.retry_stats = retry_stats if retry_stats is not None else RetryStats(self.config.retry_budget)
         self.betmode = betmode
         self.num_sims = num_sims
-        for sim in range(
-            thread_index * num_sims + (total_threads * num_sims) * repeat_count,
-            (thread_index + 1) * num_sims + (total_threads * num_sims) * repeat_count,
-        ):
-            self.criteria = sim_to_criteria[sim]
-            self.run_spin(sim)
+        self.refresh_config_arrays()
+        if sim_range is None:
+            sim_range = (
+                thread_index * num_sims + (total_threads * num_sims) * repeat_count,
+                (thread_index + 1) * num_sims + (total_threads * num_sims) * repeat_count,
+            )
+        dictionary = None
+        if compress and self.config.compression_dictionary:
+            dictionary = load_book_dictionary(self.output_files.get_book_dictionary_name(betmode))
+        self.book_writer = BookWriter(
+            self.output_files.get_temp_multi_thread_name(betmode, thread_index, repeat_count, compress),
+            self.output_files.get_temp_lookup_name(betmode, thread_index, repeat_count),
+            self.output_files.get_temp_segmented_name(betmode, thread_index, repeat_count),
+            output_regular_json=self.config.output_regular_json,
+            record_events=write_event_list,
+            compressor=(
+                get_config_compressor(self.config, 0 if dictionary is not None else None, dictionary)
+                if compress
+                else None
+            ),
+            frame_per_book=dictionary is not None,
+        )
+        try:
+            for sim in range(sim_range[0], sim_range[1]):
+                self.criteria = sim_to_criteria[sim]
+                self.sim_attempts = 0
+                start_time = time.perf_counter()
+                self.run_simulation(sim)
+                self.retry_stats.record(self.criteria, self.sim_attempts, time.perf_counter() - start_time)
+        finally:
+            self.book_writer.close()
+            event_items = self.book_writer.event_items
+            self.book_writer = None
         mode_cost = self.get_current_betmode().get_cost()
 
         print(
@@ -251,16 +381,8 @@ class GeneralGameState(ABC):
             flush=True,
         )
 
-        write_json(
-            self,
-            self.output_files.get_temp_multi_thread_name(
-                betmode, thread_index, repeat_count, (compress) * True + (not compress) * False
-            ),
-        )
         print_recorded_wins(self, self.output_files.get_temp_force_name(betmode, thread_index, repeat_count))
-        make_lookup_tables(self, self.output_files.get_temp_lookup_name(betmode, thread_index, repeat_count))
-        make_lookup_pay_split(self, self.output_files.get_temp_segmented_name(betmode, thread_index, repeat_count))
 
         if write_event_list:
-            write_library_events(self, list(self.library.values()), betmode)
+            write_event_config(self, event_items, betmode)
         betmode_copy_list.append(self.config.bet_modes)
@@ -4,6 +4,12 @@
 from typing import List, Dict
 from src.calculations.board import Board
 
+BATCH_STRATEGY_ERROR = (
+    "Multiplier strategy '{}' is not supported in batch mode, which only evaluates the built-in 'global', 'symbol' "
+    "and 'combined' strategies from summed multipliers. Strategies added with register_multiplier_strategy() need "
+    "the board symbols, evaluate these wins with get_lines() instead."
+)
+
 
 def apply_mult(
     board: Board,
@@ -13,15 +19,20 @@ def apply_mult(
     positions: list = [],
     multiplier_key: str = "multiplier",
 ):
-    """Apply multiplier method to win_amount and winning symbol positions."""
-    strat = {
-        "global": apply_global_mult(win_amount, global_multiplier),
-        "symbol": apply_added_symbol_mult(board, win_amount, positions, multiplier_key=multiplier_key),
-        "combined": apply_combined_mult(
-            board, win_amount, global_multiplier, positions, multiplier_key=multiplier_key
-        ),
-    }
-    return strat[strategy]
+    """Apply multiplier method to win_amount and winning symbol positions.
+
+    Only the requested strategy is evaluated, strategies are looked up in MULTIPLIER_STRATEGIES.
+    """
+    return MULTIPLIER_STRATEGIES[strategy](board, win_amount, global_multiplier, positions, multiplier_key)
+
+
+def register_multiplier_strategy(name: str, strategy: callable) -> None:
+    """Add (or replace) a multiplier strategy usable by apply_mult().
+
+    The strategy is called as strategy(board, win_amount, global_multiplier, positions, multiplier_key)
+    and must return (final_win_amount, applied_multiplier).
+    """
+    MULTIPLIER_STRATEGIES[name] = strategy
 
 
 def apply_global_mult(win_amount: float, global_multiplier: int) -> tuple:
@@ -38,12 +49,54 @@ def apply_added_symbol_mult(board: Board, win_amount: float, positions: List[Dic
             and board[pos["reel"]][pos["row"]].get_attribute(multiplier_key) > 1
         ):
             symbol_multiplier += board[pos["reel"]][pos["row"]].get_attribute(multiplier_key)
+    return apply_symbol_mult_value(win_amount, symbol_multiplier)
+
+
+def apply_symbol_mult_value(win_amount: float, symbol_multiplier: int) -> tuple:
+    """Enhance win by an already summed symbol multiplier (used by batch evaluators without Symbol objects)."""
     return (round(win_amount * max(symbol_multiplier, 1), 2), max(symbol_multiplier, 1))
 
 
+def apply_mult_value(
+    strategy: str, win_amount: float, symbol_multiplier: int = 0, global_multiplier: int = 1
+) -> tuple:
+    """Board-free equivalent of apply_mult(), given the summed multiplier of the winning positions.
+    Only the built-in strategies are supported, see check_batch_strategy()."""
+    if strategy == "global":
+        return apply_global_mult(win_amount, global_multiplier)
+    win, sym_mult = apply_symbol_mult_value(win_amount, symbol_multiplier)
+    if strategy == "symbol":
+        return (win, sym_mult)
+    if strategy == "combined":
+        return (win * global_multiplier, sym_mult * global_multiplier)
+    raise ValueError(BATCH_STRATEGY_ERROR.format(strategy))
+
+
+def check_batch_strategy(strategy: str) -> None:
+    """Raise an error if a strategy is unknown to apply_mult_value(), or a built-in one was replaced by a custom one."""
+    if strategy not in BATCH_STRATEGIES or MULTIPLIER_STRATEGIES.get(strategy) is not BATCH_STRATEGIES[strategy]:
+        raise ValueError(BATCH_STRATEGY_ERROR.format(strategy))
+
+
 def apply_combined_mult(
     board: Board, win_amount: float, global_multiplier: int, positions: List[Dict], multiplier_key
 ) -> tuple:
     """Apply symbol multipliers and then global multiplier"""
     win, sym_mult = apply_added_symbol_mult(board, win_amount, positions, multiplier_key)
     return (win * global_multiplier  , sym_mult * global_multiplier)
+
+
+MULTIPLIER_STRATEGIES = {
+    "global": lambda board, win_amount, global_multiplier, positions, multiplier_key: apply_global_mult(
+        win_amount, global_multiplier
+    ),
+    "symbol": lambda board, win_amount, global_multiplier, positions, multiplier_key: apply_added_symbol_mult(
+        board, win_amount, positions, multiplier_key=multiplier_key
+    ),
+    "combined": lambda board, win_amount, global_multiplier, positions, multiplier_key: apply_combined_mult(
+        board, win_amount, global_multiplier, positions, multiplier_key=multiplier_key
+    ),
+}
+
+# Built-in strategies, which apply_mult_value() reproduces without Symbol objects
+BATCH_STRATEGIES = dict(MULTIPLIER_STRATEGIES)
@@ -0,0 +1,200 @@
+"""Memory-mapped index of force records and lookup table payouts, with boolean queries over book-ids."""
+
+import json
+import numpy as np
+
+# Data blocks start at a multiple of this many bytes after the header
+INDEX_ALIGNMENT = 64
+ID_DTYPE = np.dtype("<u4")
+OFFSET_DTYPE = np.dtype("<u8")
+PAYOUT_DTYPE = np.dtype("<i8")
+
+
+def read_lookup_payouts(lookup_name: str) -> tuple[np.ndarray, np.ndarray]:
+    """Book ids and payout multipliers (the last column) of a lookup table, sorted by book id."""
+    table = np.loadtxt(lookup_name, delimiter=",", dtype=np.int64, ndmin=2)
+    order = np.argsort(table[:, 0], kind="stable")
+    return table[order, 0], table[order, -1]
+
+
+def align(position: int, alignment: int = INDEX_ALIGNMENT) -> int:
+    """Round a file position up to a multiple of the alignment."""
+    return -(-position // alignment) * alignment
+
+
+def write_padded(f, data: np.ndarray, alignment: int = INDEX_ALIGNMENT) -> None:
+    """Pad the file to the alignment and write an array."""
+    f.write(b"\0" * (align(f.tell(), alignment) - f.tell()))
+    data.tofile(f)
+
+
+def build_force_index(force_record_name: str, lookup_name: str, index_name: str) -> None:
+    """
+    Write the index file of one bet mode:
+    - 8 bytes: length of the JSON header (little-endian)
+    - JSON header: the 'search' field of each force record entry, the number of entry ids and lookup table books
+    - the offset of each entry's ids within the entry ids, followed by the total (uint64)
+    - the sorted, unique book ids of every entry, one after the other (uint32, as held by ForceRecords)
+    - the sorted book ids of the lookup table (uint32) and the payout multiplier of each (int64)
+    Each block starts at a multiple of INDEX_ALIGNMENT bytes, so the file size grows with the number of recorded ids.
+    """
+    with open(force_record_name, "r", encoding="UTF-8") as f:
+        force_records = json.load(f)
+    lookup_ids, lookup_payouts = read_lookup_payouts(lookup_name)
+    if len(lookup_ids) == 0:
+        raise ValueError(f"Lookup table {lookup_name} has no books to index.")
+    entry_ids = [np.unique(np.asarray(entry["bookIds"], dtype=ID_DTYPE)) for entry in force_records]
+    offsets = np.zeros(len(entry_ids) + 1, dtype=OFFSET_DTYPE)
+    np.cumsum([len(ids) for ids in entry_ids], out=offsets[1:])
+
+    header = {
+        "num_ids": int(offsets[-1]),
+        "num_books": len(lookup_ids),
+        "entries": [{item["name"]: str(item["value"]) for item in entry["search"]} for entry in force_records],
+    }
+    header_bytes = json.dumps(header).encode("UTF-8")
+    with open(index_name, "wb") as f:
+        f.write(len(header_bytes).to_bytes(8, "little"))
+        f.write(header_bytes)
+        write_padded(f, offsets)
+        write_padded(f, np.concatenate(entry_ids + [np.zeros(0, dtype=ID_DTYPE)]))
+        write_padded(f, lookup_ids.astype(ID_DTYPE))
+        write_padded(f, lookup_payouts.astype(PAYOUT_DTYPE))
+
+
+class ForceIndex:
+    """
+    Read-only view of an index file. Book id arrays are memory-mapped, so opening an index does not load them.
+    Queries are built from Match and Payout and combined with & (and), | (or) and ~ (not), each evaluating to a
+    sorted array of unique book ids.
+    """
+
+    def __init__(self, index_name: str):
+        with open(index_name, "rb") as f:
+            header_length = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(header_length))
+        self.entries = header["entries"]
+        num_ids, num_books = header["num_ids"], header["num_books"]
+        position = align(8 + header_length)
+        self.offsets = self.map_array(index_name, OFFSET_DTYPE, position, len(self.entries) + 1)
+        position = align(position + self.offsets.nbytes)
+        self.entry_ids = self.map_array(index_name, ID_DTYPE, position, num_ids)
+        position = align(position + num_ids * ID_DTYPE.itemsize)
+        self.all_books = self.map_array(index_name, ID_DTYPE, position, num_books)
+        position = align(position + num_books * ID_DTYPE.itemsize)
+        self.payouts = self.map_array(index_name, PAYOUT_DTYPE, position, num_books)
+        self.term_entries = {}
+        for entry_index, entry in enumerate(self.entries):
+            for key, value in entry.items():
+                self.term_entries.setdefault((key, value), set()).add(entry_index)
+
+    @staticmethod
+    def map_array(index_name: str, dtype: np.dtype, offset: int, length: int) -> np.ndarray:
+        """Memory-mapped block of the index file, numpy can't map an empty block."""
+        if length == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(index_name, dtype=dtype, mode="r", offset=offset, shape=(length,))
+
+    def get_entry_ids(self, entry_index: int) -> np.ndarray:
+        """Sorted book ids of a force record entry."""
+        return self.entry_ids[self.offsets[entry_index] : self.offsets[entry_index + 1]]
+
+    def match_entries(self, search_keys: dict) -> list:
+        """Indices of force record entries containing all given key/value pairs."""
+        entry_sets = [self.term_entries.get((str(key), str(value)), set()) for key, value in search_keys.items()]
+        if len(entry_sets) == 0:
+            return list(range(len(self.entries)))
+        return sorted(set.intersection(*entry_sets))
+
+    def evaluate(self, query: "Query") -> np.ndarray:
+        """Sorted, unique book ids satisfying a query."""
+        return np.asarray(query.evaluate(self))
+
+    def query(self, query: "Query") -> np.ndarray:
+        """Sorted book ids satisfying a query."""
+        return self.evaluate(query)
+
+    def count(self, query: "Query") -> int:
+        """Number of books satisfying a query."""
+        return len(self.evaluate(query))
+
+
+class Query:
+    """Base class of index queries, combined with &, | and ~."""
+
+    def evaluate(self, index: ForceIndex) -> np.ndarray:
+        raise NotImplementedError
+
+    def __and__(self, other: "Query") -> "Query":
+        return And(self, other)
+
+    def __or__(self, other: "Query") -> "Query":
+        return Or(self, other)
+
+    def __invert__(self) -> "Query":
+        return Not(self)
+
+
+class Match(Query):
+    """
+    Books recorded with a description containing all given key/value pairs, i.e. Match({"kind": 3}) matches every
+    3-kind entry. Values are compared as strings, as they are stored in the force record.
+    """
+
+    def __init__(self, search_keys: dict = None, **kwargs):
+        self.search_keys = {**(search_keys or {}), **kwargs}
+
+    def evaluate(self, index: ForceIndex) -> np.ndarray:
+        entries = index.match_entries(self.search_keys)
+        if len(entries) == 1:
+            return np.array(index.get_entry_ids(entries[0]))
+        return np.unique(np.concatenate([index.get_entry_ids(entry) for entry in entries] + [np.zeros(0, ID_DTYPE)]))
+
+
+class Payout(Query):
+    """Books with min_payout <= payout multiplier < max_payout, in lookup table units (100 = 1x bet)."""
+
+    def __init__(self, min_payout: int = None, max_payout: int = None):
+        self.min_payout = min_payout
+        self.max_payout = max_payout
+
+    def evaluate(self, index: ForceIndex) -> np.ndarray:
+        in_range = np.ones(len(index.all_books), dtype=bool)
+        if self.min_payout is not None:
+            in_range &= index.payouts >= self.min_payout
+        if self.max_payout is not None:
+            in_range &= index.payouts < self.max_payout
+        return np.array(index.all_books[in_range])
+
+
+class And(Query):
+    """Books satisfying every query."""
+
+    def __init__(self, *queries: Query):
+        self.queries = queries
+
+    def evaluate(self, index: ForceIndex) -> np.ndarray:
+        book_ids = np.array(index.all_books)
+        for query in self.queries:
+            book_ids = np.intersect1d(book_ids, query.evaluate(index), assume_unique=True)
+        return book_ids
+
+
+class Or(Query):
+    """Books satisfying any query."""
+
+    def __init__(self, *queries: Query):
+        self.queries = queries
+
+    def evaluate(self, index: ForceIndex) -> np.ndarray:
+        return np.unique(np.concatenate([query.evaluate(index) for query in self.queries] + [np.zeros(0, ID_DTYPE)]))
+
+
+class Not(Query):
+    """Books in the lookup table not satisfying a query."""
+
+    def __init__(self, query: Query):
+        self.query = query
+
+    def evaluate(self, index: ForceIndex) -> np.ndarray:
+        return np.setdiff1d(index.all_books, self.query.evaluate(index), assume_unique=True)
@@ -6,9 +6,71 @@ import shutil
 import os
 import hashlib
 import json
-import ast
+import textwrap
 import zstandard as zstd
 
+from src.state.compact_books import get_book_json
+from src.state.force_records import write_force_record_file, merge_force_record_files
+from src.write_data.force_index import build_force_index
+
+
+BOOK_MERGE_MODES = ("concatenate", "recompress")
+MAX_WINDOW_SIZE = 2**31
+
+
+def get_book_compressor(
+    level: int = 3,
+    threads: int = 0,
+    window_log: int = None,
+    long_distance: bool = False,
+    dictionary: zstd.ZstdCompressionDict = None,
+) -> zstd.ZstdCompressor:
+    """zstd compressor used for books. threads=-1 uses all logical cores, 0 compresses on the calling thread."""
+    param_args = {"threads": threads, "enable_ldm": bool(long_distance)}
+    if window_log is not None:
+        param_args["window_log"] = window_log
+    return zstd.ZstdCompressor(
+        dict_data=dictionary,
+        compression_params=zstd.ZstdCompressionParameters.from_level(level, **param_args),
+    )
+
+
+def get_config_compressor(
+    config: object, threads: int = None, dictionary: zstd.ZstdCompressionDict = None
+) -> zstd.ZstdCompressor:
+    """Book compressor from the compression settings in the game config, threads may be overridden."""
+    return get_book_compressor(
+        level=config.compression_level,
+        threads=config.compression_threads if threads is None else threads,
+        window_log=config.compression_window_log,
+        long_distance=config.compression_long_distance,
+        dictionary=dictionary,
+    )
+
+
+def train_book_dictionary(books: list, dict_size: int = 2**17) -> zstd.ZstdCompressionDict:
+    """Train a zstd dictionary on sample books, returns None if there are too few samples to train on."""
+    samples = [(json.dumps(get_book_json(book)) + "\n").encode("UTF-8") for book in books]
+    try:
+        return zstd.train_dictionary(dict_size, samples)
+    except zstd.ZstdError as err:
+        warn(f"Could not train book dictionary from {len(samples)} samples, books are compressed without it.\n{err}")
+        return None
+
+
+def write_book_dictionary(dictionary: zstd.ZstdCompressionDict, name: str) -> None:
+    """Save a trained dictionary so books can be decompressed later."""
+    with open(name, "wb") as f:
+        f.write(dictionary.as_bytes())
+
+
+def load_book_dictionary(name: str) -> zstd.ZstdCompressionDict:
+    """Load a book dictionary, returns None if the file does not exist."""
+    if name is None or not os.path.exists(name):
+        return None
+    with open(name, "rb") as f:
+        return zstd.ZstdCompressionDict(f.read())
+
 
 def get_sha_256(file_to_hash: str):
     """Get human readable hash of file."""
@@ -65,22 +127,41 @@ def make_force_json(gamestate: object):
         json.dump(force_data, force_file, indent=4)
 
 
-def get_force_options(force_results: dict):
-    """Return JSON ready force keys."""
+def get_force_options(force_results: list):
+    """Return JSON ready force keys from the recorded descriptions."""
     force_keys = defaultdict(set)
-    for force in force_results.keys():
+    for force in force_results:
         for key, val in force:
             force_keys[str(key)].add(val)
     return {key: list(val) for key, val in force_keys.items()}
 
 
+def get_lookup_row(book: dict) -> str:
+    """Lookup table row: book id, weight, payout multiplier."""
+    return "{},1,{}\n".format(book["id"], book["payoutMultiplier"])
+
+
+def get_pay_split_row(book: dict) -> str:
+    """Segmented lookup table row: book id, criteria, basegame and freegame wins."""
+    return (
+        str(book["id"])
+        + ","
+        + str(book["criteria"])
+        + ","
+        + str(round(book["baseGameWins"], 2))
+        + ","
+        + str(round(book["freeGameWins"], 2))
+        + "\n"
+    )
+
+
 def make_lookup_tables(gamestate: object, name: str):
     """Write lookup tables for all simulations."""
     file = open(name, "w", encoding="UTF-8")
     sims = list(gamestate.library.keys())
     sims.sort()
     for sim in sims:
-        file.write("{},1,{}\n".format(gamestate.library[sim]["id"], gamestate.library[sim]["payoutMultiplier"]))
+        file.write(get_lookup_row(get_book_json(gamestate.library[sim])))
     file.close()
 
 
@@ -90,31 +171,89 @@ def make_lookup_pay_split(gamestate: object, name: str):
     sims = list(gamestate.library.keys())
     sims.sort()
     for sim in sims:
-        file.write(
-            str(gamestate.library[sim]["id"])
-            + ","
-            + str(gamestate.library[sim]["criteria"])
-            + ","
-            + str(round(gamestate.library[sim]["baseGameWins"], 2))
-            + ","
-            + str(round(gamestate.library[sim]["freeGameWins"], 2))
-            + "\n"
-        )
+        file.write(get_pay_split_row(get_book_json(gamestate.library[sim])))
     file.close()
 
 
-def write_library_events(gamestate: object, library: list, gametype: str):
-    """Write all unique events within a given mode - with one example application."""
-    unique_event = []
-    event_items = {}
-    for event in library:
-        for instance in event["events"]:
-            lib_event = instance["type"]
-            if lib_event not in unique_event:
-                unique_event.append(lib_event)
-                item_keys = instance.keys()
-                dict_details = {key: instance[key] for key in item_keys if key != "index"}
-                event_items[lib_event] = dict_details
+class BookWriter:
+    """
+    Streams finished books to the temporary book, lookup and pay-split files as each simulation is accepted.
+    Books are serialised immediately, so memory use does not grow with the number of simulations in a batch.
+    With frame_per_book each book is compressed as its own zstd frame, normally together with a trained dictionary.
+    """
+
+    def __init__(
+        self,
+        book_name: str,
+        lookup_name: str,
+        segmented_name: str,
+        output_regular_json: bool = False,
+        record_events: bool = False,
+        compressor: zstd.ZstdCompressor = None,
+        frame_per_book: bool = False,
+    ):
+        self.compress = book_name.endswith(".zst")
+        self.frame_per_book = frame_per_book and self.compress
+        self.output_regular_json = output_regular_json and not self.compress
+        self.event_items = {} if record_events else None
+        self.num_books = 0
+        self.book_stream = None
+        if self.compress:
+            self.book_file = open(book_name, "wb")
+            self.compressor = get_book_compressor() if compressor is None else compressor
+            if not self.frame_per_book:
+                self.book_stream = self.compressor.stream_writer(self.book_file, closefd=False)
+        else:
+            self.book_file = open(book_name, "w", encoding="UTF-8")
+        self.lookup_file = open(lookup_name, "w", encoding="UTF-8")
+        self.segmented_file = open(segmented_name, "w", encoding="UTF-8")
+
+    def write_book(self, book: object) -> None:
+        """Serialise a single book (dictionary or CompactBook) and write its lookup table rows."""
+        book = get_book_json(book)
+        book_str = json.dumps(book)
+        if self.frame_per_book:
+            self.book_file.write(self.compressor.compress((book_str + "\n").encode("UTF-8")))
+        elif self.compress:
+            self.book_stream.write((book_str + "\n").encode("UTF-8"))
+        elif self.output_regular_json:
+            self.book_file.write(("[" if self.num_books == 0 else ", ") + book_str)
+        else:
+            self.book_file.write(book_str + "\n")
+        self.lookup_file.write(get_lookup_row(book))
+        self.segmented_file.write(get_pay_split_row(book))
+        if self.event_items is not None:
+            add_unique_events(self.event_items, book)
+        self.num_books += 1
+
+    def close(self) -> None:
+        """Finish the book output and close all files."""
+        if self.frame_per_book:
+            if self.num_books == 0:
+                self.book_file.write(self.compressor.compress(b"\n"))
+        elif self.compress:
+            if self.num_books == 0:
+                self.book_stream.write(b"\n")
+            self.book_stream.close()
+        elif self.output_regular_json:
+            self.book_file.write("]" if self.num_books > 0 else "[]")
+        elif self.num_books == 0:
+            self.book_file.write("\n")
+        self.book_file.close()
+        self.lookup_file.close()
+        self.segmented_file.close()
+
+
+def add_unique_events(event_items: dict, book: dict) -> None:
+    """Store one example of each event type found in a book, ignoring types already seen."""
+    for instance in book["events"]:
+        lib_event = instance["type"]
+        if lib_event not in event_items:
+            event_items[lib_event] = {key: instance[key] for key in instance.keys() if key != "index"}
+
+
+def write_event_config(gamestate: object, event_items: dict, gametype: str):
+    """Write example events to the event_config file of a given mode."""
     json_object = json.dumps(event_items, indent=4)
     with open(
         os.path.join(gamestate.output_files.config_path, f"event_config_{gametype}.json"),
@@ -124,6 +263,49 @@ def write_library_events(gamestate: object, library: list, gametype: str):
         f.write(json_object)
 
 
+def write_library_events(gamestate: object, library: list, gametype: str):
+    """Write all unique events within a given mode - with one example application."""
+    event_items = {}
+    for book in library:
+        add_unique_events(event_items, get_book_json(book))
+    write_event_config(gamestate, event_items, gametype)
+
+
+def concatenate_zstd_files(file_list: list, out_name: str, read_size: int = 2**20) -> None:
+    """
+    Join compressed book files without decompressing them. The output holds one zstd frame per input file,
+    which decompresses to the concatenation of all inputs.
+    """
+    with open(out_name, "wb") as f_out:
+        for fname in file_list:
+            with open(fname, "rb") as f_in:
+                shutil.copyfileobj(f_in, f_out, read_size)
+
+
+def recompress_zstd_files(
+    file_list: list,
+    out_name: str,
+    compressor: zstd.ZstdCompressor = None,
+    dictionary: zstd.ZstdCompressionDict = None,
+) -> None:
+    """Stream all compressed book files through a single (optionally multi-threaded) compressor, giving one frame.
+    The dictionary is needed to read files compressed with one."""
+    decompressor = zstd.ZstdDecompressor(dict_data=dictionary, max_window_size=MAX_WINDOW_SIZE)
+    compressor = get_book_compressor() if compressor is None else compressor
+    with open(out_name, "wb") as f_out:
+        with compressor.stream_writer(f_out, closefd=False) as writer:
+            for fname in file_list:
+                with open(fname, "rb") as f_in:
+                    decompressor.copy_stream(f_in, writer)
+
+
+def get_temp_file_keys(threads: int, num_repeats: int, sim_chunks: list = None) -> list:
+    """(index, repeat) pairs of temporary files, in simulation order."""
+    if sim_chunks is not None:
+        return [(chunk_index, repeat) for chunk_index, repeat, _, _ in sim_chunks]
+    return [(thread, repeat_index) for repeat_index in range(num_repeats) for thread in range(threads)]
+
+
 def output_lookup_and_force_files(
     threads: int,
     batching_size: int,
@@ -132,30 +314,35 @@ def output_lookup_and_force_files(
     gamestate: object,
     num_sims: int = 1000000,
     compress: bool = True,
+    sim_chunks: list = None,
+    book_merge: str = "concatenate",
 ):
-    """Combine temporary lookup tables and force files into a single output."""
+    """Combine temporary lookup tables and force files into a single output.
+    If the simulation chunks are passed, files are joined in that order, otherwise one file per thread is assumed.
+    Compressed books are merged according to book_merge, see concatenate_zstd_files and recompress_zstd_files."""
     print("Saving books for ", game_id, "in", betmode)
     num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+    file_keys = get_temp_file_keys(threads, num_repeats, sim_chunks)
     file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_multi_thread_name(betmode, thread, repeat_index, compress)
-            )
+    for index, repeat_index in file_keys:
+        file_list.append(gamestate.output_files.get_temp_multi_thread_name(betmode, index, repeat_index, compress))
 
     if compress:
-        temp_book_output_path = os.path.join(gamestate.output_files.book_path, "temp_book_output.json")
-        with open(temp_book_output_path, "w", encoding="UTF-8") as outfile:
-            for fname in file_list:
-                with open(fname, "rb") as infile:
-                    decompressed = zstd.ZstdDecompressor().decompress(infile.read())
-                    outfile.write(decompressed.decode("UTF-8"))
-
         final_out = gamestate.output_files.get_final_book_name(betmode, True)
-        with open(temp_book_output_path, "rb") as f_in, open(final_out, "wb") as f_out:
-            f_out.write(zstd.ZstdCompressor().compress(f_in.read()))
-
-        os.remove(temp_book_output_path)
+        if book_merge == "concatenate":
+            concatenate_zstd_files(file_list, final_out)
+        elif book_merge == "recompress":
+            # simulations are finished, so all simulation threads are available unless set in the config
+            merge_threads = gamestate.config.compression_threads or (threads if threads > 1 else 0)
+            dictionary = load_book_dictionary(gamestate.output_files.get_book_dictionary_name(betmode))
+            recompress_zstd_files(
+                file_list,
+                final_out,
+                get_config_compressor(gamestate.config, merge_threads, dictionary),
+                dictionary,
+            )
+        else:
+            raise ValueError(f"book_merge must be one of {BOOK_MERGE_MODES}, got {book_merge}")
     else:
         with open(
             gamestate.output_files.get_final_book_name(betmode, False),
@@ -168,49 +355,26 @@ def output_lookup_and_force_files(
                     if filename.endswith(".jsonl"):
                         outfile.write(file_data)
                     elif filename.endswith(".json"):
-                        if id == 0:
+                        if len(file_list) == 1:
+                            outfile.write(file_data)
+                        elif id == 0:
                             outfile.write(file_data[:-1])  # don't write final ']'
                         elif id != len(file_list) - 1:
-                            outfile.write("," + file_data[1:-1])  # don't write first or last '[/]'
+                            outfile.write(", " + file_data[1:-1])  # don't write first or last '[/]'
                         else:
-                            outfile.write("," + file_data[1::])  # dont write first '[', write last ']'
+                            outfile.write(", " + file_data[1::])  # dont write first '[', write last ']'
 
     print("Saving force files for", game_id, "in", betmode)
-    force_results_dict = {}
     file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_force_name(betmode, thread, repeat_index),
-            )
+    for index, repeat_index in file_keys:
+        file_list.append(
+            gamestate.output_files.get_temp_force_name(betmode, index, repeat_index),
+        )
 
-    for filename in file_list:
-        force_chunk = ast.literal_eval(json.load(open(filename, "r", encoding="UTF-8")))
-        for key in force_chunk:
-            if force_results_dict.get(key) is not None:
-                force_results_dict[key]["timesTriggered"] += force_chunk[key]["timesTriggered"]
-                force_results_dict[key]["bookIds"] += force_chunk[key]["bookIds"]
-            else:
-                force_results_dict[key] = force_chunk[key]
-
-    force_results_dict_just_for_rob = []
-    for force_combination in force_results_dict:
-        search_dict = []
-        for key in force_combination:
-            search_dict.append({"name": str(key[0]), "value": str(key[1])})
-        force_dict = {
-            "search": search_dict,
-            "timesTriggered": force_results_dict[force_combination]["timesTriggered"],
-            "bookIds": force_results_dict[force_combination]["bookIds"],
-        }
-        force_results_dict_just_for_rob.append(force_dict)
-
-    json_object_for_rob = json.dumps(force_results_dict_just_for_rob, indent=4)
     force_record_path = os.path.join(gamestate.output_files.force_path, f"force_record_{betmode}.json")
-    with open(force_record_path, "w", encoding="UTF-8") as file:
-        file.write(json_object_for_rob)
+    descriptions = write_force_record_json(merge_force_record_files(file_list), force_record_path)
 
-    forceResultKeys = get_force_options(force_results_dict)
+    forceResultKeys = get_force_options(descriptions)
     json_file_path = os.path.join(gamestate.output_files.force_path, "force.json")
     try:
         with open(json_file_path, "r", encoding="UTF-8") as file:
@@ -225,14 +389,9 @@ def output_lookup_and_force_files(
     weights_plus_wins_file_list = []
     segmented_lut_file_list = []
     print("Saving LUTs for", game_id, "in", betmode)
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            weights_plus_wins_file_list += [
-                gamestate.output_files.get_temp_lookup_name(betmode, thread, repeat_index)
-            ]
-            segmented_lut_file_list += [
-                gamestate.output_files.get_temp_segmented_name(betmode, thread, repeat_index)
-            ]
+    for index, repeat_index in file_keys:
+        weights_plus_wins_file_list += [gamestate.output_files.get_temp_lookup_name(betmode, index, repeat_index)]
+        segmented_lut_file_list += [gamestate.output_files.get_temp_segmented_name(betmode, index, repeat_index)]
 
     with open(
         gamestate.output_files.get_final_lookup_name(betmode),
@@ -258,29 +417,56 @@ def output_lookup_and_force_files(
             with open(filename, "r", encoding="UTF-8") as infile:
                 outfile.write(infile.read())
 
+    if gamestate.config.write_force_index:
+        build_force_index(
+            force_record_path,
+            gamestate.output_files.get_final_lookup_name(betmode),
+            os.path.join(gamestate.output_files.force_path, f"force_index_{betmode}.bin"),
+        )
 
-def write_json(gamestate, filename: str):
-    """Convert the list of dictionaries to a JSON-encoded string and compress it in chunks."""
-    json_objects = [json.dumps(item) for item in gamestate.library.values()]
-    combined_data = "\n".join(json_objects) + "\n"
 
+def write_json(gamestate, filename: str):
+    """Write all books in the library, compressing as they are serialised. Compact books are converted one at a time."""
     if filename.endswith(".zst"):
-        compressor = zstd.ZstdCompressor()
-        compressed_data = compressor.compress(combined_data.encode("UTF-8"))
+        compressor = get_config_compressor(gamestate.config)
         with open(filename, "wb") as f:
-            f.write(compressed_data)
+            with compressor.stream_writer(f, closefd=False) as writer:
+                for item in gamestate.library.values():
+                    writer.write((json.dumps(get_book_json(item)) + "\n").encode("UTF-8"))
     else:
         with open(filename, "w", encoding="UTF-8") as f:
-            if not (gamestate.config.output_regular_json):
-                f.write(combined_data)
-            else:
-                j_regular = [item for item in gamestate.library.values()]
-                f.write(json.dumps(j_regular))
+            for idx, item in enumerate(gamestate.library.values()):
+                book_str = json.dumps(get_book_json(item))
+                if not (gamestate.config.output_regular_json):
+                    f.write(book_str + "\n")
+                else:
+                    f.write(("[" if idx == 0 else ", ") + book_str)
+            if gamestate.config.output_regular_json:
+                f.write("]" if len(gamestate.library) > 0 else "[]")
+            elif len(gamestate.library) == 0:
+                f.write("\n")
 
 
 def print_recorded_wins(gamestate: object, name: str = ""):
-    """Temporary file generation for wins/recorded results."""
-    json_object = json.dumps(str(gamestate.recorded_events), indent=4)
-    file = open(name, "w", encoding="UTF-8")
-    file.write(json_object)
-    file.close()
+    """Temporary file generation for wins/recorded results, see write_force_record_file()."""
+    write_force_record_file(gamestate.recorded_events, name)
+
+
+def write_force_record_json(merged_records, name: str) -> list:
+    """
+    Stream (description, book ids) pairs to force_record_<mode>.json, formatted as json.dumps(records, indent=4).
+    Returns the descriptions written.
+    """
+    descriptions = []
+    with open(name, "w", encoding="UTF-8") as file:
+        for description, book_ids in merged_records:
+            force_dict = {
+                "search": [{"name": str(key), "value": str(value)} for key, value in description],
+                "timesTriggered": len(book_ids),
+                "bookIds": book_ids.tolist(),
+            }
+            file.write("[\n" if len(descriptions) == 0 else ",\n")
+            file.write(textwrap.indent(json.dumps(force_dict, indent=4), "    "))
+            descriptions.append(description)
+        file.write("\n]" if len(descriptions) > 0 else "[]")
+    return descriptions
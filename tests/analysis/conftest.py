@@ -0,0 +1,10 @@
+"""Shared fixtures for analysis tests."""
+
+import pytest
+from utils.analysis import lookup_table
+
+
+@pytest.fixture(autouse=True)
+def fixture_lut_cache(tmp_path, monkeypatch):
+    """Keep lookup table caches of test files out of the project cache folder."""
+    monkeypatch.setattr(lookup_table, "CACHE_PATH", str(tmp_path / "lut_cache"))
@@ -0,0 +1,110 @@
+"""Test lookup table columns and the analysis functions reading them against line-by-line parsing of the CSV files."""
+
+import os
+import random
+from collections import defaultdict
+import pytest
+from utils.analysis.lookup_table import LookupTable
+from utils.analysis.distribution_functions import make_win_distribution
+from utils.game_analytics.get_pay_splits import get_unoptimized_hits, make_split_win_distribution
+from utils.rgs_verification import verify_lookup_format
+
+NUM_BOOKS = 400
+
+
+@pytest.fixture(name="lookup_files")
+def fixture_lookup_files(tmp_path):
+    random.seed(11)
+    lookup_name = str(tmp_path / "lookUpTable_base.csv")
+    segmented_name = str(tmp_path / "lookUpTableSegmented_base.csv")
+    with open(lookup_name, "w", encoding="UTF-8") as lut, open(segmented_name, "w", encoding="UTF-8") as seg:
+        for book_id in range(1, NUM_BOOKS + 1):
+            criteria = random.choice(["0", "0", "freegame", "wincap"])
+            base_win = random.choice([0, 0, 20, 150, 1230])
+            free_win = 0 if criteria == "0" else random.choice([0, 310, 5000, 100000])
+            weight = random.randint(1, 2**40)
+            lut.write(f"{book_id},{weight},{base_win + free_win}\n")
+            seg.write(f"{book_id},{criteria},{base_win / 100},{free_win / 100}\n")
+    return lookup_name, segmented_name
+
+
+def read_rows(filename: str) -> list:
+    with open(filename, "r", encoding="UTF-8") as f:
+        return [line.strip().split(",") for line in f]
+
+
+def test_columns_match_file(lookup_files):
+    lookup_name, segmented_name = lookup_files
+    table = LookupTable(lookup_name, segmented_name)
+    rows, segmented_rows = read_rows(lookup_name), read_rows(segmented_name)
+    assert len(table) == NUM_BOOKS
+    assert table.ids.tolist() == [int(row[0]) for row in rows]
+    assert table.weights.tolist() == [int(row[1]) for row in rows]
+    assert table.payouts.tolist() == [int(row[2]) for row in rows]
+    assert table.get_total_weight() == sum(int(row[1]) for row in rows)
+    assert table.criteria.tolist() == [row[1] for row in segmented_rows]
+    assert table.basegame_wins.tolist() == [float(row[2]) for row in segmented_rows]
+    assert table.freegame_wins.tolist() == [float(row[3]) for row in segmented_rows]
+
+
+def test_cache_follows_file_contents(lookup_files, tmp_path):
+    lookup_name, segmented_name = lookup_files
+    cache_root = str(tmp_path / "cache")
+    first = LookupTable(lookup_name, cache_root=cache_root).weights.tolist()
+    assert len(os.listdir(cache_root)) == 1
+    assert LookupTable(lookup_name, cache_root=cache_root).weights.tolist() == first
+    # Nothing is added to the lookup table folder, which may be published
+    assert sorted(os.listdir(os.path.dirname(lookup_name))) == sorted(
+        os.path.basename(name) for name in (lookup_name, segmented_name, cache_root)
+    )
+
+    with open(lookup_name, "a", encoding="UTF-8") as f:
+        f.write(f"{NUM_BOOKS + 1},5,0\n")
+    table = LookupTable(lookup_name, cache_root=cache_root)
+    assert len(table) == NUM_BOOKS + 1 and table.weights[-1] == 5
+    assert len(os.listdir(cache_root)) == 1
+
+
+def test_win_distribution(lookup_files):
+    lookup_name, _ = lookup_files
+    expected = defaultdict(float)
+    for _, weight, payout in read_rows(lookup_name):
+        expected[float(payout) / 100] += int(weight)
+    distribution = make_win_distribution(lookup_name, normalize=False)
+    assert list(distribution.items()) == sorted(expected.items())
+
+
+def test_verify_lookup_format(lookup_files):
+    lookup_name, _ = lookup_files
+    distribution, payouts, total_weight, min_win, max_win = verify_lookup_format(lookup_name)
+    rows = read_rows(lookup_name)
+    assert distribution == make_win_distribution(lookup_name)
+    assert payouts == [int(row[2]) for row in rows]
+    assert (min_win, max_win) == (min(payouts), max(payouts))
+    assert total_weight == float(sum(int(row[1]) for row in rows))
+
+
+def test_unoptimized_hits(lookup_files):
+    lookup_name, _ = lookup_files
+    win_ranges = [(0, 0.1), (0.1, 5), (1, 100), (100, 10000)]
+    hit_rates, range_hits = get_unoptimized_hits(os.path.dirname(lookup_name), ["base"], win_ranges)
+    expected = {win_range: 0 for win_range in win_ranges}
+    for row in read_rows(lookup_name):
+        payout = int(row[2]) / 100
+        expected[next(wr for wr in win_ranges if wr[0] <= payout < wr[1])] += 1
+    assert range_hits["base"] == expected
+    assert hit_rates["base"][(0, 0.1)] == round(NUM_BOOKS / expected[(0, 0.1)], 3)
+
+
+def test_split_win_distribution(lookup_files):
+    lookup_name, segmented_name = lookup_files
+    distributions, total_weight = make_split_win_distribution(lookup_name, segmented_name, ["basegame", "freegame"])
+    expected = defaultdict(lambda: defaultdict(float))
+    for (_, weight, _), (_, criteria, base_win, free_win) in zip(read_rows(lookup_name), read_rows(segmented_name)):
+        weight, base_win, free_win = int(weight), float(base_win), float(free_win)
+        expected["basegame"][base_win] += weight
+        expected["freegame"][free_win] += weight
+        expected["cumulative"][base_win + free_win] += weight
+    assert total_weight == sum(int(row[1]) for row in read_rows(lookup_name))
+    for mode in ("basegame", "freegame", "cumulative"):
+        assert list(distributions[mode].items()) == sorted(expected[mode].items())
@@ -0,0 +1,80 @@
+"""Test WinDistribution statistics against direct sums over a win-distribution dictionary."""
+
+import random
+import pytest
+from utils.analysis.distribution_functions import WinDistribution, make_win_distribution
+from utils.game_analytics.get_pay_splits import return_hit_rates
+
+
+@pytest.fixture(name="dist")
+def fixture_dist():
+    random.seed(3)
+    payouts = sorted(random.sample([round(0.1 * i, 1) for i in range(1, 5000)], 60))
+    dist = {0.0: 5000.0}
+    dist.update({payout: float(random.randint(1, 400)) for payout in payouts})
+    return dist
+
+
+def test_moments(dist):
+    total = sum(dist.values())
+    mean = sum(win * weight for win, weight in dist.items()) / total
+    variance = sum((win - mean) ** 2 * weight for win, weight in dist.items()) / total
+    skewness = sum((win - mean) ** 3 * weight for win, weight in dist.items()) / total / variance**1.5
+    kurtosis = sum((win - mean) ** 4 * weight for win, weight in dist.items()) / total / variance**2 - 3
+    distribution = WinDistribution.from_dict(dist)
+    assert distribution.get_average() == pytest.approx(mean)
+    assert distribution.get_moments() == pytest.approx((variance, variance**0.5, skewness, kurtosis))
+    assert distribution.calculate_rtp(2.0) == pytest.approx(mean / 2.0)
+
+
+def test_probabilities(dist):
+    total = sum(dist.values())
+    distribution = WinDistribution.from_dict(dist)
+    assert distribution.get_prob_no_win() == pytest.approx(dist[0.0] / total)
+    assert distribution.non_zero_hitrate() == pytest.approx(total / (total - dist[0.0]))
+    assert distribution.get_maxwin_hitrate() == pytest.approx(total / dist[max(dist)])
+    for bet_cost in (0, 1.0, 25.0, 1000.0):
+        expected = sum(weight for win, weight in dist.items() if win < bet_cost) / total
+        assert distribution.prob_less_than_bet(bet_cost) == pytest.approx(expected)
+
+
+def test_median_and_min_difference(dist):
+    cumulative, median = 0, None
+    for win, weight in dist.items():
+        cumulative += weight
+        if cumulative >= sum(dist.values()) / 2:
+            median = win
+            break
+    wins = list(dist)
+    distribution = WinDistribution.from_dict(dist)
+    assert distribution.get_median() == median
+    assert distribution.min_dist_difference() == round(min(b - a for a, b in zip(wins, wins[1:])) * 100)
+
+
+def test_unsorted_and_repeated_payouts():
+    distribution = WinDistribution([5.0, 0.0, 5.0, 1.0], [1, 2, 3, 4])
+    assert distribution.to_dict(normalize=False) == {0.0: 2.0, 1.0: 4.0, 5.0: 4.0}
+    assert sum(distribution.to_dict().values()) == pytest.approx(1.0)
+
+
+def test_lookup_distribution(tmp_path):
+    lookup_name = str(tmp_path / "lookUpTable_base.csv")
+    with open(lookup_name, "w", encoding="UTF-8") as f:
+        f.write("1,10,0\n2,30,250\n3,20,0\n4,40,250\n")
+    assert make_win_distribution(lookup_name, normalize=False) == {0.0: 30.0, 2.5: 70.0}
+    assert WinDistribution.from_lookup(lookup_name).get_median() == 2.5
+
+
+def test_range_hit_rates(dist):
+    win_ranges = [(0, 0.1), (0.1, 10), (10, 100), (5, 50), (400, 500)]
+    total = 2 * sum(dist.values())
+    hits, probs, rtps = return_hit_rates({"basegame": dist}, total, win_ranges, 2.0)
+    for low, high in win_ranges:
+        weight = sum(w for win, w in dist.items() if low <= win < high)
+        assert probs["basegame"][(low, high)] == pytest.approx(weight / total)
+        if weight > 0:
+            assert hits["basegame"][(low, high)] == round(total / weight, 3)
+            payout = sum(win * w for win, w in dist.items() if low <= win < high)
+            assert rtps["basegame"][(low, high)] == pytest.approx(payout / total / 2.0)
+        else:
+            assert hits["basegame"][(low, high)] == "NaN"
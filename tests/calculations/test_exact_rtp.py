@@ -0,0 +1,77 @@
+"""Test exact RTP by reel-stop enumeration against evaluating every board."""
+
+import itertools
+from collections import defaultdict
+
+import pytest
+from src.calculations.exact_rtp import get_exact_rtp, WIN_DECIMALS
+from src.calculations.lines import Lines
+from src.calculations.symbol import SymbolStorage
+from src.calculations.ways import Ways
+
+
+class GameEnumerationConfig:
+    """Testing game functions"""
+
+    def __init__(self):
+        self.num_reels = 4
+        self.num_rows = [3, 2, 3, 3]
+        self.paytable = {
+            (4, "W"): 20,
+            (3, "W"): 5,
+            (4, "H1"): 10,
+            (3, "H1"): 2,
+            (2, "H1"): 0.5,
+            (4, "L1"): 1.5,
+            (3, "L1"): 0.3,
+        }
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"]}
+        self.paylines = {1: [0, 0, 0, 0], 2: [1, 1, 1, 1], 3: [2, 1, 0, 1], 4: [0, 1, 2, 2]}
+        self.reels = {
+            "BR0": [
+                ["H1", "L1", "W", "S", "L1", "H1"],
+                ["L1", "H1", "W", "L1", "S"],
+                ["H1", "W", "L1", "L1", "S", "H1", "L1"],
+                ["W", "H1", "L1", "L1"],
+            ],
+            "FR0": [["W", "H1", "L1"], ["W", "L1", "W", "H1"], ["L1", "L1", "W"], ["H1", "W", "S", "L1", "W"]],
+        }
+
+
+def enumerate_wins(config: object, reelstrip_id: str, win_type: str) -> dict:
+    """Win distribution from evaluating the board at every combination of reel stops."""
+    symbol_storage = SymbolStorage(config, ["W", "H1", "L1", "S"])
+    reelstrip = config.reels[reelstrip_id]
+    distribution = defaultdict(int)
+    for stops in itertools.product(*[range(len(strip)) for strip in reelstrip]):
+        board = [
+            [
+                symbol_storage.create_symbol_state(strip[(stop + row) % len(strip)])
+                for row in range(config.num_rows[reel])
+            ]
+            for reel, (strip, stop) in enumerate(zip(reelstrip, stops))
+        ]
+        if win_type == "lines":
+            win = Lines.get_lines(board, config)["totalWin"]
+        else:
+            win = Ways.get_ways_data(config, board)["totalWin"]
+        distribution[round(win, WIN_DECIMALS)] += 1
+    return dict(sorted(distribution.items()))
+
+
+@pytest.mark.parametrize("win_type", ["lines", "ways"])
+def test_matches_board_enumeration(win_type):
+    config = GameEnumerationConfig()
+    results = get_exact_rtp(config, win_type)
+    for reelstrip_id, result in results.items():
+        expected = enumerate_wins(config, reelstrip_id, win_type)
+        combinations = sum(expected.values())
+        assert result["win_distribution"] == expected
+        assert result["combinations"] == combinations
+        assert result["rtp"] == pytest.approx(sum(win * count for win, count in expected.items()) / combinations)
+        assert result["hit_rate"] == pytest.approx(1 - expected.get(0, 0) / combinations)
+
+
+def test_unsupported_win_type():
+    with pytest.raises(ValueError):
+        get_exact_rtp(GameEnumerationConfig(), "cluster")
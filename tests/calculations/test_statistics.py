@@ -0,0 +1,53 @@
+"""Test sampling from weighted distributions."""
+
+import copy
+import pickle
+import random
+
+from src.calculations.statistics import get_random_outcome, WeightedDistribution
+from src.config.distributions import Distribution
+
+
+def draw(distribution: dict, num_draws: int, seed: int = 1, **kwargs) -> list:
+    random.seed(seed)
+    return [get_random_outcome(distribution, **kwargs) for _ in range(num_draws)]
+
+
+def test_cached_sampler_matches_linear_scan():
+    for weights in [{2: 100, 3: 50, 5: 0, 10: 0.5, 20: 1e-3}, {"BR0": 1}, {1: 0.1, 2: 0.2, 3: 0.3}]:
+        cached = WeightedDistribution(weights)
+        assert draw(cached, 2000) == draw(weights, 2000)
+        assert draw(cached, 200, totalWeight=0.5) == draw(weights, 200, totalWeight=0.5)
+
+
+def test_sampler_invalidated_on_change():
+    cached = WeightedDistribution({1: 10, 2: 10})
+    sampler = cached.get_sampler()
+    assert cached.get_sampler() is sampler
+
+    cached[3] = 1000
+    assert cached.get_sampler() is not sampler
+    assert draw(cached, 500) == draw({1: 10, 2: 10, 3: 1000}, 500)
+
+    cached.update({1: 0, 2: 0})
+    del cached[3]
+    cached.setdefault(4, 5)
+    assert set(draw(cached, 100)) == {4}
+
+    restored = pickle.loads(pickle.dumps(cached))
+    assert type(restored) is WeightedDistribution and restored == cached == copy.deepcopy(cached)
+    assert draw(restored, 100) == draw(cached, 100)
+
+
+def test_distribution_conditions_wrapped():
+    reel_weights = {"basegame": {"BR0": 1, "BR1": 3}, "freegame": {"FR0": 1}}
+    dist = Distribution(
+        criteria="basegame",
+        quota=1,
+        conditions={"reel_weights": reel_weights, "mult_values": {2: 10, 5: 1}, "scatter_triggers": {}},
+    )
+    conditions = dist._conditions
+    assert isinstance(conditions["reel_weights"]["basegame"], WeightedDistribution)
+    assert isinstance(conditions["mult_values"], WeightedDistribution)
+    assert conditions["reel_weights"]["basegame"] == {"BR0": 1, "BR1": 3}
+    assert conditions["force_freegame"] is False and conditions["scatter_triggers"] == {}
@@ -0,0 +1,65 @@
+"""Test symbol prototypes and board symbol states."""
+
+import pickle
+from copy import deepcopy
+from src.calculations.symbol import Symbol, SymbolStorage
+from src.events.events import json_ready_sym
+
+
+class GameSymbolConfig:
+    """Testing game functions"""
+
+    def __init__(self):
+        self.paytable = {(3, "H1"): 5, (4, "H1"): 10, (3, "W"): 20}
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"], "multiplier": ["W"]}
+
+
+def test_state_matches_symbol():
+    config = GameSymbolConfig()
+    storage = SymbolStorage(config, ["H1", "W", "S"])
+    for name in ["H1", "W", "S"]:
+        assert storage.create_symbol_state(name).get_attributes() == vars(Symbol(config, name))
+
+
+def test_assigned_attributes_stay_local():
+    storage = SymbolStorage(GameSymbolConfig(), ["H1", "W"])
+    first, second = storage.create_symbol_state("W"), storage.create_symbol_state("W")
+    first.assign_attribute({"multiplier": 3})
+    first.explode = True
+
+    assert first.get_attribute("multiplier") == 3 and first.check_attribute("explode")
+    assert second.get_attribute("multiplier") is True and not second.check_attribute("explode")
+    assert storage.get_symbol("W").multiplier is True
+
+
+def test_symbol_state_output():
+    storage = SymbolStorage(GameSymbolConfig(), ["H1", "W"])
+    symbol = storage.create_symbol_state("W")
+    symbol.assign_attribute({"multiplier": 3, "prize": 0})
+    special_attributes = ["wild", "scatter", "multiplier", "prize"]
+
+    assert json_ready_sym(symbol, special_attributes) == {"name": "W", "wild": True, "multiplier": 3}
+    for copied in [deepcopy(symbol), pickle.loads(pickle.dumps(symbol))]:
+        assert json_ready_sym(copied, special_attributes) == json_ready_sym(symbol, special_attributes)
+
+
+def test_attribute_flags():
+    storage = SymbolStorage(GameSymbolConfig(), ["H1", "W"])
+    symbol = storage.create_symbol_state("W")
+    assert symbol.check_attribute("scatter", "wild") and not symbol.check_attribute("scatter", "prize")
+
+    symbol.assign_attribute({"wild": False, "prize": 0})
+    assert not symbol.check_attribute("wild") and symbol.check_attribute("prize")
+    assert symbol.check_attribute("name") and not symbol.check_attribute("custom")
+    symbol.custom = True
+    assert symbol.check_attribute("custom")
+
+
+def test_symbol_state_has_no_instance_dict():
+    storage = SymbolStorage(GameSymbolConfig(), ["H1", "W"])
+    symbol = storage.create_symbol_state("W")
+    symbol.assign_attribute({"prize": 5, "custom": 1, "multiplier": 2})
+
+    assert not hasattr(symbol, "__dict__")
+    assert list(symbol.get_attributes())[-2:] == ["prize", "custom"]
+    assert [attribute for attribute, _ in symbol.get_assigned()] == ["prize", "custom", "multiplier"]
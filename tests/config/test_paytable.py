@@ -0,0 +1,47 @@
+"""Test compiled paytable lookups."""
+
+import numpy as np
+from src.config.paytable import get_paytable_arrays, get_symbol_ids, refresh_paytable_arrays
+
+
+class GamePaytableConfig:
+    """Testing game functions"""
+
+    def __init__(self):
+        self.paytable = {(3, "H1"): 5, (4, "H1"): 10.5, (5, "W"): 20, (12, "L1"): 1}
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"]}
+
+
+def test_compiled_lookups_match_paytable():
+    config = GamePaytableConfig()
+    arrays = get_paytable_arrays(config)
+    symbol_ids = get_symbol_ids(config)
+
+    assert arrays.max_kind == 12 and arrays.pay_array.shape == (len(symbol_ids), 13)
+    for kind in range(15):
+        for sym in ["H1", "W", "L1", "S", "X"]:
+            expected = config.paytable.get((kind, sym))
+            assert arrays.get_pay(kind, sym) == expected and type(arrays.get_pay(kind, sym)) is type(expected)
+            if sym in symbol_ids and kind <= arrays.max_kind:
+                assert arrays.pay_mask[symbol_ids[sym], kind] == ((kind, sym) in config.paytable)
+                assert arrays.pay_array[symbol_ids[sym], kind] == (expected or 0)
+
+    assert arrays.max_paying_kinds == {"H1": 4, "W": 5, "L1": 12}
+    assert arrays.max_paying_kind[symbol_ids["S"]] == 0
+    assert arrays.get_pay_array(5).shape == (len(symbol_ids), 6)
+    assert np.array_equal(arrays.get_pay_mask(14)[:, :13], arrays.pay_mask)
+
+
+def test_recompiled_after_paytable_change():
+    config = GamePaytableConfig()
+    arrays = get_paytable_arrays(config)
+    assert get_paytable_arrays(config) is arrays and refresh_paytable_arrays(config) is arrays
+
+    # In-place edits are only compared once per batch, not on every evaluation
+    config.paytable[(5, "H1")] = 25
+    assert get_paytable_arrays(config) is arrays
+    assert refresh_paytable_arrays(config).get_pay(5, "H1") == 25
+    config.paytable[(5, "H1")] = 30
+    assert refresh_paytable_arrays(config).get_pay(5, "H1") == 30
+    config.paytable = {(3, "L1"): 2}
+    assert get_paytable_arrays(config).get_pay(3, "H1") is None
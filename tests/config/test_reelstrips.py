@@ -0,0 +1,50 @@
+"""Test integer-encoded reelstrips."""
+
+import pytest
+from src.config.reelstrips import get_reelstrip_arrays, refresh_reelstrip_arrays
+
+
+class GameReelsConfig:
+    """Testing game functions"""
+
+    def __init__(self):
+        self.paytable = {(3, "H1"): 5, (3, "L1"): 1}
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"]}
+        self.num_rows = [3, 4, 2]
+        self.reels = {
+            "BR0": [["H1", "L1", "W", "S", "L1"], ["L1", "H1"], ["S"]],
+            "FR0": [["W", "W", "H1"], ["H1", "L1", "S", "W", "L1", "L1"], ["L1", "H1", "H1"]],
+        }
+
+
+def test_window_matches_modulo_indexing():
+    config = GameReelsConfig()
+    arrays = get_reelstrip_arrays(config)
+    for reelstrip_id, reelstrip in config.reels.items():
+        for reel, strip in enumerate(reelstrip):
+            for position in range(-len(strip), 2 * len(strip)):
+                expected = [strip[(position + row) % len(strip)] for row in range(-1, config.num_rows[reel] + 1)]
+                window = arrays.get_window(reelstrip_id, reel, position, config.num_rows[reel])
+                assert arrays.get_names(window) == expected
+                assert arrays.names[arrays.get_symbol_id(reelstrip_id, reel, position)] == strip[position % len(strip)]
+
+    with pytest.raises(ValueError):
+        arrays.get_window("BR0", 0, 0, max(config.num_rows) + 1)
+
+
+def test_recompiled_after_reels_change():
+    config = GameReelsConfig()
+    arrays = get_reelstrip_arrays(config)
+    assert get_reelstrip_arrays(config) is arrays and refresh_reelstrip_arrays(config) is arrays
+
+    # In-place edits are only compared once per batch, not on every draw
+    config.reels["BR0"][1][0] = "W"
+    assert get_reelstrip_arrays(config, "BR0") is arrays
+    arrays = refresh_reelstrip_arrays(config)
+    assert arrays.get_names(arrays.get_window("BR0", 1, 0, 1)) == ["H1", "W", "H1"]
+
+    config.reels["BR1"] = [["H1"], ["L1"], ["W"]]
+    arrays = get_reelstrip_arrays(config, "BR1")
+    assert arrays.get_names(arrays.get_window("BR1", 2, 7, 2)) == ["W"] * 4
+    config.reels = {"BR0": [["L1"], ["L1"], ["L1"]]}
+    assert get_reelstrip_arrays(config) is not arrays
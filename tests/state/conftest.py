@@ -0,0 +1,21 @@
+"""Shared fixtures for gamestate tests."""
+
+import os
+import sys
+import pytest
+from src.config.paths import PATH_TO_GAMES
+
+SAMPLE_GAME = "0_0_lines"
+
+
+@pytest.fixture(name="gamestate", scope="module")
+def fixture_gamestate():
+    game_path = os.path.join(PATH_TO_GAMES, SAMPLE_GAME)
+    sys.path.insert(0, game_path)
+    try:
+        from game_config import GameConfig  # pylint: disable=import-outside-toplevel
+        from gamestate import GameState  # pylint: disable=import-outside-toplevel
+
+        yield GameState(GameConfig())
+    finally:
+        sys.path.remove(game_path)
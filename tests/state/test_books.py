@@ -0,0 +1,37 @@
+"""Test books store events without copying and detect aliased events."""
+
+import pytest
+from src.state.books import Book
+
+
+def test_add_event_stores_reference():
+    book = Book(1, "0")
+    event = {"index": 0, "type": "reveal", "board": [[{"name": "L1"}]]}
+    book.add_event(event)
+    assert book.events[0] is event
+    assert book.to_json()["events"] == [event]
+
+
+def test_dry_book_discards_events():
+    book = Book(1, "0", record_events=False)
+    book.add_event({"index": 0, "type": "reveal"})
+    assert book.events == []
+
+
+def test_check_aliasing_detects_modified_event():
+    positions = [{"reel": 0, "row": 1}]
+    book = Book(1, "0", check_aliasing=True)
+    book.add_event({"index": 0, "type": "reveal"})
+    book.add_event({"index": 1, "type": "freeSpinTrigger", "positions": positions})
+    book.to_json()
+
+    positions[0]["row"] += 1
+    with pytest.raises(RuntimeError, match="event 1 \\('freeSpinTrigger'\\)"):
+        book.to_json()
+
+
+def test_check_aliasing_allows_appended_items():
+    book = Book(1, "0", check_aliasing=True)
+    book.add_event({"index": 0, "type": "setTotalWin", "amount": 0})
+    book.append_book_items(0, {"amount": 100})
+    assert book.to_json()["events"][0]["amount"] == 100
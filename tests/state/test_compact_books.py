@@ -0,0 +1,126 @@
+"""Test compact books are converted back to the exact JSON book format."""
+
+import json
+import os
+import pickle
+import pytest
+from src.state.books import Book
+from src.state.compact_books import BookEncoder, CompactBook, EventRecord, IdArray, IdGrid, get_book_json
+from src.state.run_sims import assign_sim_criteria, get_sim_splits
+from src.write_data.write_data import BookWriter
+
+NUM_SIMS = 40
+
+
+def make_book(book_id: int) -> Book:
+    book = Book(book_id, "basegame")
+    book.add_event(
+        {
+            "index": 0,
+            "type": "reveal",
+            "board": [[{"name": "L1"}, {"name": "W", "multiplier": 2}], [], [{"name": "H1"}]],
+            "paddingPositions": [3, 7, 11],
+            "anticipation": [0, 0, 1],
+        }
+    )
+    book.add_event(
+        {
+            "index": 1,
+            "type": "winInfo",
+            "totalWin": 150,
+            "wins": [
+                {
+                    "symbol": "L1",
+                    "win": 150,
+                    "positions": [{"reel": 0, "row": 1}, {"reel": 1, "row": 1}],
+                    "meta": {"lineIndex": 4, "multiplier": 1.0, "overlay": {"reel": 1, "row": 1}},
+                }
+            ],
+        }
+    )
+    book.add_event({"index": 2, "type": "flags", "values": [{"a": True}, {"a": 1}, {"a": 1.0}, {"a": -0.0}]})
+    book.payout_multiplier = 1.5
+    book.basegame_wins = 1.5
+    return book
+
+
+def test_compact_book_matches_json():
+    encoder = BookEncoder()
+    book = make_book(1)
+    compact_book = encoder.encode_book(book)
+    assert isinstance(compact_book, CompactBook)
+    assert json.dumps(compact_book.to_json()) == json.dumps(book.to_json())
+    assert isinstance(compact_book.events[0], EventRecord)
+    assert compact_book.events[0][0] == ("reveal", tuple(book.events[0]))
+    assert isinstance(compact_book.events[0][2], IdGrid)
+    assert isinstance(compact_book.events[1][3][0][3], IdArray)
+
+
+def test_interned_symbols_are_shared():
+    encoder = BookEncoder()
+    first, second = encoder.encode_book(make_book(1)), encoder.encode_book(make_book(2))
+    assert first.events[0][0] is second.events[0][0]
+    num_interned = len(encoder.dict_items)
+    encoder.encode_book(make_book(3))
+    assert len(encoder.dict_items) == num_interned
+
+
+def test_decoded_book_is_independent():
+    encoder = BookEncoder()
+    compact_book = encoder.encode_book(make_book(1))
+    decoded = compact_book.to_json()
+    decoded["events"][0]["board"][0][0]["name"] = "H1"
+    assert compact_book.to_json()["events"][0]["board"][0][0]["name"] == "L1"
+
+
+def test_book_writer_accepts_compact_books(tmp_path):
+    encoder = BookEncoder()
+    books = [make_book(book_id) for book_id in range(1, 4)]
+    for name, items in (("dict", [book.to_json() for book in books]), ("compact", map(encoder.encode_book, books))):
+        writer = BookWriter(
+            str(tmp_path / f"books_{name}.jsonl"),
+            str(tmp_path / f"lookup_{name}.csv"),
+            str(tmp_path / f"segmented_{name}.csv"),
+        )
+        for item in items:
+            writer.write_book(item)
+        writer.close()
+    for prefix in ("books_", "lookup_", "segmented_"):
+        suffix = ".jsonl" if prefix == "books_" else ".csv"
+        assert (tmp_path / f"{prefix}dict{suffix}").read_text() == (tmp_path / f"{prefix}compact{suffix}").read_text()
+    assert get_book_json(books[0].to_json()) == books[0].to_json()
+
+
+def test_run_sims_writes_compact_books(gamestate, tmp_path):
+    sim_to_criteria = assign_sim_criteria(get_sim_splits(gamestate, NUM_SIMS, "base"), NUM_SIMS)
+    written = {}
+    for compact_books in (False, True):
+        worker = pickle.loads(pickle.dumps(gamestate))
+        worker.config.compact_books = compact_books
+        worker.output_files.temp_path = str(tmp_path / str(compact_books))
+        os.makedirs(worker.output_files.temp_path)
+        worker.run_sims([], "base", sim_to_criteria, 1, 1, NUM_SIMS, 0, 0, False, False)
+        assert len(worker.book_encoder.event_schemas) > 0 if compact_books else not worker.book_encoder.event_schemas
+        book_name = worker.output_files.get_temp_multi_thread_name("base", 0, 0, False)
+        with open(book_name, "r", encoding="UTF-8") as f:
+            if worker.config.output_regular_json:
+                written[compact_books] = json.load(f)
+            else:
+                written[compact_books] = [json.loads(line) for line in f]
+
+    assert len(written[True]) == NUM_SIMS
+    assert written[True] == written[False]
+
+
+def test_compact_books_check_event_aliasing(gamestate):
+    worker = pickle.loads(pickle.dumps(gamestate))
+    worker.config.compact_books = True
+    worker.config.check_event_aliasing = True
+    worker.criteria, worker.sim = "basegame", 0
+    worker.reset_book()
+    positions = [{"reel": 0, "row": 1}]
+    worker.book.add_event({"index": 0, "type": "freeSpinTrigger", "positions": positions})
+
+    positions[0]["row"] += 1
+    with pytest.raises(RuntimeError, match="event 0 \\('freeSpinTrigger'\\)"):
+        worker.imprint_wins()
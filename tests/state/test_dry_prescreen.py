@@ -0,0 +1,73 @@
+"""Test pre-screening repeated attempts without events."""
+
+import random
+from src.state.force_records import ForceRecords
+from src.state.retry_stats import RetryStats
+from src.state.state import GeneralGameState
+from src.wins.win_manager import WinManager
+
+
+class PrescreenConfig:
+    """Testing game functions"""
+
+    def __init__(self, dry_prescreen: bool):
+        self.dry_prescreen = dry_prescreen
+        self.check_event_aliasing = False
+        self.compact_books = False
+        self.num_reels = 1
+        self.num_rows = [1]
+        self.basegame_type = "basegame"
+        self.freegame_type = "freegame"
+
+
+class PrescreenGameState(GeneralGameState):
+    """Accepts attempts drawing a value above 0.8, recording one event per attempt."""
+
+    def __init__(self, config):
+        self.config = config
+        self.win_manager = WinManager(config.basegame_type, config.freegame_type)
+        self.library, self.recorded_events, self.temp_wins = {}, ForceRecords(), []
+        self.book_writer = None
+        self.retry_stats = RetryStats()
+        self.sim_attempts = 0
+        self.dry_prescreen, self.dry_run = False, False
+        self.attempt_rng_state, self.replay_rng_state = None, None
+        self.criteria = "high"
+        self.sim = 0
+
+    def assign_special_sym_function(self):
+        pass
+
+    def run_spin(self, sim):
+        self.reset_seed(sim)
+        self.repeat = True
+        while self.repeat:
+            self.reset_book()
+            value = random.random()
+            self.book.add_event({"value": value, "attempt": self.sim_attempts})
+            self.repeat = value < 0.8
+        self.imprint_wins()
+
+    def run_freespin(self):
+        pass
+
+
+def run_all(dry_prescreen: bool, num_sims: int = 200) -> PrescreenGameState:
+    gamestate = PrescreenGameState(PrescreenConfig(dry_prescreen))
+    for sim in range(num_sims):
+        gamestate.sim_attempts = 0
+        gamestate.run_simulation(sim)
+        gamestate.retry_stats.record(gamestate.criteria, gamestate.sim_attempts, 0.0)
+    return gamestate
+
+
+def test_prescreen_matches_full_evaluation():
+    full, prescreened = run_all(False), run_all(True)
+    assert full.retry_stats.criteria == prescreened.retry_stats.criteria
+    assert full.retry_stats.mean_attempts("high") > 2
+    for sim, book in full.library.items():
+        prescreened_book = prescreened.library[sim]
+        assert [event["value"] for event in book["events"]] == [event["value"] for event in prescreened_book["events"]]
+    # Replayed books only hold the events of the accepted attempt
+    assert all(len(book["events"]) == 1 for book in prescreened.library.values())
+    assert not prescreened.dry_run and prescreened.replay_rng_state is None
@@ -0,0 +1,91 @@
+"""Test book ids recorded against force descriptions."""
+
+import json
+import pytest
+from src.state.force_records import ForceRecords, write_force_record_file, merge_force_record_files
+from src.write_data.write_data import write_force_record_json
+
+SCATTER = (("kind", "3"), ("symbol", "scatter"))
+WILD = (("kind", "5"), ("symbol", "W"))
+
+
+def test_add_counts_each_book_once():
+    records = ForceRecords()
+    for book_id in (1, 1, 2, 5, 5, 5):
+        records.add(SCATTER, book_id)
+    assert SCATTER in records and WILD not in records
+    assert records.times_triggered(SCATTER) == 3
+    assert records.to_dict() == {SCATTER: {"timesTriggered": 3, "bookIds": [1, 2, 5]}}
+
+
+def test_out_of_order_ids_stay_sorted():
+    records = ForceRecords()
+    for book_id in (10, 4, 7, 4, 10, 1):
+        records.add(SCATTER, book_id)
+    assert records.to_dict()[SCATTER]["bookIds"] == [1, 4, 7, 10]
+
+
+def write_shards(tmp_path) -> list:
+    shards = [ForceRecords() for _ in range(3)]
+    shards[0].add(SCATTER, 1)
+    shards[0].add(SCATTER, 3)
+    shards[1].add(WILD, 12)
+    shards[1].add(SCATTER, 11)
+    shards[2].add(SCATTER, 3)
+    shards[2].add(SCATTER, 8)
+    names = []
+    for idx, shard in enumerate(shards):
+        names.append(str(tmp_path / f"force_{idx}.bin"))
+        write_force_record_file(shard, names[-1])
+    return names
+
+
+def test_merge_files_is_union_in_shard_order(tmp_path):
+    merged = {description: ids.tolist() for description, ids in merge_force_record_files(write_shards(tmp_path))}
+    assert list(merged) == [SCATTER, WILD]
+    assert merged == {SCATTER: [1, 3, 8, 11], WILD: [12]}
+
+
+def test_merge_more_files_than_open_file_limit(tmp_path):
+    resource = pytest.importorskip("resource")
+    num_files, open_file_limit = 600, 256
+    expected = ForceRecords()
+    names = []
+    for idx in range(num_files):
+        shard = ForceRecords()
+        for book_id in (2 * idx + 1, 2 * idx + 2):
+            shard.add(SCATTER, book_id)
+            expected.add(SCATTER, book_id)
+        if idx % 7 == 0:
+            shard.add(WILD, 2 * idx + 2)
+            expected.add(WILD, 2 * idx + 2)
+        names.append(str(tmp_path / f"force_{idx}.bin"))
+        write_force_record_file(shard, names[-1])
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(open_file_limit, hard), hard))
+    try:
+        merged = {description: ids.tolist() for description, ids in merge_force_record_files(names)}
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    assert merged == {description: entry["bookIds"] for description, entry in expected.to_dict().items()}
+
+
+def test_force_record_json_format(tmp_path):
+    name = str(tmp_path / "force_record_base.json")
+    descriptions = write_force_record_json(merge_force_record_files(write_shards(tmp_path)), name)
+    expected = [
+        {
+            "search": [{"name": key, "value": value} for key, value in SCATTER],
+            "timesTriggered": 4,
+            "bookIds": [1, 3, 8, 11],
+        },
+        {"search": [{"name": key, "value": value} for key, value in WILD], "timesTriggered": 1, "bookIds": [12]},
+    ]
+    with open(name, "r", encoding="UTF-8") as f:
+        assert f.read() == json.dumps(expected, indent=4)
+    assert descriptions == [SCATTER, WILD]
+
+    write_force_record_json(iter([]), name)
+    with open(name, "r", encoding="UTF-8") as f:
+        assert f.read() == json.dumps([], indent=4)
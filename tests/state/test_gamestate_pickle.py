@@ -0,0 +1,80 @@
+"""Test that a sample game's gamestate can be sent to spawned worker processes."""
+
+import multiprocessing
+import os
+import pickle
+from src.state.run_sims import SimulationPool, assign_sim_criteria, get_sim_chunks, get_sim_splits
+
+NUM_SIMS = 20
+
+
+def sample_payouts(gamestate: object, sim_to_criteria: dict) -> list:
+    books = gamestate.sample_books("base", sim_to_criteria, (0, NUM_SIMS))
+    return [(book["id"], book["payoutMultiplier"], len(book["events"])) for book in books]
+
+
+def spawned_sample(gamestate: object, sim_to_criteria: dict, result_queue: multiprocessing.Queue) -> None:
+    result_queue.put(sample_payouts(gamestate, sim_to_criteria))
+
+
+def test_gamestate_pickle_round_trip(gamestate):
+    restored = pickle.loads(pickle.dumps(gamestate))
+    assert set(restored.symbol_storage.symbol_states) == set(gamestate.symbol_storage.symbols)
+    for name in gamestate.symbol_storage.symbols:
+        symbol = restored.symbol_storage.create_symbol_state(name)
+        assert symbol.get_attributes() == gamestate.symbol_storage.create_symbol_state(name).get_attributes()
+
+    sim_to_criteria = assign_sim_criteria(get_sim_splits(gamestate, NUM_SIMS, "base"), NUM_SIMS)
+    initial_state = gamestate.snapshot_state()
+    try:
+        assert sample_payouts(restored, sim_to_criteria) == sample_payouts(gamestate, sim_to_criteria)
+    finally:
+        gamestate.restore_state(initial_state)
+
+
+def test_spawned_worker(gamestate):
+    sim_to_criteria = assign_sim_criteria(get_sim_splits(gamestate, NUM_SIMS, "base"), NUM_SIMS)
+    context = multiprocessing.get_context("spawn")
+    result_queue = context.Queue()
+    process = context.Process(target=spawned_sample, args=(gamestate, sim_to_criteria, result_queue))
+    process.start()
+    spawned = result_queue.get(timeout=120)
+    process.join()
+    assert process.exitcode == 0
+
+    initial_state = gamestate.snapshot_state()
+    try:
+        assert spawned == sample_payouts(gamestate, sim_to_criteria)
+    finally:
+        gamestate.restore_state(initial_state)
+
+
+def test_simulation_pool_spawn(gamestate, tmp_path):
+    sim_to_criteria = assign_sim_criteria(get_sim_splits(gamestate, NUM_SIMS, "base"), NUM_SIMS)
+    sim_chunks = get_sim_chunks(NUM_SIMS, 2, NUM_SIMS // 2)
+    run_args = {"threads": 2, "num_repeats": 1, "compress": False, "write_event_list": False}
+    pooled, single = pickle.loads(pickle.dumps(gamestate)), pickle.loads(pickle.dumps(gamestate))
+    pooled.output_files.temp_path = str(tmp_path / "pool")
+    single.output_files.temp_path = str(tmp_path / "single")
+    for path in (pooled.output_files.temp_path, single.output_files.temp_path):
+        os.makedirs(path)
+
+    pool = SimulationPool(pooled, 2, context=multiprocessing.get_context("spawn"))
+    try:
+        for chunk_index, repeat, start, end in sim_chunks:
+            pool.submit("base", (start, end), repeat, chunk_index, sim_to_criteria, run_args)
+        betmode_copies, _ = pool.collect(len(sim_chunks))
+    finally:
+        pool.close()
+    assert len(betmode_copies) == len(sim_chunks)
+
+    initial_state = single.snapshot_state()
+    for chunk_index, repeat, start, end in sim_chunks:
+        single.restore_state(initial_state)
+        single.run_sims(
+            [], "base", sim_to_criteria, 2, 1, end - start, chunk_index, repeat, False, False, sim_range=(start, end)
+        )
+    assert len(os.listdir(tmp_path / "single")) > 0
+    assert sorted(os.listdir(tmp_path / "pool")) == sorted(os.listdir(tmp_path / "single"))
+    for name in os.listdir(tmp_path / "single"):
+        assert (tmp_path / "pool" / name).read_bytes() == (tmp_path / "single" / name).read_bytes(), name
@@ -0,0 +1,50 @@
+"""Test per-criteria retry statistics."""
+
+import pickle
+import warnings
+import pytest
+from src.state.retry_stats import RetryStats, RETRY_BUDGET_MIN_SIMS, merge_retry_stats
+from src.state.run_sims import run_multi_process_sims
+
+
+def test_record_and_merge():
+    worker_0, worker_1 = RetryStats(), RetryStats()
+    for attempts in [1, 3, 2]:
+        worker_0.record("wincap", attempts, 0.5)
+    worker_0.record("0", 1, 0.1)
+    worker_1.record("wincap", 10, 2.0)
+
+    total = merge_retry_stats({0: [worker_0], 1: [worker_1]})
+    assert total.criteria["wincap"] == {"sims": 4, "attempts": 16, "max_attempts": 10, "seconds": 3.5}
+    assert total.mean_attempts("wincap") == 4 and total.mean_attempts("0") == 1
+    assert worker_0.criteria["wincap"]["sims"] == 3
+
+
+def test_retry_budget_warning():
+    stats = RetryStats(retry_budget=5)
+    with pytest.warns(UserWarning, match="wincap"):
+        for _ in range(RETRY_BUDGET_MIN_SIMS):
+            stats.record("wincap", 8, 0.0)
+            stats.record("basegame", 1, 0.0)
+    assert stats.warned == {"wincap"}
+    assert stats.over_budget("wincap") and not stats.over_budget("basegame")
+
+
+def test_retry_stats_across_chunks(gamestate, tmp_path):
+    """Chunks of a mode share the worker's statistics, so the budget warning fires once in total."""
+    num_sims, chunk_size = 200, 10
+    worker = pickle.loads(pickle.dumps(gamestate))
+    worker.output_files.temp_path = worker.output_files.publish_path = str(tmp_path)
+    worker.config.retry_budget = 2
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        run_multi_process_sims(
+            1, num_sims, "test", "base", worker, num_sims=num_sims, compress=False, chunk_size=chunk_size
+        )
+    budget_warnings = [str(warning.message) for warning in caught if "retry budget" in str(warning.message)]
+
+    total = worker.betmode_retry_stats["base"]
+    # No single chunk runs enough simulations of a criteria to be compared with the budget
+    assert chunk_size < RETRY_BUDGET_MIN_SIMS <= total.criteria["basegame"]["sims"]
+    assert sum(stats["sims"] for stats in total.criteria.values()) == num_sims
+    assert len(budget_warnings) == 1 and "'basegame'" in budget_warnings[0]
@@ -1,8 +1,10 @@
 """Test basic cluster-calculation functionality."""
 
+import random
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
 from src.calculations.cluster import Cluster
+from utils.cluster_benchmark import get_clusters_recursive, make_random_board
 
 
 class GameClusterConfig:
@@ -99,3 +101,25 @@ def test_basic_cluster(gamestate):
         clusters=clusters,
     )
     assert total_win == gamestate.config.paytable[(9, "H1")]
+
+
+def test_clusters_match_recursive_search():
+    """Iterative search returns the same clusters, in the same position order, as the recursive reference."""
+    random.seed(42)
+    for num_reels, num_rows in [(5, 5), (7, 7), (6, 4)]:
+        for _ in range(200):
+            board = make_random_board(num_reels, num_rows, symbols=("H1", "H2", "L1"), wild_prob=0.15)
+            assert Cluster.get_clusters(board) == get_clusters_recursive(board)
+
+
+def test_wilds_shared_between_clusters(gamestate):
+    for idx, _ in enumerate(gamestate.board):
+        for idy, _ in enumerate(gamestate.board[idx]):
+            gamestate.board[idx][idy] = gamestate.create_symbol("X")
+    gamestate.board[0][0] = gamestate.create_symbol("H1")
+    gamestate.board[0][1] = gamestate.create_symbol("WM")
+    gamestate.board[0][2] = gamestate.create_symbol("H2")
+
+    clusters = Cluster.get_clusters(gamestate.board)
+    assert clusters["H1"] == [[(0, 0), (0, 1)]]
+    assert clusters["H2"] == [[(0, 2), (0, 1)]]
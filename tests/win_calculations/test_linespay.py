@@ -1,8 +1,12 @@
 """Test basic lines-calculation functionality."""
 
+import random
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
 from src.calculations.lines import Lines
+from src.calculations.board_arrays import encode_boards
+from src.config.paytable import get_symbol_ids
+from src.wins.multiplier_strategy import MULTIPLIER_STRATEGIES, register_multiplier_strategy
 
 
 class GameLinesConfig:
@@ -122,3 +126,56 @@ def test_linespay_mult(gamestate):
 
     windata = Lines.get_lines(gamestate.board, gamestate.config)
     assert windata["totalWin"] == (gamestate.config.paytable[(5, "WM")] * sum([3, 3, 3, 3, 3]))
+
+
+def test_lines_batch_matches_get_lines(gamestate):
+    """Batch evaluation of encoded boards returns the same win data as get_lines()."""
+    random.seed(7)
+    symbol_ids = get_symbol_ids(gamestate.config)
+    names = ["W", "WM", "H1", "X", "S"]
+    boards = []
+    for _ in range(300):
+        boards.append(
+            [
+                [gamestate.create_symbol(random.choice(names)) for _ in range(gamestate.config.num_rows[reel])]
+                for reel in range(gamestate.config.num_reels)
+            ]
+        )
+    board_ids, board_mults = encode_boards(boards, symbol_ids)
+
+    for multiplier_method in ["symbol", "global", "combined"]:
+        batch_data = Lines.get_lines_batch(
+            board_ids,
+            gamestate.config,
+            symbol_ids,
+            board_mults,
+            multiplier_method=multiplier_method,
+            global_multiplier=2,
+        )
+        for board, return_data in zip(boards, batch_data):
+            assert return_data == Lines.get_lines(
+                board, gamestate.config, multiplier_method=multiplier_method, global_multiplier=2
+            )
+    assert sum(len(return_data["wins"]) for return_data in batch_data) > 0
+
+
+def test_lines_batch_rejects_custom_strategy(gamestate):
+    """Strategies registered by a game need Symbol objects and are not silently evaluated in batch mode."""
+    symbol_ids = get_symbol_ids(gamestate.config)
+    board = [
+        [gamestate.create_symbol("WM") for _ in range(gamestate.config.num_rows[reel])]
+        for reel in range(gamestate.config.num_reels)
+    ]
+    board_ids, board_mults = encode_boards([board], symbol_ids)
+    builtin_symbol = MULTIPLIER_STRATEGIES["symbol"]
+    register_multiplier_strategy("max_symbol", builtin_symbol)
+    register_multiplier_strategy("symbol", lambda *args: builtin_symbol(*args))
+    try:
+        for multiplier_method in ["max_symbol", "symbol", "unknown"]:
+            with pytest.raises(ValueError, match="not supported in batch mode"):
+                Lines.get_lines_batch(
+                    board_ids, gamestate.config, symbol_ids, board_mults, multiplier_method=multiplier_method
+                )
+    finally:
+        MULTIPLIER_STRATEGIES.pop("max_symbol")
+        register_multiplier_strategy("symbol", builtin_symbol)
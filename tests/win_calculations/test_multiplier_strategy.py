@@ -0,0 +1,52 @@
+"""Test multiplier strategy dispatch."""
+
+import pytest
+from src.wins.multiplier_strategy import apply_mult, register_multiplier_strategy, MULTIPLIER_STRATEGIES
+
+
+class MultSymbol:
+    """Board position with an optional multiplier attribute."""
+
+    def __init__(self, multiplier: int = None):
+        self.multiplier = multiplier
+
+    def check_attribute(self, attribute: str) -> bool:
+        return getattr(self, attribute, None) is not None
+
+    def get_attribute(self, attribute: str) -> int:
+        return getattr(self, attribute)
+
+
+@pytest.fixture
+def board():
+    return [[MultSymbol(2), MultSymbol()], [MultSymbol(3), MultSymbol(5)]]
+
+
+def test_builtin_strategies(board):
+    positions = [{"reel": 0, "row": 0}, {"reel": 1, "row": 0}]
+    assert apply_mult(board, "global", win_amount=1.5, global_multiplier=2, positions=positions) == (3.0, 2)
+    assert apply_mult(board, "symbol", win_amount=1.5, global_multiplier=2, positions=positions) == (7.5, 5)
+    assert apply_mult(board, "combined", win_amount=1.5, global_multiplier=2, positions=positions) == (15.0, 10)
+
+
+def test_only_selected_strategy_runs():
+    # Positions are never read by the global strategy, so no board is required
+    assert apply_mult(None, "global", win_amount=2, global_multiplier=3, positions=[{"reel": 0, "row": 0}]) == (6, 3)
+
+
+def test_register_custom_strategy(board):
+    def max_symbol_mult(board, win_amount, global_multiplier, positions, multiplier_key):
+        mult = max(board[p["reel"]][p["row"]].get_attribute(multiplier_key) or 1 for p in positions)
+        return (win_amount * mult * global_multiplier, mult * global_multiplier)
+
+    register_multiplier_strategy("max_symbol", max_symbol_mult)
+    try:
+        positions = [{"reel": 0, "row": 0}, {"reel": 1, "row": 1}]
+        assert apply_mult(board, "max_symbol", win_amount=1, global_multiplier=2, positions=positions) == (10, 10)
+    finally:
+        MULTIPLIER_STRATEGIES.pop("max_symbol")
+
+
+def test_unknown_strategy(board):
+    with pytest.raises(KeyError):
+        apply_mult(board, "unknown", win_amount=1)
@@ -1,8 +1,11 @@
 """Test basic ways-calculation functionality."""
 
+import random
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
 from src.calculations.ways import Ways
+from src.calculations.board_arrays import encode_boards
+from src.config.paytable import get_symbol_ids
 
 
 class GameWaysConfig:
@@ -75,3 +78,26 @@ def test_mixed_ways(gamestate):
     assert windata["wins"][0]["meta"]["ways"] == sym2Ways
     assert windata["wins"][1]["meta"]["ways"] == sym1Ways
     assert windata["totalWin"] == windata["wins"][0]["win"] + windata["wins"][1]["win"]
+
+
+def test_ways_batch_matches_get_ways_data(gamestate):
+    """Batch evaluation of encoded boards returns the same win data as get_ways_data()."""
+    random.seed(11)
+    symbol_ids = get_symbol_ids(gamestate.config)
+    boards = []
+    for _ in range(300):
+        board = []
+        for reel in range(gamestate.config.num_reels):
+            board.append([])
+            for _ in range(gamestate.config.num_rows[reel]):
+                sym = gamestate.create_symbol(random.choice(["W", "H1", "H1", "H2", "H2", "X", "S"]))
+                if sym.name == "W" and random.random() < 0.5:
+                    sym.assign_attribute({"multiplier": random.choice([2, 3])})
+                board[reel].append(sym)
+        boards.append(board)
+    board_ids, board_mults = encode_boards(boards, symbol_ids)
+
+    batch_data = Ways.get_ways_data_batch(board_ids, gamestate.config, symbol_ids, board_mults)
+    for board, return_data in zip(boards, batch_data):
+        assert return_data == Ways.get_ways_data(gamestate.config, board)
+    assert sum(len(return_data["wins"]) for return_data in batch_data) > 0
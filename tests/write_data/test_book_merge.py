@@ -0,0 +1,69 @@
+"""Test merging of compressed book files."""
+
+import pytest
+from src.write_data.write_data import (
+    BookWriter,
+    concatenate_zstd_files,
+    recompress_zstd_files,
+    get_book_compressor,
+    train_book_dictionary,
+    write_book_dictionary,
+)
+from utils.rgs_verification import verify_books_and_payout_mults
+
+
+def make_book(book_id: int) -> dict:
+    return {
+        "id": book_id,
+        "payoutMultiplier": 10 * book_id,
+        "events": [{"index": 0, "type": "reveal", "board": [[{"name": f"L{book_id % 5}"}]]}],
+        "criteria": "basegame",
+        "baseGameWins": 0.1 * book_id,
+        "freeGameWins": 0.0,
+    }
+
+
+def write_shards(tmp_path, num_shards: int = 3, books_per_shard: int = 4, **writer_args) -> list:
+    """Write compressed temporary book files with known payouts."""
+    shards = []
+    for shard in range(num_shards):
+        book_name = str(tmp_path / f"books_{shard}.jsonl.zst")
+        writer = BookWriter(book_name, str(tmp_path / f"lut_{shard}"), str(tmp_path / f"split_{shard}"), **writer_args)
+        for idx in range(books_per_shard):
+            writer.write_book(make_book(shard * books_per_shard + idx + 1))
+        writer.close()
+        shards.append(book_name)
+    return shards
+
+
+@pytest.mark.parametrize("merge_function", [concatenate_zstd_files, recompress_zstd_files])
+def test_merged_books_verify(tmp_path, merge_function):
+    shards = write_shards(tmp_path)
+    out_name = str(tmp_path / "books_base.jsonl.zst")
+    merge_function(shards, out_name)
+
+    payouts, num_events = verify_books_and_payout_mults(out_name)
+    assert payouts == [10 * book_id for book_id in range(1, 13)]
+    assert num_events == 12
+
+
+def test_book_writer_rows(tmp_path):
+    write_shards(tmp_path, num_shards=1, books_per_shard=2)
+    with open(tmp_path / "lut_0", "r", encoding="UTF-8") as f:
+        assert f.read() == "1,1,10\n2,1,20\n"
+    with open(tmp_path / "split_0", "r", encoding="UTF-8") as f:
+        assert f.read() == "1,basegame,0.1,0.0\n2,basegame,0.2,0.0\n"
+
+
+def test_dictionary_books_verify(tmp_path):
+    dictionary = train_book_dictionary([make_book(book_id) for book_id in range(1, 501)], dict_size=2**12)
+    assert dictionary is not None
+    dictionary_name = str(tmp_path / "books_base.dict")
+    write_book_dictionary(dictionary, dictionary_name)
+
+    shards = write_shards(tmp_path, compressor=get_book_compressor(dictionary=dictionary), frame_per_book=True)
+    out_name = str(tmp_path / "books_base.jsonl.zst")
+    concatenate_zstd_files(shards, out_name)
+
+    payouts, _ = verify_books_and_payout_mults(out_name, dictionary_name)
+    assert payouts == [10 * book_id for book_id in range(1, 13)]
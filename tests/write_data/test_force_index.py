@@ -0,0 +1,98 @@
+"""Test force-key and payout queries against a brute-force scan of the force records."""
+
+import json
+import os
+import random
+import numpy as np
+import pytest
+from src.write_data.force_index import INDEX_ALIGNMENT, ForceIndex, Match, Payout, And, Or, build_force_index
+
+NUM_BOOKS = 500
+
+
+@pytest.fixture(name="index_files")
+def fixture_index_files(tmp_path):
+    random.seed(7)
+    descriptions = [
+        {"gametype": gametype, "kind": str(kind), "symbol": symbol}
+        for gametype in ("basegame", "freegame")
+        for kind in (3, 4, 5)
+        for symbol in ("scatter", "H1")
+    ]
+    force_records = []
+    for description in descriptions:
+        book_ids = sorted(random.sample(range(1, NUM_BOOKS + 1), random.randint(0, 60)))
+        force_records.append(
+            {
+                "search": [{"name": key, "value": value} for key, value in description.items()],
+                "timesTriggered": len(book_ids),
+                "bookIds": book_ids,
+            }
+        )
+    payouts = {book_id: random.choice([0, 0, 20, 150, 1000, 50000]) for book_id in range(1, NUM_BOOKS + 1)}
+    force_name, lookup_name, index_name = (str(tmp_path / name) for name in ("force.json", "lut.csv", "index.bin"))
+    with open(force_name, "w", encoding="UTF-8") as f:
+        f.write(json.dumps(force_records, indent=4))
+    with open(lookup_name, "w", encoding="UTF-8") as f:
+        for book_id, payout in payouts.items():
+            f.write(f"{book_id},1,{payout}\n")
+    build_force_index(force_name, lookup_name, index_name)
+    return force_records, payouts, ForceIndex(index_name)
+
+
+def test_index_stores_sorted_ids(index_files, tmp_path):
+    force_records, payouts, index = index_files
+    for entry_index, entry in enumerate(force_records):
+        assert index.get_entry_ids(entry_index).tolist() == entry["bookIds"]
+    assert index.all_books.tolist() == sorted(payouts)
+
+    # 4 bytes per recorded id and lookup table book, 8 per payout and entry offset, besides the header and padding
+    index_name = str(tmp_path / "index.bin")
+    with open(index_name, "rb") as f:
+        header_length = int.from_bytes(f.read(8), "little")
+    num_ids = sum(len(entry["bookIds"]) for entry in force_records)
+    data_bytes = 4 * (num_ids + len(payouts)) + 8 * (len(payouts) + len(force_records) + 1)
+    assert os.path.getsize(index_name) <= 8 + header_length + data_bytes + 4 * INDEX_ALIGNMENT
+
+
+def scan(force_records: list, search_keys: dict) -> set:
+    """Books with a force record entry containing all search keys, as ForceTool used to search."""
+    ids = set()
+    for entry in force_records:
+        search = {item["name"]: item["value"] for item in entry["search"]}
+        if all(search.get(key) == value for key, value in search_keys.items()):
+            ids.update(entry["bookIds"])
+    return ids
+
+
+def test_match_is_partial_key_match(index_files):
+    force_records, _, index = index_files
+    for search_keys in ({"kind": "3"}, {"symbol": "H1", "gametype": "freegame"}, {"kind": "5", "symbol": "scatter"}):
+        assert set(index.query(Match(search_keys)).tolist()) == scan(force_records, search_keys)
+    expected = sorted(scan(force_records, {"kind": "3", "symbol": "H1"}))
+    assert index.query(Match(kind=3, symbol="H1")).tolist() == expected
+    assert len(index.query(Match(kind="9"))) == 0
+
+
+def test_boolean_queries(index_files):
+    force_records, payouts, index = index_files
+    scatter, freegame, four_kind = (
+        scan(force_records, keys) for keys in ({"symbol": "scatter"}, {"gametype": "freegame"}, {"kind": "4"})
+    )
+    all_books = set(payouts)
+    query = (Match(symbol="scatter") & ~Match(gametype="freegame")) | Match(kind="4")
+    assert set(index.query(query).tolist()) == ((scatter & (all_books - freegame)) | four_kind)
+    assert index.count(And(Match(symbol="scatter"), Match(kind="4"))) == len(scatter & four_kind)
+    assert set(index.query(Or(Match(symbol="H1"), ~Match(symbol="H1"))).tolist()) == all_books
+
+
+def test_payout_ranges(index_files):
+    force_records, payouts, index = index_files
+    in_range = {book_id for book_id, payout in payouts.items() if 150 <= payout < 50000}
+    assert set(index.query(Payout(150, 50000)).tolist()) == in_range
+    winning = {book_id for book_id, payout in payouts.items() if payout > 0}
+    assert set(index.query(Payout(min_payout=1)).tolist()) == winning
+    query = Match(symbol="scatter") & Payout(max_payout=20)
+    expected = {book_id for book_id in scan(force_records, {"symbol": "scatter"}) if payouts[book_id] < 20}
+    assert set(index.query(query).tolist()) == expected
+    assert isinstance(index.query(query), np.ndarray)
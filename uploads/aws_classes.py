@@ -7,6 +7,7 @@ import hashlib
 import warnings
 import threading
 from botocore.exceptions import NoCredentialsError
+from utils.analysis.lookup_table import LookupTable
 
 
 class check_files:
@@ -111,26 +112,16 @@ class check_files:
 class FileDetails:
     """Obtain details of files being uploaded."""
 
-    def __init__(self, game_to_upload, game_modes):
+    def __init__(self, game_to_upload, game_modes, output_files):
         self.game_to_upload = game_to_upload + "/"
         self.game_modes = game_modes
+        self.output_files = output_files
 
     def get_win_weights(self, fname):
         """Return sorted win distribution."""
-        file = open(fname, "r")
-        winDict = {}
-        total_weight = 0
-        for line in file:
-            _, weight, win = line.split(",")
-            try:
-                winDict[float(win) / 100] += float(weight)
-            except:
-                winDict[float(win) / 100] = float(weight)
-            total_weight += float(weight)
-
-        sorted_wins = list(winDict.keys())
-        sorted_wins.sort()
-        sortedWeights = [winDict[win] for win in sorted_wins]
+        payouts, weights = LookupTable(fname).get_payout_weights()
+        sorted_wins = (payouts / 100).tolist()
+        sortedWeights = weights.tolist()
 
         return sorted_wins, sortedWeights
 
@@ -163,6 +154,9 @@ class FileDetails:
                     )
                 except FileNotFoundError:
                     print("Book Upload Error!")
+                dict_f_name = self.output_files.get_book_dictionary_name(mode)
+                if os.path.exists(dict_f_name):
+                    all_file_paths[mode + "_books_dictionary"] = dict_f_name
             if lookupTables:
                 lut_f_name = os.path.join(gamePath, "publish_files", "lookUpTable_" + mode + "_0.csv")
                 if os.path.exists(lut_f_name):
@@ -34,7 +34,7 @@ def upload_to_aws(gamestate, game_modes, upload_obj, override_check=False):
         time.sleep(3)
 
     bucket_folder = game_to_upload + "/"
-    file_details = FileDetails(game_to_upload, game_modes)
+    file_details = FileDetails(game_to_upload, game_modes, gamestate.output_files)
     aws_details = AWSCommands(s3_client, BUCKET_NAME, bucket_folder)
 
     all_files = file_details.get_file_paths(
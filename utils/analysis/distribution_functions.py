@@ -1,7 +1,8 @@
-from collections import defaultdict
 from math import sqrt
 import numpy as np
 
+from utils.analysis.lookup_table import LookupTable, sum_weights_by_value
+
 
 def get_lookup_length(filepath: str) -> int:
     """Get length of lookup table."""
@@ -10,115 +11,145 @@ def get_lookup_length(filepath: str) -> int:
 
 def make_win_distribution(filepath: str, normalize: bool = True) -> dict:
     """Construct win-distribution with unique, ordered payouts."""
-    dist = defaultdict(float)
-    with open(filepath, "r", encoding="UTF-8") as f:
-        for line in f:
-            _, weight, payout = line.strip().split(",")
-            weight = int(weight)
-            payout = float(payout) / 100
-            dist[payout] += weight
+    return WinDistribution.from_lookup(filepath).to_dict(normalize)
+
+
+class WinDistribution:
+    """
+    Win-distribution as arrays of unique payouts in increasing order and their summed weights.
+    Probabilities are relative to the total weight of the distribution, so weights do not need to be normalized.
+    """
+
+    def __init__(self, payouts, weights):
+        self.payouts, self.weights = sum_weights_by_value(np.asarray(payouts, dtype=np.float64), weights)
+        self.total_weight = sum(self.weights.tolist())
+        self.cumulative_weights = np.cumsum(self.weights)
+
+    @classmethod
+    def from_dict(cls, dist: dict) -> "WinDistribution":
+        """Distribution of a {payout: weight} dictionary."""
+        return cls(list(dist.keys()), list(dist.values()))
+
+    @classmethod
+    def from_lookup(cls, filepath: str) -> "WinDistribution":
+        """Distribution of payout multipliers (in units of the bet) of a lookup table."""
+        payouts, weights = LookupTable(filepath).get_payout_weights()
+        return cls(payouts / 100, weights)
+
+    def __len__(self) -> int:
+        return len(self.payouts)
+
+    def to_dict(self, normalize: bool = True) -> dict:
+        """{payout: weight} dictionary in order of increasing payout, with weights summing to 1 if normalized."""
+        weights = self.weights / self.total_weight if normalize else self.weights
+        return dict(zip(self.payouts.tolist(), weights.tolist()))
+
+    def get_average(self) -> float:
+        """Weighted average payout."""
+        return float(np.average(self.payouts, weights=self.weights))
+
+    def get_moments(self) -> tuple[float, float, float, float]:
+        """Variance, standard deviation, skewness and excess kurtosis."""
+        deviations = self.payouts - self.get_average()
+        probabilities = self.weights / self.total_weight
+        squared = deviations**2
+        variance = float(np.dot(squared, probabilities))
+        standard_dev = sqrt(variance)
+        skewness = float(np.dot(squared * deviations, probabilities)) / standard_dev**3
+        kurtosis = float(np.dot(squared**2, probabilities)) / standard_dev**4 - 3
+        return variance, standard_dev, skewness, kurtosis
+
+    def get_median(self) -> float:
+        """Smallest payout with at least half of the total weight at or below it."""
+        idx = np.searchsorted(self.cumulative_weights, self.total_weight / 2, side="left")
+        if idx < len(self.payouts):
+            return float(self.payouts[idx])
+        return 0
+
+    def get_maxwin_hitrate(self) -> float:
+        """Return frequency of max-win."""
+        return 1.0 / (self.weights[-1] / self.total_weight)
+
+    def get_prob_no_win(self) -> float:
+        """Probability of 0x payout amount."""
+        if len(self.payouts) > 0 and self.payouts[0] == 0:
+            return float(self.weights[0] / self.total_weight)
+        return 0
+
+    def prob_less_than_bet(self, bet_cost: float) -> float:
+        """Probability of winning less than mode bet cost."""
+        idx = np.searchsorted(self.payouts, bet_cost, side="left")
+        if idx == 0:
+            return 0
+        return float(self.cumulative_weights[idx - 1] / self.total_weight)
+
+    def non_zero_hitrate(self) -> float:
+        """Frequency of non-zero payouts."""
+        if len(self.payouts) > 0 and self.payouts[0] == 0:
+            return 1 / (1 - self.weights[0] / self.total_weight)
+        return 1
+
+    def calculate_rtp(self, bet_cost: float) -> float:
+        """Get distribution RTP."""
+        return float(np.dot(self.payouts, self.weights)) / self.total_weight / bet_cost
 
-    # Sort by win amount
-    dist = dict(sorted(dist.items(), key=lambda x: x[0], reverse=False))
-    if normalize:
-        total_weight = sum(dist.values())
-        dist = {x: y / total_weight for x, y in dist.items()}
+    def min_dist_difference(self) -> int:
+        """Minimum difference between consecutive payouts, in lookup table units (100 = 1x bet)."""
+        if len(self.payouts) < 2:
+            return 0
+        return int(round(float(np.diff(self.payouts).min()) * 100))
 
-    return dist
+    def get_range_sums(self, win_ranges: list) -> tuple[np.ndarray, np.ndarray]:
+        """Summed weight and summed payout * weight of the payouts within each [min, max) win range."""
+        bounds = np.asarray(win_ranges, dtype=np.float64).reshape(-1, 2)
+        starts = np.searchsorted(self.payouts, bounds[:, 0], side="left")
+        ends = np.maximum(np.searchsorted(self.payouts, bounds[:, 1], side="left"), starts)
+        weighted_payouts = self.payouts * self.weights
+        range_weights = np.array([self.weights[start:end].sum() for start, end in zip(starts, ends)])
+        range_payouts = np.array([weighted_payouts[start:end].sum() for start, end in zip(starts, ends)])
+        return range_weights, range_payouts
 
 
 def get_distribution_average(dist: dict) -> float:
     """Return weighted average from ordered win distribution."""
-    return np.average(list(dist.keys()), weights=list(dist.values()))
-
-
-def get_distribution_moments(dist: dict) -> float:
-    """Given a (weighted) lookup-table, return standard deviation."""
-    av_win = get_distribution_average(dist)
-    total_weight = sum(list(dist.values()))
+    return WinDistribution.from_dict(dist).get_average()
 
-    variance = 0.0
-    for pay, weight in dist.items():
-        variance += ((pay - av_win) ** 2) * (weight / total_weight)
-    standard_dev = sqrt(variance)
 
-    skewness, kurtosis = 0.0, 0.0
-    av_win = float(av_win)
-    for win, weight in dist.items():
-        skewness += ((win - av_win) ** 3) * weight
-        kurtosis += ((win - av_win) ** 4) * weight
-    skewness /= (standard_dev) ** 3
-    kurtosis /= (standard_dev) ** 4
-    kurtosis -= 3
-
-    return variance, standard_dev, skewness, kurtosis
+def get_distribution_moments(dist: dict) -> tuple[float, float, float, float]:
+    """Given a (weighted) lookup-table, return variance, standard deviation, skewness and excess kurtosis."""
+    return WinDistribution.from_dict(dist).get_moments()
 
 
 def get_distribution_median(dist: dict, total_weight=None) -> float:
     """Return median of an ordered win-distribution."""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-    cumulative_weight = 0
-    for win, weight in dist.items():
-        cumulative_weight += weight
-        if cumulative_weight >= total_weight / 2:
-            return win
-    return 0
+    return WinDistribution.from_dict(dist).get_median()
 
 
 def get_maxwin_hitrate(dist: dict, total_weight=None) -> float:
     """Return frequency of max-win."""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-    max_win_prob = dist[max(list(dist.keys()))] / total_weight
-    return 1.0 / max_win_prob
+    return WinDistribution.from_dict(dist).get_maxwin_hitrate()
 
 
 def get_prob_no_win(dist: dict, total_weight=None) -> float:
     "Probability of 0x payout amount."
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-
-    if min(dist.keys()) == 0:
-        return dist[0]
-    return 0
+    return WinDistribution.from_dict(dist).get_prob_no_win()
 
 
 def prob_less_than_bet(dist: dict, bet_cost: float, total_weight=None):
     """Probability of winning less than mode bet cost."""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-    cumulative_prob = 0
-    for win, weight in dist.items():
-        if win < bet_cost:
-            cumulative_prob += weight
-
-    return cumulative_prob / total_weight
+    return WinDistribution.from_dict(dist).prob_less_than_bet(bet_cost)
 
 
 def non_zero_hitrate(dist: dict, total_weight=None):
-    """Calculate probability of"""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-
-    if min(dist.keys()) == 0:
-        return 1 / (1 - dist[0] / total_weight)
-    else:
-        return 1
+    """Frequency of non-zero payouts."""
+    return WinDistribution.from_dict(dist).non_zero_hitrate()
 
 
 def calculate_rtp(dist: dict, bet_cost: float, total_weight: float = None) -> float:
     """Get distribution RTP."""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-    return float(np.dot(list(dist.keys()), list(dist.values()))) / total_weight / bet_cost
+    return WinDistribution.from_dict(dist).calculate_rtp(bet_cost)
 
 
 def min_dist_difference(dist: dict):
     """Minimum payout amount difference"""
-    wins = list(dist.keys())
-    diff = None
-    for i in range(len(wins) - 2):
-        if diff is None or (diff > abs(wins[i + 1]) - wins[i]):
-            diff = abs(wins[i + 1]) - wins[i]
-    return int(round(diff * 100))
+    return WinDistribution.from_dict(dist).min_dist_difference()
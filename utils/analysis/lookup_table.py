@@ -0,0 +1,152 @@
+"""Lookup table columns as NumPy arrays, parsed once and cached outside of the game library."""
+
+import hashlib
+import json
+import os
+import shutil
+import warnings
+import numpy as np
+from src.config.paths import PROJECT_PATH
+
+# Parsed columns are saved to CACHE_PATH/<file name>.<path hash>.<contents hash>/<column>.npy, so nothing is written
+# next to published lookup tables
+CACHE_PATH = os.path.join(PROJECT_PATH, ".lut_cache")
+HASH_LENGTH = 16
+PATH_HASH_LENGTH = 8
+
+
+def get_file_hash(filename: str, chunk_size: int = 2**22) -> str:
+    """SHA256 of a file, read in chunks."""
+    sha256 = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def load_csv(filename: str, dtype: type, usecols) -> np.ndarray:
+    """Columns of a comma separated file, an empty file gives zero rows."""
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=".*input contained no data.*")
+        ndmin = 2 if isinstance(usecols, tuple) else 1
+        return np.loadtxt(filename, delimiter=",", dtype=dtype, usecols=usecols, ndmin=ndmin)
+
+
+def parse_lookup(filename: str) -> tuple[dict, list]:
+    """
+    Columns of lookUpTable_<mode>.csv (id, weight, payout). Values are read as uint64, falling back to float64 if
+    the file contains non-integer (or negative) values, so they can be reported by verify_lookup_format().
+    """
+    try:
+        table = load_csv(filename, np.uint64, (0, 1, 2))
+    except ValueError:
+        table = load_csv(filename, np.float64, (0, 1, 2))
+    columns = {
+        "ids": np.ascontiguousarray(table[:, 0]),
+        "weights": np.ascontiguousarray(table[:, 1]),
+        "payouts": np.ascontiguousarray(table[:, 2]),
+    }
+    return columns, []
+
+
+def parse_segmented(filename: str) -> tuple[dict, list]:
+    """Columns of lookUpTableSegmented_<mode>.csv (id, criteria, basegame wins, freegame wins) and criteria names."""
+    criteria = load_csv(filename, str, 1)
+    criteria_names, criteria_codes = np.unique(criteria, return_inverse=True)
+    wins = load_csv(filename, np.float64, (2, 3))
+    columns = {
+        "segmented_ids": load_csv(filename, np.uint64, 0),
+        "criteria_codes": criteria_codes.astype(np.uint32),
+        "basegame_wins": np.ascontiguousarray(wins[:, 0]),
+        "freegame_wins": np.ascontiguousarray(wins[:, 1]),
+    }
+    return columns, criteria_names.tolist()
+
+
+def load_cached(filename: str, parser, use_cache: bool = True, cache_root: str = None) -> tuple[dict, list]:
+    """
+    (columns, names) of a parsed file, memory-mapped from a cache made for the same file contents if it exists.
+    Caches are kept in cache_root (CACHE_PATH by default) and identified by the file's name and absolute path.
+    Caches of earlier versions of the file are removed when a new one is written.
+    """
+    if not use_cache:
+        return parser(filename)
+
+    filename = os.path.abspath(filename)
+    cache_root = cache_root or CACHE_PATH
+    source = f"{os.path.basename(filename)}.{hashlib.sha256(filename.encode('UTF-8')).hexdigest()[:PATH_HASH_LENGTH]}"
+    cache_path = os.path.join(cache_root, f"{source}.{get_file_hash(filename)[:HASH_LENGTH]}")
+    if not os.path.isdir(cache_path):
+        columns, names = parser(filename)
+        if os.path.isdir(cache_root):
+            for old_cache in os.listdir(cache_root):
+                if old_cache.rsplit(".", 1)[0] == source:
+                    shutil.rmtree(os.path.join(cache_root, old_cache), ignore_errors=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        os.makedirs(temp_path, exist_ok=True)
+        for column, values in columns.items():
+            np.save(os.path.join(temp_path, f"{column}.npy"), values)
+        with open(os.path.join(temp_path, "names.json"), "w", encoding="UTF-8") as f:
+            json.dump(names, f)
+        try:
+            os.replace(temp_path, cache_path)
+        except OSError:
+            # Another process wrote the same cache first
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+    columns = {}
+    for file in os.listdir(cache_path):
+        if file.endswith(".npy"):
+            columns[file[: -len(".npy")]] = np.load(os.path.join(cache_path, file), mmap_mode="r")
+    with open(os.path.join(cache_path, "names.json"), "r", encoding="UTF-8") as f:
+        names = json.load(f)
+    return columns, names
+
+
+def sum_weights_by_value(values: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Unique values in increasing order and the summed weight of each as float. Weights are added in row order, giving
+    the same sums as accumulating them one row at a time.
+    """
+    unique_values, inverse = np.unique(values, return_inverse=True)
+    sums = np.bincount(inverse, weights=np.asarray(weights, dtype=np.float64), minlength=len(unique_values))
+    return unique_values, sums
+
+
+class LookupTable:
+    """
+    Lookup table (and optionally its segmented table) as NumPy columns:
+    ids, weights and payouts, plus segmented_ids, criteria, basegame_wins and freegame_wins if segmented_name is given.
+    Rows are in file order. Each file is parsed once, later tables of the same file are memory-mapped from the cache
+    in cache_root (CACHE_PATH by default).
+    """
+
+    def __init__(self, lookup_name: str, segmented_name: str = None, use_cache: bool = True, cache_root: str = None):
+        self.lookup_name = lookup_name
+        self.segmented_name = segmented_name
+        columns, _ = load_cached(lookup_name, parse_lookup, use_cache, cache_root)
+        self.ids = columns["ids"]
+        self.weights = columns["weights"]
+        self.payouts = columns["payouts"]
+        if segmented_name is not None:
+            columns, self.criteria_names = load_cached(segmented_name, parse_segmented, use_cache, cache_root)
+            self.segmented_ids = columns["segmented_ids"]
+            self.criteria_codes = columns["criteria_codes"]
+            self.basegame_wins = columns["basegame_wins"]
+            self.freegame_wins = columns["freegame_wins"]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def criteria(self) -> np.ndarray:
+        """Criteria name of each segmented row."""
+        return np.asarray(self.criteria_names, dtype=str)[self.criteria_codes]
+
+    def get_total_weight(self) -> int:
+        """Exact sum of all weights."""
+        return sum(self.weights.tolist())
+
+    def get_payout_weights(self) -> tuple[np.ndarray, np.ndarray]:
+        """Unique payouts in increasing order and the summed (float) weight of each, in lookup table units."""
+        return sum_weights_by_value(self.payouts, self.weights)
@@ -0,0 +1,81 @@
+"""Compare the iterative cluster search against the original recursive implementation on random boards."""
+
+import random
+import time
+from collections import defaultdict
+
+from src.calculations.cluster import Cluster
+
+
+class BenchmarkSymbol:
+    """Minimal symbol exposing the attributes used by cluster detection."""
+
+    def __init__(self, name: str, wild: bool):
+        self.name = name
+        self.wild = wild
+
+    def check_attribute(self, attribute: str) -> bool:
+        return attribute == "wild" and self.wild
+
+
+def get_clusters_recursive(board: list, wild_key: str = "wild") -> dict:
+    """Reference cluster search using list-based visited checks and recursion."""
+    already_checked = []
+    clusters = defaultdict(list)
+    for reel, _ in enumerate(board):
+        for row, _ in enumerate(board[reel]):
+            if (reel, row) not in already_checked and not (board[reel][row].check_attribute(wild_key)):
+                potential_cluster = [(reel, row)]
+                already_checked += [(reel, row)]
+                local_checked = [(reel, row)]
+                symbol = board[reel][row].name
+                Cluster.check_all_neighbours(
+                    board,
+                    already_checked,
+                    local_checked,
+                    potential_cluster,
+                    reel,
+                    row,
+                    symbol,
+                    wild_key,
+                )
+                clusters[symbol].append(potential_cluster)
+
+    return clusters
+
+
+def make_random_board(
+    num_reels: int = 7,
+    num_rows: int = 7,
+    symbols: tuple = ("H1", "H2", "H3", "L1", "L2"),
+    wild_prob: float = 0.05,
+) -> list:
+    """Random board of benchmark symbols, with wilds inserted at the given probability."""
+    return [
+        [
+            BenchmarkSymbol("W", True) if random.random() < wild_prob else BenchmarkSymbol(random.choice(symbols), False)
+            for _ in range(num_rows)
+        ]
+        for _ in range(num_reels)
+    ]
+
+
+def run_benchmark(num_boards: int = 2000, num_reels: int = 7, num_rows: int = 7, seed: int = 0) -> dict:
+    """Time both implementations on the same random boards and confirm identical output."""
+    random.seed(seed)
+    boards = [make_random_board(num_reels, num_rows) for _ in range(num_boards)]
+
+    results = {}
+    for name, func in [("recursive", get_clusters_recursive), ("iterative", Cluster.get_clusters)]:
+        start = time.perf_counter()
+        results[name] = [func(board) for board in boards]
+        elapsed = time.perf_counter() - start
+        print(f"{name:>10}: {elapsed:.3f}s ({1e6 * elapsed / num_boards:.1f} us/board)")
+
+    assert results["recursive"] == results["iterative"], "cluster outputs differ"
+    return results
+
+
+if __name__ == "__main__":
+
+    run_benchmark()
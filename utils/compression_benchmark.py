@@ -0,0 +1,76 @@
+"""Benchmark zstd settings on the compressed books of each game, reporting throughput and compression ratio."""
+
+import os
+import time
+import zstandard as zstd
+
+from src.config.paths import PATH_TO_GAMES
+from src.write_data.write_data import get_book_compressor, MAX_WINDOW_SIZE
+
+# (level, threads, window_log, long_distance)
+DEFAULT_SETTINGS = [
+    (3, 0, None, False),
+    (3, -1, None, False),
+    (9, -1, None, False),
+    (9, -1, 27, True),
+    (19, -1, 27, True),
+]
+
+
+def load_books(books_path: str, max_bytes: int = 2**28) -> bytes:
+    """Decompress up to max_bytes of a published book file."""
+    decompressor = zstd.ZstdDecompressor(max_window_size=MAX_WINDOW_SIZE)
+    with open(books_path, "rb") as f:
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
+            return reader.read(max_bytes)
+
+
+def benchmark_books(book_data: bytes, settings: list = None) -> list:
+    """Compress the same book data with each setting, returning MB/s and compression ratio."""
+    results = []
+    for level, threads, window_log, long_distance in settings or DEFAULT_SETTINGS:
+        compressor = get_book_compressor(level, threads, window_log, long_distance)
+        start = time.perf_counter()
+        compressed = compressor.compress(book_data)
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        results.append(
+            {
+                "level": level,
+                "threads": threads,
+                "window_log": window_log,
+                "long_distance": long_distance,
+                "mb_per_s": len(book_data) / 1e6 / elapsed,
+                "ratio": len(book_data) / max(len(compressed), 1),
+            }
+        )
+    return results
+
+
+def run_benchmark(game_ids: list = None, settings: list = None, max_bytes: int = 2**28) -> dict:
+    """Benchmark published books of all (or selected) games in games/."""
+    game_ids = game_ids or sorted(os.listdir(PATH_TO_GAMES))
+    all_results = {}
+    for game_id in game_ids:
+        publish_path = os.path.join(PATH_TO_GAMES, game_id, "library", "publish_files")
+        if not os.path.isdir(publish_path):
+            continue
+        book_files = sorted(f for f in os.listdir(publish_path) if f.startswith("books_") and f.endswith(".jsonl.zst"))
+        if len(book_files) == 0:
+            print(f"No compressed books found for {game_id}, run create_books() with compression first.")
+            continue
+        book_data = b"".join(load_books(os.path.join(publish_path, f), max_bytes) for f in book_files)
+        all_results[game_id] = benchmark_books(book_data, settings)
+
+        print(f"\n{game_id}: {round(len(book_data) / 1e6, 2)} MB uncompressed")
+        print(f"{'level':>6}{'threads':>9}{'window':>8}{'ldm':>6}{'MB/s':>10}{'ratio':>9}")
+        for res in all_results[game_id]:
+            print(
+                f"{res['level']:>6}{res['threads']:>9}{str(res['window_log']):>8}{str(res['long_distance']):>6}"
+                f"{res['mb_per_s']:>10.1f}{res['ratio']:>9.2f}"
+            )
+    return all_results
+
+
+if __name__ == "__main__":
+
+    run_benchmark()
@@ -3,9 +3,13 @@
 import json
 import zstandard as zstd
 
+from src.write_data.write_data import MAX_WINDOW_SIZE
 
-def decompress(input_path: str, save_output: bool = False):
-    """Decompress zst files assuming newline char to indicate different sims."""
+
+def decompress(input_path: str, save_output: bool = False, dictionary_path: str = None):
+    """Decompress zst files assuming newline char to indicate different sims.
+    dictionary_path must point to the dictionary written with the publish files (OutputFiles.get_book_dictionary_name)
+    if the books were compressed with a dictionary."""
 
     def json_validate(json_blob):
         """Validate each uncompressed result to ensure valid json format."""
@@ -15,9 +19,15 @@ def decompress(input_path: str, save_output: bool = False):
             print("Invalid JSON!")
             raise RuntimeError("Invalid JSON")
 
-    decompressor = zstd.ZstdDecompressor()
+    dictionary = None
+    if dictionary_path is not None:
+        with open(dictionary_path, "rb") as f:
+            dictionary = zstd.ZstdCompressionDict(f.read())
+    decompressor = zstd.ZstdDecompressor(dict_data=dictionary, max_window_size=MAX_WINDOW_SIZE)
     with open(input_path, "rb") as f:
-        decompressed_data = decompressor.decompress(f.read()).decode("UTF-8")
+        # read across frames, merged books may consist of several concatenated zstd frames
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
+            decompressed_data = reader.read().decode("UTF-8")
 
     all_sims = decompressed_data.strip().split("\n")
     for sim in all_sims:
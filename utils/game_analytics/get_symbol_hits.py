@@ -2,7 +2,9 @@
 
 import json
 import os
+import numpy as np
 from src.config.paths import PATH_TO_GAMES
+from utils.analysis.lookup_table import LookupTable
 
 
 class HitRateCalculations:
@@ -27,27 +29,19 @@ class HitRateCalculations:
             all_keys = [d.keys() for d in file_dict]
         f.close()
 
-        lut_ids = []
-        weights = []
-        payouts = []
-        with open(lut_file, "r", encoding="UTF-8") as f:
-            for line in f:
-                lut_ids.append(int(line.strip().split(",")[0]))
-                weights.append(int(line.strip().split(",")[1]))
-                payouts.append(float(line.strip().split(",")[2]))
-        f.close()
+        lookup_table = LookupTable(lut_file)
 
-        self.weights = weights
-        self.total_weight = sum(self.weights)
-        self.payouts = payouts
+        # Rows are indexed by book id - 1
+        self.weights = lookup_table.weights
+        self.total_weight = lookup_table.get_total_weight()
+        self.payouts = lookup_table.payouts.astype(np.float64)
         self.force_dict = file_dict
         self.all_keys = all_keys
 
     def get_hit_rates(self, unique_ids: list) -> float:
         """Get hit-rates using inverse probabilities from optimized lookup tables."""
-        cumulative_weight = 0
-        for idx in unique_ids:
-            cumulative_weight += self.weights[idx - 1]
+        rows = np.asarray(unique_ids, dtype=np.int64) - 1
+        cumulative_weight = sum(self.weights[rows].tolist())
 
         prob = cumulative_weight / self.total_weight
         try:
@@ -57,19 +51,14 @@ class HitRateCalculations:
 
     def get_av_wins(self, unique_ids: list) -> float:
         """Return average win amount for a specified list of simulation ids."""
-        search_key_tot_weight = 0
+        rows = np.asarray(unique_ids, dtype=np.int64) - 1
         # find out the total payout and weights from the force keys subset of the lookup table
-        for id in unique_ids:
-            search_key_tot_weight += self.weights[id - 1]
-        average_win = 0
-        # multiply each win in the subset of lookup table by the ratio of its weight to normalize the avg payout
-        for id in unique_ids:
-            norm_payout = self.payouts[id - 1] * (self.weights[id - 1] / search_key_tot_weight)
-            average_win += norm_payout
-        try:
-            return average_win
-        except ZeroDivisionError:
+        weights = self.weights[rows].astype(np.float64)
+        search_key_tot_weight = weights.sum()
+        if len(rows) == 0 or search_key_tot_weight == 0:
             return 0
+        # weight each win in the subset of lookup table by the ratio of its weight to normalize the avg payout
+        return float(np.dot(self.payouts[rows], weights / search_key_tot_weight))
 
     def get_sim_count(self, search_key: dict) -> int:
         """Get raw sim count with partial or complete matches to force file keys."""
@@ -0,0 +1,113 @@
+"""Per-win cost of apply_mult() on winning positions taken from the lines, ways and cluster sample games."""
+
+import importlib.util
+import os
+import random
+import time
+
+from src.calculations.cluster import Cluster
+from src.calculations.lines import Lines
+from src.calculations.symbol import SymbolStorage
+from src.calculations.ways import Ways
+from src.config.paths import PATH_TO_GAMES
+from src.wins.multiplier_strategy import (
+    apply_mult,
+    apply_global_mult,
+    apply_added_symbol_mult,
+    apply_combined_mult,
+)
+
+STRATEGIES = ["global", "symbol", "combined"]
+
+
+def apply_mult_eager(board, strategy, win_amount=0.0, global_multiplier=1, positions=[], multiplier_key="multiplier"):
+    """Reference dispatch which evaluates every strategy before selecting one."""
+    strat = {
+        "global": apply_global_mult(win_amount, global_multiplier),
+        "symbol": apply_added_symbol_mult(board, win_amount, positions, multiplier_key=multiplier_key),
+        "combined": apply_combined_mult(board, win_amount, global_multiplier, positions, multiplier_key=multiplier_key),
+    }
+    return strat[strategy]
+
+
+def load_game_config(game_id: str) -> object:
+    """Import GameConfig from games/<game_id>/game_config.py."""
+    spec = importlib.util.spec_from_file_location(
+        f"{game_id}_game_config", os.path.join(PATH_TO_GAMES, game_id, "game_config.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.GameConfig()
+
+
+def draw_board(config: object, symbol_storage: SymbolStorage, reelstrip: list) -> list:
+    """Board drawn from random reel stops."""
+    board = []
+    for reel, strip in enumerate(reelstrip):
+        stop = random.randrange(len(strip))
+        board.append(
+            [
+                symbol_storage.create_symbol_state(strip[(stop + row) % len(strip)])
+                for row in range(config.num_rows[reel])
+            ]
+        )
+    return board
+
+
+def get_win_positions(config: object, board: list, win_type: str) -> list:
+    """Winning position lists from evaluating the board."""
+    if win_type == "lines":
+        wins = Lines.get_lines(board, config)["wins"]
+    elif win_type == "ways":
+        wins = Ways.get_ways_data(config, board)["wins"]
+    else:
+        wins = Cluster.get_cluster_data(config, board, global_multiplier=1)["wins"]
+    return [win["positions"] for win in wins]
+
+
+def collect_wins(game_id: str, win_type: str, num_boards: int) -> list:
+    """(board, positions) pairs for every win on num_boards random base-game boards."""
+    config = load_game_config(game_id)
+    symbols = {sym for _, sym in config.paytable}
+    for special_names in config.special_symbols.values():
+        symbols.update(special_names)
+    symbol_storage = SymbolStorage(config, list(symbols))
+    reelstrip = config.reels["BR0"]
+
+    wins = []
+    for _ in range(num_boards):
+        board = draw_board(config, symbol_storage, reelstrip)
+        wins += [(board, positions) for positions in get_win_positions(config, board, win_type)]
+    return wins
+
+
+def run_benchmark(num_boards: int = 2000, repeats: int = 20, seed: int = 0) -> dict:
+    """Time eager and lazy strategy dispatch per win for each sample game."""
+    random.seed(seed)
+    games = [("0_0_lines", "lines"), ("0_0_ways", "ways"), ("0_0_cluster", "cluster")]
+    results = {}
+    print(f"{'game':>12}{'strategy':>10}{'wins':>7}{'avg pos':>9}{'eager us':>10}{'lazy us':>9}")
+    for game_id, win_type in games:
+        wins = collect_wins(game_id, win_type, num_boards)
+        if len(wins) == 0:
+            continue
+        avg_positions = sum(len(positions) for _, positions in wins) / len(wins)
+        for strategy in STRATEGIES:
+            timings = {}
+            for name, func in [("eager", apply_mult_eager), ("lazy", apply_mult)]:
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    for board, positions in wins:
+                        func(board, strategy, win_amount=1.0, global_multiplier=2, positions=positions)
+                timings[name] = 1e6 * (time.perf_counter() - start) / (repeats * len(wins))
+            results[(game_id, strategy)] = timings
+            print(
+                f"{game_id:>12}{strategy:>10}{len(wins):>7}{avg_positions:>9.1f}"
+                f"{timings['eager']:>10.2f}{timings['lazy']:>9.2f}"
+            )
+    return results
+
+
+if __name__ == "__main__":
+
+    run_benchmark()
@@ -11,18 +11,10 @@ import numpy as np
 import zstandard as zst
 import hashlib
 import pickle
-from utils.analysis.distribution_functions import (
-    make_win_distribution,
-    get_distribution_moments,
-    get_distribution_average,
-    non_zero_hitrate,
-    prob_less_than_bet,
-    get_prob_no_win,
-    get_maxwin_hitrate,
-    get_distribution_median,
-    min_dist_difference,
-    calculate_rtp,
-)
+from src.config.output_filenames import OutputFiles
+from src.write_data.write_data import MAX_WINDOW_SIZE
+from utils.analysis.distribution_functions import make_win_distribution, WinDistribution
+from utils.analysis.lookup_table import LookupTable
 
 
 class WinStatistics:
@@ -80,40 +72,31 @@ class WinStatistics:
 
 def verify_lookup_format(filename: str) -> list:
     "Duplicate RGS verification before upload."
-    integer_payouts = []
-    running_weight_total = 0
-    min_win, max_win = None, None
+    lookup_table = LookupTable(filename)
     win_distribution = make_win_distribution(filename)
-
-    with open(filename, "r", encoding="UTF-8") as f:
-        for line in f:
-            _, weight, payout = line.strip().split(",")
-            weight = float(weight)
-            payout = float(payout)
-
-            # Payout checks
-            assert payout.is_integer() and payout >= 0, "Payout mult be uint64 format:"
-            if payout > 0:
-                assert payout >= 10, "Minimum non-zero payout is 10 (RGS accepts 'cents' increments)."
-            assert payout % 10 == 0, "Payout values must be in increments of 10."
-            integer_payouts.append(int(payout))
-
-            if (min_win is None) or (payout < min_win):
-                min_win = payout
-            if (max_win is None) or (payout > max_win):
-                max_win = payout
-            # Weight checks
-            assert weight.is_integer() and weight >= 0, "Weight must be uint64 format."
-            running_weight_total += weight
-
+    payouts = lookup_table.payouts.astype(np.float64)
+    weights = lookup_table.weights.astype(np.float64)
+
+    # Payout checks
+    assert np.all((np.mod(payouts, 1) == 0) & (payouts >= 0)), "Payout mult be uint64 format:"
+    assert np.all((payouts == 0) | (payouts >= 10)), "Minimum non-zero payout is 10 (RGS accepts 'cents' increments)."
+    assert np.all(np.mod(payouts, 10) == 0), "Payout values must be in increments of 10."
+    integer_payouts = lookup_table.payouts.astype(np.int64).tolist()
+    min_win = float(payouts.min()) if len(payouts) > 0 else None
+    max_win = float(payouts.max()) if len(payouts) > 0 else None
+
+    # Weight checks
+    assert np.all((np.mod(weights, 1) == 0) & (weights >= 0)), "Weight must be uint64 format."
+    running_weight_total = lookup_table.get_total_weight()
     assert running_weight_total <= np.iinfo(np.uint64).max, "Sum of weights must be <= MAX(uint64)"
 
-    return win_distribution, integer_payouts, running_weight_total, min_win, max_win
+    return win_distribution, integer_payouts, float(running_weight_total), min_win, max_win
 
 
 # payout mult value match to lut + length match
-def verify_books_and_payout_mults(books_filename: str) -> list:
-    """Ensure the values written to the books match those in the lookup table exactly."""
+def verify_books_and_payout_mults(books_filename: str, dictionary_filename: str = None) -> list:
+    """Ensure the values written to the books match those in the lookup table exactly.
+    Books compressed with a trained dictionary require the dictionary file written with the publish files."""
     assert str(books_filename).endswith(".jsonl.zstd") or str(books_filename).endswith(
         "jsonl.zst"
     ), "Verification is only run for compressed book files of format .jsonl.zst."
@@ -121,8 +104,13 @@ def verify_books_and_payout_mults(books_filename: str) -> list:
     book_payout_ints = []
     total_num_events = 0
     with open(books_filename, "rb") as f:
-        decompressor = zst.ZstdDecompressor()
-        with decompressor.stream_reader(f) as reader:
+        dictionary = None
+        if dictionary_filename is not None:
+            with open(dictionary_filename, "rb") as dict_file:
+                dictionary = zst.ZstdCompressionDict(dict_file.read())
+        decompressor = zst.ZstdDecompressor(dict_data=dictionary, max_window_size=MAX_WINDOW_SIZE)
+        # Books may be made up of several concatenated zstd frames
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
             txt_stream = TextIOWrapper(reader, encoding="UTF-8")
             for line in txt_stream:
                 line = line.strip()
@@ -153,36 +141,36 @@ def compare_payout_values(book_int_payouts, lut_int_payouts) -> None:
 
 def get_num_non_zero_payouts(book_int_payouts) -> None:
     """Count non-zero payouts"""
-    return len([p for p in book_int_payouts if p > 0])
+    return int(np.count_nonzero(np.asarray(book_int_payouts) > 0))
 
 
 def get_lut_statistics(
     win_distribution, bet_cost, unique_payouts, weight_range, min_win, max_win, num_events
 ) -> object:
     """Run RGS statistic tests for upload verification."""
-
-    var, std, skew, kurtosis = get_distribution_moments(win_distribution)
+    distribution = WinDistribution.from_dict(win_distribution)
+    var, std, skew, kurtosis = distribution.get_moments()
     MathStats = WinStatistics(
         win_distribution=win_distribution,
         num_events=num_events,
         weight_range=weight_range,
         min_win=min_win,
         max_win=max_win,
-        min_diff=min_dist_difference(win_distribution),
+        min_diff=distribution.min_dist_difference(),
         unique_wins=unique_payouts,
-        average_wins=float(get_distribution_average(win_distribution)),
-        rtp=calculate_rtp(win_distribution, bet_cost, weight_range),
+        average_wins=distribution.get_average(),
+        rtp=distribution.calculate_rtp(bet_cost),
         std=std,
         var=var,
-        hr_max=get_maxwin_hitrate(win_distribution, weight_range),
-        non_zero_hr=non_zero_hitrate(win_distribution, weight_range),
-        prob_nil=get_prob_no_win(win_distribution, weight_range),
-        prob_less_bet=prob_less_than_bet(win_distribution, bet_cost, weight_range),
+        hr_max=distribution.get_maxwin_hitrate(),
+        non_zero_hr=distribution.non_zero_hitrate(),
+        prob_nil=distribution.get_prob_no_win(),
+        prob_less_bet=distribution.prob_less_than_bet(bet_cost),
         num_non_zero_payouts=get_num_non_zero_payouts(unique_payouts),
         skew=skew,
         excess_kurtosis=kurtosis,
     )
-    median = get_distribution_median(win_distribution, weight_range)
+    median = distribution.get_median()
     if median > 0:
         m2m = MathStats.average_win / median
         MathStats.m2m = m2m
@@ -194,6 +182,7 @@ def get_lut_statistics(
 def execute_all_tests(config, excluded_modes=[]):
     """Run all tests for a given game"""
     mode_stats = []
+    output_files = OutputFiles(config)
     for bet_mode in config.bet_modes:
         name = bet_mode.get_name()
         cost = bet_mode.get_cost()
@@ -202,12 +191,15 @@ def execute_all_tests(config, excluded_modes=[]):
             lookup_name = f"lookUpTable_{name}_0.csv"
             book_file = os.path.join(config.publish_path, book_name)
             lut_file = os.path.join(config.publish_path, lookup_name)
+            dictionary_file = output_files.get_book_dictionary_name(name)
+            if not os.path.exists(dictionary_file):
+                dictionary_file = None
 
             if not (os.path.exists(book_file)) or not (os.path.exists(lut_file)):
                 raise RuntimeError("Books/Lookup file does not exist.")
 
             win_dist, lut_payouts, weights_range, min_win, max_win = verify_lookup_format(lut_file)
-            book_payouts, num_events = verify_books_and_payout_mults(book_file)
+            book_payouts, num_events = verify_books_and_payout_mults(book_file, dictionary_file)
 
             compare_payout_values(book_payouts, lut_payouts)
 
@@ -5,6 +5,8 @@ import importlib
 import json
 from typing import List, Dict
 
+from src.write_data.force_index import ForceIndex, Query, Match, And, build_force_index
+
 
 def load_game_config(game_id: str):
     """Load game config class"""
@@ -35,6 +37,7 @@ class ForceTool:
         self.config = load_game_config(game_id)
         self.target_mode = game_mode
         self.current_force_file = None
+        self.force_index = None
         self.search_keys = None
         self.method = None  # For payout range search only
 
@@ -48,6 +51,33 @@ class ForceTool:
         with open(force_name, "r", encoding="UTF-8") as f:
             self.current_force_file = json.loads(f.read())
 
+    def get_force_index_name(self):
+        "Get force-index path."
+        return os.path.join(self.config.library_path, "forces", f"force_index_{self.target_mode}.bin")
+
+    def get_lookup_name(self):
+        "Get (unoptimized) lookup table path."
+        return os.path.join(self.config.library_path, "lookup_tables", f"lookUpTable_{self.target_mode}.csv")
+
+    def load_force_index(self):
+        "Open the force index, building it first if it is missing or older than the force or lookup files."
+        index_name = self.get_force_index_name()
+        sources = [self.get_force_file_name(), self.get_lookup_name()]
+        if not os.path.exists(index_name) or any(
+            os.path.getmtime(source) > os.path.getmtime(index_name) for source in sources
+        ):
+            build_force_index(*sources, index_name)
+        self.force_index = ForceIndex(index_name)
+
+    def query(self, query: Query) -> list:
+        """
+        Book-ids satisfying a query of force keys and payouts, i.e.
+        Match(symbol="scatter", kind="4") & ~Match(gametype="freegame") & Payout(min_payout=500, max_payout=10000)
+        """
+        if self.force_index is None:
+            self.load_force_index()
+        return self.force_index.query(query).tolist()
+
     def print_search_results(self, search_criteria, simulation_ids: List, filename: str, game_mode: str):
         """Record"""
         base_path = os.path.join(self.config.library_path, "forces")
@@ -73,20 +103,15 @@ class ForceTool:
 
         return tranform_dict
 
-    def find_partial_key_match(self, search_keys: dict = None, reload_force_json: bool = True) -> list:
+    def find_partial_key_match(self, search_keys: dict = None, reload_force_json: bool = True) -> set:
         """
         Returns all ids with partial match in the 'search' field. i.e. search_keys = [{'kind':'3'}] returns all recorded 3-kind entries
         """
         assert search_keys is not None, "must specify serach keys and game_mode"
 
-        if reload_force_json:
-            self.load_force_file()
-        matched_book_ids = set()
-        for entry in self.current_force_file:
-            tranform_serach = self.transform_serch_dict(entry)
-            if all(tranform_serach.get(k) == v for k, v in search_keys.items()):
-                for idx in entry["bookIds"]:
-                    matched_book_ids.add(int(idx))
+        if reload_force_json or self.force_index is None:
+            self.load_force_index()
+        matched_book_ids = set(self.force_index.query(Match(search_keys)).tolist())
 
         if len(matched_book_ids) == 0:
             raise Warning("No book-ids found.")
@@ -97,13 +122,13 @@ class ForceTool:
         Returns all id's appearing in multiplie search criteria
         """
         assert target_mode is not None, "Must specify game mode"
-        self.load_force_file()
-
-        book_id_sets = []
-        for _, search_key in enumerate(search_array):
-            book_id_sets.append(self.find_partial_key_match(search_key, False))
+        self.load_force_index()
 
-        intersection_ids = set.intersection(*book_id_sets)
+        matches = [Match(search_key) for search_key in search_array]
+        for match in matches:
+            if self.force_index.count(match) == 0:
+                raise Warning("No book-ids found.")
+        intersection_ids = set(self.force_index.query(And(*matches)).tolist())
         return intersection_ids
 
     def find_payout_range_ids(
@@ -129,9 +154,7 @@ class ForceTool:
                 assert min_payout is None, "Cannot specify minimum  payout amount for 'MIN' method"
 
         if lookup_name is None:
-            lookup_name = os.path.join(
-                self.config.library_path, "lookup_tables", f"lookUpTable_{self.target_mode}.csv"
-            )
+            lookup_name = self.get_lookup_name()
 
         recorded_ids = []
         with open(lookup_name, "r", encoding="UTF-8") as f: